@@ -0,0 +1,106 @@
+import argparse
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from vocode.streaming.utils.resampler import COMMON_SAMPLE_RATES, Resampler
+
+try:
+    import audioop
+except ImportError:  # removed in Python 3.13
+    audioop = None  # type: ignore
+
+parser = argparse.ArgumentParser(
+    description="Compare vocode's streaming resampler with audioop.ratecv.\n"
+    + "Example usage: python playground/streaming/resampler_benchmark.py --seconds 30"
+)
+parser.add_argument(
+    "--seconds",
+    type=float,
+    default=10.0,
+    help="Seconds of audio to resample for each pair of sample rates",
+)
+parser.add_argument(
+    "--chunk_ms",
+    type=int,
+    default=20,
+    help="Size of the chunks the audio is streamed in, telephony sends 20ms",
+)
+args = parser.parse_args()
+
+IN_BAND_FREQUENCY = 1000
+
+
+def create_tone(frequency: float, sample_rate: int, seconds: float) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return 8000 * np.sin(2 * np.pi * frequency * t)
+
+
+def to_pcm(samples: np.ndarray) -> bytes:
+    return np.rint(samples).astype("<i2").tobytes()
+
+
+def chunk_pcm(audio: bytes, sample_rate: int) -> List[bytes]:
+    chunk_size = 2 * sample_rate * args.chunk_ms // 1000
+    return [audio[i : i + chunk_size] for i in range(0, len(audio), chunk_size)]
+
+
+def stream_vocode(chunks: List[bytes], input_rate: int, output_rate: int) -> bytes:
+    resampler = Resampler(input_rate, output_rate)
+    return b"".join(resampler.resample(chunk) for chunk in chunks) + resampler.flush()
+
+
+def stream_audioop(chunks: List[bytes], input_rate: int, output_rate: int) -> bytes:
+    # how the callers used it before: no state carried between chunks
+    return b"".join(
+        audioop.ratecv(chunk, 2, 1, input_rate, output_rate, None)[0]
+        for chunk in chunks
+    )
+
+
+def get_snr_db(output: bytes, output_rate: int) -> float:
+    """Ratio of the 1kHz tone to everything else in the output"""
+    samples = np.frombuffer(output, dtype="<i2").astype(np.float64)
+    # skip the filter's warm-up
+    samples = samples[output_rate // 10 : -output_rate // 10]
+    t = np.arange(len(samples)) / output_rate
+    basis = np.stack(
+        [
+            np.sin(2 * np.pi * IN_BAND_FREQUENCY * t),
+            np.cos(2 * np.pi * IN_BAND_FREQUENCY * t),
+        ],
+        axis=1,
+    )
+    coefficients, *_ = np.linalg.lstsq(basis, samples, rcond=None)
+    tone = basis @ coefficients
+    noise = samples - tone
+    return 10 * np.log10(np.sum(tone**2) / max(np.sum(noise**2), 1e-9))
+
+
+def benchmark(
+    name: str,
+    stream: Callable[[List[bytes], int, int], bytes],
+    input_rate: int,
+    output_rate: int,
+):
+    # a tone the output keeps, plus one above the output's nyquist that has to be filtered out
+    out_of_band_frequency = 0.45 * input_rate if input_rate > output_rate else None
+    samples = create_tone(IN_BAND_FREQUENCY, input_rate, args.seconds)
+    if out_of_band_frequency is not None and out_of_band_frequency > output_rate / 2:
+        samples += create_tone(out_of_band_frequency, input_rate, args.seconds)
+    chunks = chunk_pcm(to_pcm(samples), input_rate)
+    start = time.perf_counter()
+    output = stream(chunks, input_rate, output_rate)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:8} {1000 * elapsed / args.seconds:7.3f} ms CPU per second of audio, "
+        + f"SNR {get_snr_db(output, output_rate):6.1f} dB"
+    )
+
+
+for input_rate, output_rate in COMMON_SAMPLE_RATES:
+    print(f"{input_rate} Hz -> {output_rate} Hz, {args.chunk_ms}ms chunks")
+    benchmark("vocode", stream_vocode, input_rate, output_rate)
+    if audioop is not None:
+        benchmark("audioop", stream_audioop, input_rate, output_rate)
@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import io
+import time
+import tracemalloc
+import wave
+from typing import Any, AsyncGenerator, Callable, List
+
+import numpy as np
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.synthesizer.base_synthesizer import (
+    encode_as_wav,
+    split_into_chunks,
+)
+
+parser = argparse.ArgumentParser(
+    description="Measure the allocations made by chunking synthesized audio.\n"
+    + "Example usage: python playground/streaming/synthesis_chunking_benchmark.py --seconds 30"
+)
+parser.add_argument(
+    "--seconds",
+    type=float,
+    default=10.0,
+    help="Seconds of synthesized audio to chunk",
+)
+parser.add_argument(
+    "--sampling_rate",
+    type=int,
+    default=16000,
+)
+parser.add_argument(
+    "--chunk_ms",
+    type=int,
+    default=100,
+    help="Size of the chunks sent to the output device",
+)
+parser.add_argument(
+    "--encode_as_wav",
+    action="store_true",
+    help="Prefix every chunk with a WAV header, like the client backend does",
+)
+args = parser.parse_args()
+
+synthesizer_config = SynthesizerConfig(
+    sampling_rate=args.sampling_rate,
+    audio_encoding=AudioEncoding.LINEAR16,
+    should_encode_as_wav=args.encode_as_wav,
+)
+
+
+def legacy_encode_as_wav(chunk: bytes) -> bytes:
+    # how encode_as_wav worked before: a wave writer per chunk
+    output_bytes_io = io.BytesIO()
+    in_memory_wav = wave.open(output_bytes_io, "wb")
+    in_memory_wav.setnchannels(1)
+    in_memory_wav.setsampwidth(2)
+    in_memory_wav.setframerate(synthesizer_config.sampling_rate)
+    in_memory_wav.writeframes(chunk)
+    output_bytes_io.seek(0)
+    return output_bytes_io.read()
+
+
+async def legacy_chunks(audio: bytes, chunk_size: int) -> AsyncGenerator[Any, None]:
+    for i in range(0, len(audio), chunk_size):
+        chunk = audio[i : i + chunk_size]
+        yield legacy_encode_as_wav(chunk) if args.encode_as_wav else chunk
+
+
+async def vocode_chunks(audio: bytes, chunk_size: int) -> AsyncGenerator[Any, None]:
+    for chunk, _ in split_into_chunks(audio, chunk_size):
+        yield encode_as_wav(chunk, synthesizer_config) if args.encode_as_wav else chunk
+
+
+async def consume(generator: AsyncGenerator[Any, None]) -> List[Any]:
+    # the output device's queue holds on to the chunks until they're played
+    return [chunk async for chunk in generator]
+
+
+def benchmark(
+    name: str, create_chunks: Callable[[bytes, int], AsyncGenerator[Any, None]]
+):
+    audio = (
+        (
+            np.random.default_rng(0).standard_normal(
+                int(args.seconds * args.sampling_rate)
+            )
+            * 3000
+        )
+        .astype("<i2")
+        .tobytes()
+    )
+    chunk_size = 2 * args.sampling_rate * args.chunk_ms // 1000
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    chunks = asyncio.run(consume(create_chunks(audio, chunk_size)))
+    elapsed = time.perf_counter() - start
+    stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+
+    num_blocks = sum(stat.count_diff for stat in stats)
+    num_bytes = sum(stat.size_diff for stat in stats)
+    print(
+        f"  {name:8} {num_blocks / args.seconds:8.1f} blocks, "
+        + f"{num_bytes / 1024 / args.seconds:8.1f} KiB per second of audio "
+        + f"in {len(chunks)} chunks, {1000 * elapsed / args.seconds:6.3f} ms per second"
+    )
+
+
+print(
+    f"{args.sampling_rate} Hz, {args.chunk_ms}ms chunks, "
+    + f"{'with' if args.encode_as_wav else 'without'} WAV headers"
+)
+benchmark("legacy", legacy_chunks)
+benchmark("vocode", vocode_chunks)
@@ -0,0 +1,61 @@
+from vocode.streaming.action.factory import ActionFactory
+from vocode.streaming.action.nylas_send_email import (
+    NylasSendEmail,
+    NylasSendEmailActionConfig,
+)
+from vocode.streaming.action.registry import ActionRegistry
+from vocode.streaming.action.transfer_call import TransferCallActionConfig
+
+
+class CountingActionFactory(ActionFactory):
+    def __init__(self):
+        self.num_created = 0
+
+    def create_action(self, action_config):
+        self.num_created += 1
+        return super().create_action(action_config)
+
+
+class StatefulNylasSendEmail(NylasSendEmail):
+    is_stateless = False
+
+
+class StatefulActionFactory(ActionFactory):
+    def create_action(self, action_config):
+        return StatefulNylasSendEmail(action_config, should_respond=True)
+
+
+def test_openai_function_is_computed_once_per_config():
+    registry = ActionRegistry()
+    action_factory = CountingActionFactory()
+    action_config = TransferCallActionConfig(to_phone="+15555555555")
+
+    function = registry.get_openai_function(action_factory, action_config)
+    assert function["name"] == action_config.type
+    assert (
+        registry.get_openai_function(
+            CountingActionFactory(), TransferCallActionConfig(to_phone="+15555555555")
+        )
+        is function
+    )
+    assert action_factory.num_created == 1
+
+    other_function = registry.get_openai_function(
+        action_factory, TransferCallActionConfig(to_phone="+15555555556")
+    )
+    assert other_function is not function
+    assert action_factory.num_created == 2
+
+
+def test_stateless_actions_are_reused():
+    registry = ActionRegistry()
+    action_factory = CountingActionFactory()
+    action_config = NylasSendEmailActionConfig()
+    action = registry.get_action(action_factory, action_config)
+    assert registry.get_action(action_factory, action_config) is action
+    assert action_factory.num_created == 1
+
+    stateful_factory = StatefulActionFactory()
+    assert registry.get_action(stateful_factory, action_config) is not (
+        registry.get_action(stateful_factory, action_config)
+    )
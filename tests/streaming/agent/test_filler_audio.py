@@ -0,0 +1,71 @@
+import asyncio
+from typing import AsyncGenerator, List
+
+import pytest
+
+from vocode.streaming.agent.base_agent import (
+    AgentResponseFillerAudio,
+    TranscriptionAgentInput,
+)
+from vocode.streaming.agent.echo_agent import EchoAgent
+from vocode.streaming.models.agent import EchoAgentConfig, FillerAudioConfig
+from vocode.streaming.models.transcript import Transcript
+from vocode.streaming.transcriber.base_transcriber import Transcription
+from vocode.streaming.utils.worker import InterruptibleEvent
+
+
+class SlowEchoAgent(EchoAgent):
+    response_delay_seconds = 0.0
+
+    async def generate_response(
+        self, human_input, conversation_id: str, is_interrupt: bool = False
+    ) -> AsyncGenerator[str, None]:
+        await asyncio.sleep(self.response_delay_seconds)
+        yield human_input
+
+
+async def respond_to(agent: EchoAgent, text: str) -> List:
+    await agent.process(
+        InterruptibleEvent(
+            TranscriptionAgentInput(
+                transcription=Transcription(
+                    message=text, confidence=1.0, is_final=True
+                ),
+                conversation_id="conversation_id",
+            )
+        )
+    )
+    responses = []
+    while not agent.output_queue.empty():
+        responses.append(agent.output_queue.get_nowait().payload)
+    return responses
+
+
+@pytest.mark.asyncio
+async def test_filler_audio_follows_expected_wait():
+    agent = SlowEchoAgent(
+        EchoAgentConfig(
+            send_filler_audio=FillerAudioConfig(
+                silence_threshold_seconds=0.05, min_expected_gap_seconds=0.05
+            )
+        )
+    )
+    agent.attach_transcript(Transcript())
+
+    # without any estimate yet, filler is sent
+    responses = await respond_to(agent, "hello")
+    assert isinstance(responses[0], AgentResponseFillerAudio)
+    assert responses[0].expected_wait_seconds is None
+
+    # the agent answered instantly, so filler would only get in the way
+    responses = await respond_to(agent, "hello")
+    assert not any(
+        isinstance(response, AgentResponseFillerAudio) for response in responses
+    )
+
+    agent.response_delay_seconds = 0.2
+    for _ in range(2):
+        await respond_to(agent, "hello")
+    responses = await respond_to(agent, "hello")
+    assert isinstance(responses[0], AgentResponseFillerAudio)
+    assert responses[0].expected_wait_seconds == pytest.approx(0.2, abs=0.1)
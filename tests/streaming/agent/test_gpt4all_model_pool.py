@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from vocode.streaming.agent.gpt4all_model_pool import GPT4AllModelPool
+
+
+class FakeModel:
+    def __init__(self, tokens: List[str], token_delay_seconds: float = 0):
+        self.tokens = tokens
+        self.token_delay_seconds = token_delay_seconds
+        self.num_tokens_generated = 0
+        self.finished = threading.Event()
+
+    def generate(self, prompt, new_text_callback):
+        try:
+            new_text_callback(prompt + " ")
+            for token in self.tokens:
+                time.sleep(self.token_delay_seconds)
+                self.num_tokens_generated += 1
+                new_text_callback(token)
+        finally:
+            self.finished.set()
+
+
+class FakeModelPool(GPT4AllModelPool):
+    def __init__(self, model: FakeModel):
+        self.fake_model = model
+        super().__init__(model_path="fake")
+
+    def load_model(self):
+        return self.fake_model
+
+
+@pytest.mark.asyncio
+async def test_streams_tokens_until_stop_sequence():
+    model_pool = FakeModelPool(
+        FakeModel(["Hi", " there", ".", "\nHu", "man", ": more"])
+    )
+    tokens = [token async for token in model_pool.generate("Human: hello\nAI:")]
+    assert "".join(tokens) == "Hi there.\n"
+    assert "Hu" not in tokens
+
+
+@pytest.mark.asyncio
+async def test_cancellation_stops_generation():
+    model = FakeModel(["token "] * 100, token_delay_seconds=0.01)
+    model_pool = FakeModelPool(model)
+    generator = model_pool.generate("prompt")
+    assert await generator.__anext__() == "token "
+    await generator.aclose()
+    assert await asyncio.get_running_loop().run_in_executor(
+        None, model.finished.wait, 1
+    )
+    assert model.num_tokens_generated < 100
+
+    # the model is free for the next conversation
+    model.tokens = ["next"]
+    assert [token async for token in model_pool.generate("prompt")] == ["next"]
@@ -0,0 +1,140 @@
+import asyncio
+from collections import deque
+import json
+from typing import List
+
+from aiohttp import web
+import pytest
+import pytest_asyncio
+
+from vocode.streaming.agent.llm_router import LLMRouter, reset_endpoint_stats
+from vocode.streaming.agent.utils import openai_get_tokens
+from vocode.streaming.models.agent import LLMRouterConfig, OpenAIEndpointConfig
+from vocode.streaming.utils.session_pool import close_shared_sessions
+
+PARAMETERS = {
+    "messages": [{"role": "user", "content": "hi"}],
+    "model": "gpt-3.5-turbo",
+}
+
+
+class StubEndpoint:
+    def __init__(self, text: str, delay_seconds: float = 0, status: int = 200):
+        self.text = text
+        self.delay_seconds = delay_seconds
+        self.status = status
+        self.num_requests = 0
+        self.num_cancelled = 0
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.num_requests += 1
+        if self.status != 200:
+            return web.json_response(
+                {"error": {"message": "unavailable", "type": "server_error"}},
+                status=self.status,
+            )
+        deadline = asyncio.get_running_loop().time() + self.delay_seconds
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.02)
+            if request.transport is None or request.transport.is_closing():
+                self.num_cancelled += 1
+                return web.Response()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for token in self.text.split(" "):
+            event = {
+                "choices": [
+                    {
+                        "delta": {"content": f"{token} "},
+                        "index": 0,
+                        "finish_reason": None,
+                    }
+                ]
+            }
+            await response.write(f"data: {json.dumps(event)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+
+@pytest_asyncio.fixture
+async def serve():
+    runners: List[web.AppRunner] = []
+
+    async def start(stub: StubEndpoint) -> OpenAIEndpointConfig:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", stub.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = runner.addresses[0][1]
+        return OpenAIEndpointConfig(
+            api_base=f"http://127.0.0.1:{port}/v1", api_key="test"
+        )
+
+    reset_endpoint_stats()
+    yield start
+    await close_shared_sessions()
+    for runner in runners:
+        await runner.cleanup()
+    reset_endpoint_stats()
+
+
+async def stream_text(router: LLMRouter) -> str:
+    return "".join(
+        [
+            token
+            async for token in openai_get_tokens(
+                router.stream_chat_completion(PARAMETERS)
+            )
+        ]
+    ).strip()
+
+
+@pytest.mark.asyncio
+async def test_hedges_when_first_token_is_late(serve):
+    slow = StubEndpoint("slow response", delay_seconds=5)
+    fast = StubEndpoint("fast response")
+    router = LLMRouter(
+        LLMRouterConfig(
+            endpoints=[await serve(slow), await serve(fast)],
+            max_hedge_delay_seconds=0.2,
+        )
+    )
+    assert await stream_text(router) == "fast response"
+    await asyncio.sleep(0.1)
+    assert slow.num_cancelled == 1
+
+    # losing the hedge counts against the slow endpoint without a TTFT sample
+    slow_endpoint, fast_endpoint = router.endpoints
+    assert router.get_stats(slow_endpoint).ttfts == deque()
+    assert router.get_stats(slow_endpoint).error_rate == 1
+    assert router.rank_endpoints() == [fast_endpoint, slow_endpoint]
+    assert await stream_text(router) == "fast response"
+    assert slow.num_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_fails_over_on_error(serve):
+    failing = StubEndpoint("", status=500)
+    healthy = StubEndpoint("hello there")
+    router = LLMRouter(
+        LLMRouterConfig(
+            endpoints=[await serve(failing), await serve(healthy)], hedge=False
+        )
+    )
+    assert await stream_text(router) == "hello there"
+    failing_endpoint, healthy_endpoint = router.endpoints
+    assert router.get_stats(failing_endpoint).error_rate == 1
+    assert router.get_stats(healthy_endpoint).error_rate == 0
+    assert router.rank_endpoints()[0] == healthy_endpoint
+
+
+@pytest.mark.asyncio
+async def test_raises_when_every_endpoint_fails(serve):
+    router = LLMRouter(
+        LLMRouterConfig(endpoints=[await serve(StubEndpoint("", status=500))])
+    )
+    with pytest.raises(Exception):
+        await stream_text(router)
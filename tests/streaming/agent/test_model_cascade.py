@@ -0,0 +1,119 @@
+import openai
+import pytest
+
+from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+from vocode.streaming.agent.model_cascade import ModelCascade, ModelRoute
+from vocode.streaming.models.agent import (
+    AzureOpenAIConfig,
+    ChatGPTAgentConfig,
+    LLMRouterConfig,
+    ModelCascadeConfig,
+    OpenAIEndpointConfig,
+)
+from vocode.streaming.models.transcript import Transcript
+
+
+@pytest.mark.parametrize(
+    "human_input,route",
+    [
+        ("Yes.", ModelRoute.FAST),
+        ("Okay, sounds good!", ModelRoute.FAST),
+        ("That's right", ModelRoute.FAST),
+        ("Uh huh", ModelRoute.FAST),
+        ("That's not right", ModelRoute.PRIMARY),
+        ("What time do you open?", ModelRoute.PRIMARY),
+        ("yes yes yes yes yes yes yes", ModelRoute.PRIMARY),
+        ("", ModelRoute.PRIMARY),
+    ],
+)
+def test_route(human_input, route):
+    assert ModelCascade(ModelCascadeConfig()).route(human_input) == route
+
+
+def test_route_with_actions():
+    cascade = ModelCascade(ModelCascadeConfig(), has_actions=True)
+    assert cascade.route("yes", "Should I transfer you?") == ModelRoute.PRIMARY
+    assert cascade.route("yes", "Your order has shipped.") == ModelRoute.FAST
+
+
+@pytest.mark.asyncio
+async def test_agent_uses_fast_model_for_simple_turns():
+    agent = ChatGPTAgent(
+        ChatGPTAgentConfig(
+            prompt_preamble="You are a helpful assistant",
+            model_name="gpt-4",
+            model_cascade=ModelCascadeConfig(fast_model_name="gpt-3.5-turbo"),
+        ),
+        openai_api_key="test",
+    )
+    agent.attach_transcript(Transcript())
+    agent.transcript.add_human_message("okay", conversation_id="conversation_id")
+    chat_parameters = agent.get_chat_parameters(
+        model_route=agent.get_model_route("okay")
+    )
+    assert chat_parameters["model"] == "gpt-3.5-turbo"
+    chat_parameters = agent.get_chat_parameters(
+        model_route=agent.get_model_route("Can you book a table for four?")
+    )
+    assert chat_parameters["model"] == "gpt-4"
+
+
+@pytest.mark.asyncio
+async def test_azure_agent_without_fast_engine_routes_to_primary(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test")
+    # the agent configures the global client for Azure, restore it afterwards
+    for attribute in ("api_type", "api_base", "api_version", "api_key"):
+        monkeypatch.setattr(openai, attribute, getattr(openai, attribute))
+    agent = ChatGPTAgent(
+        ChatGPTAgentConfig(
+            prompt_preamble="You are a helpful assistant",
+            azure_params=AzureOpenAIConfig(engine="gpt-4"),
+            model_cascade=ModelCascadeConfig(),
+        ),
+    )
+    agent.attach_transcript(Transcript())
+    model_route = agent.get_model_route("okay")
+    assert model_route == ModelRoute.PRIMARY
+    assert agent.get_chat_parameters(model_route=model_route)["engine"] == "gpt-4"
+
+    agent.agent_config.model_cascade.fast_engine = "gpt-35-turbo"
+    model_route = agent.get_model_route("okay")
+    assert model_route == ModelRoute.FAST
+    assert (
+        agent.get_chat_parameters(model_route=model_route)["engine"] == "gpt-35-turbo"
+    )
+
+
+def create_routed_agent(endpoints):
+    return ChatGPTAgent(
+        ChatGPTAgentConfig(
+            prompt_preamble="You are a helpful assistant",
+            model_name="gpt-4",
+            model_cascade=ModelCascadeConfig(fast_model_name="gpt-3.5-turbo"),
+            llm_router_config=LLMRouterConfig(endpoints=endpoints),
+        ),
+        openai_api_key="test",
+    )
+
+
+def test_router_endpoints_that_pin_a_model_route_to_primary():
+    # the router would send the pinned model, so the turn isn't counted as fast
+    agent = create_routed_agent(
+        [
+            OpenAIEndpointConfig(api_key="test", model_name="gpt-4"),
+            OpenAIEndpointConfig(api_key="test"),
+        ]
+    )
+    agent.attach_transcript(Transcript())
+    assert agent.get_model_route("okay") == ModelRoute.PRIMARY
+
+    agent = create_routed_agent([OpenAIEndpointConfig(api_key="test")])
+    agent.attach_transcript(Transcript())
+    model_route = agent.get_model_route("okay")
+    assert model_route == ModelRoute.FAST
+    assert agent.llm_router is not None
+    parameters = agent.llm_router.get_endpoint_parameters(
+        agent.llm_router.endpoints[0],
+        agent.get_chat_parameters(model_route=model_route),
+    )
+    assert parameters["model"] == "gpt-3.5-turbo"
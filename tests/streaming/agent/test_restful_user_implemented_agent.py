@@ -0,0 +1,84 @@
+import json
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+from vocode.streaming.agent.base_agent import AgentResponseStop
+from vocode.streaming.agent.restful_user_implemented_agent import (
+    RESTfulUserImplementedAgent,
+)
+from vocode.streaming.models.agent import (
+    RESTfulAgentEnd,
+    RESTfulAgentText,
+    RESTfulUserImplementedAgentConfig,
+)
+from vocode.streaming.utils.session_pool import close_shared_sessions
+
+AGENT_URL = "http://agent.test/respond"
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def shared_sessions():
+    # the agent posts through the process-wide session for its endpoint
+    yield
+    await close_shared_sessions()
+
+
+def create_agent() -> RESTfulUserImplementedAgent:
+    return RESTfulUserImplementedAgent(
+        RESTfulUserImplementedAgentConfig(
+            respond=RESTfulUserImplementedAgentConfig.EndpointConfig(url=AGENT_URL),
+            generate_responses=True,
+        )
+    )
+
+
+async def collect_responses(agent: RESTfulUserImplementedAgent):
+    return [
+        response
+        async for response in agent.generate_response(
+            "hello", conversation_id="conversation_id"
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_ndjson():
+    agent = create_agent()
+    body = "\n".join(
+        [
+            RESTfulAgentText(response="Hello").json(),
+            RESTfulAgentText(response=" there!").json(),
+            RESTfulAgentText(response=" How are").json(),
+            RESTfulAgentText(response=" you?").json(),
+            RESTfulAgentEnd().json(),
+        ]
+    )
+    with aioresponses() as mock:
+        mock.post(AGENT_URL, body=body, content_type="application/x-ndjson")
+        assert await collect_responses(agent) == ["Hello there!", "How are you?"]
+    stop_event = agent.output_queue.get_nowait()
+    assert isinstance(stop_event.payload, AgentResponseStop)
+
+
+@pytest.mark.asyncio
+async def test_generate_response_chunked_text():
+    agent = create_agent()
+    with aioresponses() as mock:
+        mock.post(
+            AGENT_URL, body="Sure. Let me check that for you", content_type="text/plain"
+        )
+        assert await collect_responses(agent) == [
+            "Sure.",
+            "Let me check that for you",
+        ]
+    assert agent.output_queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_generate_response_error_stops_conversation():
+    agent = create_agent()
+    with aioresponses() as mock:
+        mock.post(AGENT_URL, status=500)
+        assert await collect_responses(agent) == []
+    stop_event = agent.output_queue.get_nowait()
+    assert isinstance(stop_event.payload, AgentResponseStop)
@@ -6,9 +6,12 @@ from vocode.streaming.models.actions import (
     ActionInput,
     ActionOutput,
     FunctionCall,
+    FunctionFragment,
 )
 import pytest
 from vocode.streaming.agent.utils import (
+    JSONCompletenessTracker,
+    anthropic_get_tokens,
     collate_response_async,
     format_openai_chat_messages_from_transcript,
     openai_get_tokens,
@@ -325,6 +328,52 @@ async def test_stream_openai_response_async():
         assert actual_sentences == test_case.expected_sentences
 
 
+@pytest.mark.asyncio
+async def test_stream_anthropic_response_async():
+    completions = ["Hello", "Hello!", "Hello! How are", "Hello! How are you?"]
+    cumulative_events = [{"completion": completion} for completion in completions]
+    assert [
+        token
+        async for token in anthropic_get_tokens(_agen_from_list(cumulative_events))
+    ] == ["Hello", "!", " How are", " you?"]
+    assert [
+        sentence
+        async for sentence in collate_response_async(
+            anthropic_get_tokens(_agen_from_list(cumulative_events))
+        )
+    ] == ["Hello!", "How are you?"]
+
+
+def test_json_completeness_tracker():
+    tracker = JSONCompletenessTracker()
+    for chunk in ['{"a": "}', '{\\"", "b": [1, ', "{}]", "\n"]:
+        assert not tracker.feed(chunk)
+    assert tracker.feed("}")
+
+
+@pytest.mark.asyncio
+async def test_collate_response_yields_function_call_once_arguments_complete():
+    stream_finished = False
+
+    async def tokens():
+        nonlocal stream_finished
+        yield "One moment."
+        yield FunctionFragment(name="transfer_call", arguments='{"phone')
+        yield FunctionFragment(name="", arguments='_number": "+1"}')
+        yield FunctionFragment(name="", arguments="")
+        stream_finished = True
+
+    responses = collate_response_async(tokens(), get_functions=True)
+    assert await responses.__anext__() == "One moment."
+    function_call = await responses.__anext__()
+    assert function_call == FunctionCall(
+        name="transfer_call", arguments='{"phone_number": "+1"}'
+    )
+    assert not stream_finished
+    assert [response async for response in responses] == []
+    assert stream_finished
+
+
 def test_format_openai_chat_messages_from_transcript():
     test_cases = [
         (
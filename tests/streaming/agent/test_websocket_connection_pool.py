@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from vocode.streaming.agent import websocket_connection_pool
+from vocode.streaming.agent.websocket_connection_pool import (
+    MultiplexedWebSocketPool,
+    close_multiplexed_websocket_pools,
+    get_multiplexed_websocket_pool,
+)
+from vocode.streaming.models.websocket_agent import (
+    WebSocketAgentMessage,
+    WebSocketAgentTextMessage,
+)
+
+
+async def start_echo_server(port: int = 0):
+    """Echoes each message back to the conversation that sent it"""
+    connections = []
+
+    async def handler(ws):
+        connections.append(ws)
+        async for raw_message in ws:
+            message = WebSocketAgentMessage.parse_obj(json.loads(raw_message))
+            await ws.send(
+                WebSocketAgentTextMessage.from_text(
+                    f"echo: {message.data.text}",
+                    conversation_id=message.conversation_id,
+                ).json()
+            )
+
+    server = await websockets.serve(handler, "localhost", port)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://localhost:{port}", connections
+
+
+@pytest.mark.asyncio
+async def test_routes_messages_by_conversation_id():
+    server, url, connections = await start_echo_server()
+    pool = MultiplexedWebSocketPool(url, num_connections=2)
+    try:
+        subscriptions = [pool.subscribe(f"conversation-{i}") for i in range(10)]
+        for subscription in subscriptions:
+            await subscription.send(
+                WebSocketAgentTextMessage.from_text(subscription.conversation_id)
+            )
+        for subscription in subscriptions:
+            response = await asyncio.wait_for(subscription.receive(), timeout=5)
+            assert response.conversation_id == subscription.conversation_id
+            assert response.data.text == f"echo: {subscription.conversation_id}"
+        assert len(connections) == 2
+    finally:
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_buffers_messages_until_reconnected():
+    server, url, _ = await start_echo_server()
+    port = server.sockets[0].getsockname()[1]
+    pool = MultiplexedWebSocketPool(url, num_connections=1)
+    try:
+        subscription = pool.subscribe("conversation")
+        await asyncio.wait_for(pool.connections[0].is_connected.wait(), timeout=5)
+
+        server.close()
+        await server.wait_closed()
+        await subscription.send(WebSocketAgentTextMessage.from_text("while down"))
+
+        server, _, _ = await start_echo_server(port)
+        response = await asyncio.wait_for(subscription.receive(), timeout=10)
+        assert response.data.text == "echo: while down"
+        assert pool.connections[0].num_connects == 2
+    finally:
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_flow_control_blocks_when_disconnected():
+    pool = MultiplexedWebSocketPool(
+        "ws://localhost:1", num_connections=1, max_pending_messages=2
+    )
+    try:
+        subscription = pool.subscribe("conversation")
+        await subscription.send(WebSocketAgentTextMessage.from_text("one"))
+        await subscription.send(WebSocketAgentTextMessage.from_text("two"))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                subscription.send(WebSocketAgentTextMessage.from_text("three")),
+                timeout=0.2,
+            )
+        assert len(pool.connections[0].outgoing) == 2
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_drops_queued_messages():
+    pool = MultiplexedWebSocketPool(
+        "ws://localhost:1", num_connections=1, max_pending_messages=2
+    )
+    try:
+        ended = pool.subscribe("ended")
+        ongoing = pool.subscribe("ongoing")
+        await ended.send(WebSocketAgentTextMessage.from_text("one"))
+        await ongoing.send(WebSocketAgentTextMessage.from_text("two"))
+        await ended.send(WebSocketAgentTextMessage.from_text("three"))
+        blocked_send = asyncio.create_task(
+            ended.send(WebSocketAgentTextMessage.from_text("four"))
+        )
+        await asyncio.sleep(0.05)
+
+        pool.unsubscribe(ended)
+        assert [
+            subscription.conversation_id
+            for subscription, _ in pool.connections[0].outgoing
+        ] == ["ongoing"]
+        # a send that was waiting for room returns without queueing its message
+        await asyncio.wait_for(blocked_send, timeout=1)
+        assert len(pool.connections[0].outgoing) == 1
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pools_are_closed_with_their_loop():
+    server, url, _ = await start_echo_server()
+    try:
+        pool = get_multiplexed_websocket_pool(url, num_connections=1)
+        assert get_multiplexed_websocket_pool(url, num_connections=1) is pool
+        await close_multiplexed_websocket_pools()
+        assert all(connection.run_task.done() for connection in pool.connections)
+        # the pools hold tasks on the loop, so they mustn't be left behind
+        assert (
+            asyncio.get_running_loop() not in websocket_connection_pool._pools_by_loop
+        )
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from tests.streaming.fixtures.synthesizer import TestSynthesizer, TestSynthesizerConfig
+from tests.streaming.fixtures.transcriber import (
+    TestAsyncTranscriber,
+    TestTranscriberConfig,
+)
+from vocode.streaming.models.agent import EchoAgentConfig
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.telephony import TwilioCallConfig, TwilioConfig
+from vocode.streaming.synthesizer.factory import SynthesizerFactory
+from vocode.streaming.telephony.preconnect_registry import PreconnectRegistry
+from vocode.streaming.transcriber.factory import TranscriberFactory
+from vocode.streaming.utils.warmup_registry import (
+    get_speech_chunk_size,
+    get_warmup_registry,
+)
+
+
+class IdleTimeoutTranscriber(TestAsyncTranscriber):
+    """Hangs up after a stretch without audio and reconnects, like DeepgramTranscriber"""
+
+    idle_timeout_seconds = 0.1
+
+    def __init__(self, transcriber_config):
+        super().__init__(transcriber_config)
+        self.num_restarts = 0
+
+    async def _run_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self.input_queue.get(), self.idle_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                self.num_restarts += 1
+
+
+class StuckTranscriber(TestAsyncTranscriber):
+    """Never finishes its handshake"""
+
+    async def ready(self):
+        await asyncio.Event().wait()
+
+
+class StuckTranscriberFactory(TranscriberFactory):
+    def create_transcriber(self, transcriber_config, logger=None):
+        return StuckTranscriber(transcriber_config)
+
+
+class TestTranscriberFactory(TranscriberFactory):
+    __test__ = False
+
+    def create_transcriber(self, transcriber_config, logger=None):
+        return TestAsyncTranscriber(transcriber_config)
+
+
+class IdleTimeoutTranscriberFactory(TranscriberFactory):
+    def create_transcriber(self, transcriber_config, logger=None):
+        return IdleTimeoutTranscriber(transcriber_config)
+
+
+class TestSynthesizerFactory(SynthesizerFactory):
+    __test__ = False
+
+    def create_synthesizer(self, synthesizer_config, logger=None):
+        return TestSynthesizer(synthesizer_config)
+
+
+def create_call_config(initial_message: BaseMessage) -> TwilioCallConfig:
+    return TwilioCallConfig(
+        transcriber_config=TestTranscriberConfig(
+            sampling_rate=8000, audio_encoding=AudioEncoding.MULAW, chunk_size=160
+        ),
+        agent_config=EchoAgentConfig(initial_message=initial_message),
+        synthesizer_config=TestSynthesizerConfig(
+            sampling_rate=8000, audio_encoding=AudioEncoding.MULAW
+        ),
+        twilio_config=TwilioConfig(account_sid="", auth_token=""),
+        twilio_sid="CA123",
+        from_phone="+15555550100",
+        to_phone="+15555550101",
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_returns_warm_pipeline():
+    registry = PreconnectRegistry()
+    initial_message = BaseMessage(text="Thanks for calling, how can I help?")
+    registry.preconnect(
+        "conversation",
+        create_call_config(initial_message),
+        transcriber_factory=TestTranscriberFactory(),
+        synthesizer_factory=TestSynthesizerFactory(),
+    )
+
+    pipeline = await registry.claim("conversation")
+    assert pipeline is not None
+    assert pipeline.transcriber.worker_task is not None
+    assert (
+        get_warmup_registry().get_synthesis_result(
+            pipeline.synthesizer,
+            initial_message,
+            get_speech_chunk_size(pipeline.synthesizer.get_synthesizer_config()),
+        )
+        is not None
+    )
+    # the websocket only claims a pipeline once
+    assert await registry.claim("conversation") is None
+    await pipeline.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_pipeline_is_torn_down():
+    registry = PreconnectRegistry(ttl_seconds=0.05)
+    pipeline = registry.preconnect(
+        "conversation",
+        create_call_config(BaseMessage(text="Hello")),
+        transcriber_factory=TestTranscriberFactory(),
+        synthesizer_factory=TestSynthesizerFactory(),
+    )
+    await asyncio.sleep(0.2)
+    assert await registry.claim("conversation") is None
+    assert pipeline.transcriber.worker_task.done()
+
+
+@pytest.mark.asyncio
+async def test_idle_pipeline_keeps_its_transcriber_connected():
+    registry = PreconnectRegistry(keepalive_interval_seconds=0.02)
+    pipeline = registry.preconnect(
+        "conversation",
+        create_call_config(BaseMessage(text="Hello")),
+        transcriber_factory=IdleTimeoutTranscriberFactory(),
+        synthesizer_factory=TestSynthesizerFactory(),
+    )
+    # the media websocket takes longer than the transcriber's idle timeout to connect
+    await asyncio.sleep(0.3)
+    assert await registry.claim("conversation") is pipeline
+    assert pipeline.transcriber.num_restarts == 0
+    assert pipeline.keepalive_task is None
+    await pipeline.tear_down()
+    await asyncio.wait([pipeline.transcriber.worker_task])
+
+
+@pytest.mark.asyncio
+async def test_claim_gives_up_on_a_stuck_warm_up():
+    registry = PreconnectRegistry(warm_up_timeout_seconds=0.05)
+    pipeline = registry.preconnect(
+        "conversation",
+        create_call_config(BaseMessage(text="Hello")),
+        transcriber_factory=StuckTranscriberFactory(),
+        synthesizer_factory=TestSynthesizerFactory(),
+    )
+    # the call builds a fresh pipeline instead
+    assert await registry.claim("conversation") is None
+    assert pipeline.warm_up_task.cancelled()
+    assert pipeline.keepalive_task is None
+    await asyncio.wait([pipeline.transcriber.worker_task])
@@ -7,10 +7,12 @@ from tests.streaming.fixtures.transcriber import (
     TestAsyncTranscriber,
     TestTranscriberConfig,
 )
+from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
 from vocode.streaming.agent.echo_agent import EchoAgent
 from vocode.streaming.models.agent import EchoAgentConfig
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import SentimentConfig
 from vocode.streaming.streaming_conversation import StreamingConversation
 
 logging.basicConfig()
@@ -49,3 +51,51 @@ async def test_streaming_conversation():
     await conversation.start()
     await asyncio.sleep(1)
     await conversation.terminate()
+
+
+class RecordingBotSentimentAnalyser:
+    def __init__(self):
+        self.transcripts = []
+
+    async def analyse(self, transcript: str) -> BotSentiment:
+        self.transcripts.append(transcript)
+        return BotSentiment(emotion="friendly", degree=0.5)
+
+
+@pytest.mark.asyncio
+async def test_bot_sentiment_tracks_recent_messages(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    sampling_rate = 16000
+    audio_encoding = AudioEncoding.LINEAR16
+    silent_output_device = SilentOutputDevice(
+        sampling_rate=sampling_rate, audio_encoding=audio_encoding
+    )
+    synthesizer_config = TestSynthesizerConfig.from_output_device(silent_output_device)
+    synthesizer_config.sentiment_config = SentimentConfig(
+        window_size=2, debounce_seconds=0.05
+    )
+    conversation = StreamingConversation(
+        output_device=silent_output_device,
+        transcriber=TestAsyncTranscriber(
+            TestTranscriberConfig(
+                sampling_rate=sampling_rate,
+                audio_encoding=audio_encoding,
+                chunk_size=2048,
+            )
+        ),
+        agent=EchoAgent(EchoAgentConfig(track_bot_sentiment=True)),
+        synthesizer=TestSynthesizer(synthesizer_config),
+        logger=logger,
+    )
+    bot_sentiment_analyser = RecordingBotSentimentAnalyser()
+    conversation.bot_sentiment_analyser = bot_sentiment_analyser
+    await conversation.start()
+    for message in ["one", "two", "three"]:
+        conversation.receive_message(message)
+        await asyncio.sleep(0.3)
+    await conversation.terminate()
+
+    assert conversation.bot_sentiment == BotSentiment(emotion="friendly", degree=0.5)
+    last_window = bot_sentiment_analyser.transcripts[-1]
+    assert last_window.count("\n") == 1
+    assert "three" in last_window and "one" not in last_window
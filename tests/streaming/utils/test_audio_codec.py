@@ -0,0 +1,51 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.utils.audio_codec import (
+    decode_mulaw,
+    encode_mulaw,
+    get_silent_chunk,
+)
+
+ALL_SAMPLES = np.arange(65536, dtype=np.uint16).view("<i2").tobytes()
+ALL_MULAW_BYTES = bytes(range(256))
+
+
+def test_matches_audioop():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+    assert encode_mulaw(ALL_SAMPLES) == audioop.lin2ulaw(ALL_SAMPLES, 2)
+    assert decode_mulaw(ALL_MULAW_BYTES) == audioop.ulaw2lin(ALL_MULAW_BYTES, 2)
+
+
+def test_round_trip_is_stable():
+    # 0x7f is mu-law's negative zero, which encodes back to 0xff
+    decoded = decode_mulaw(ALL_MULAW_BYTES)
+    assert decode_mulaw(encode_mulaw(decoded)) == decoded
+    assert encode_mulaw(b"\x00\x00") == b"\xff"
+    assert decode_mulaw(b"\xff") == b"\x00\x00"
+
+
+def test_writes_into_preallocated_buffer():
+    out = bytearray(2 * len(ALL_MULAW_BYTES) + 10)
+    decoded = decode_mulaw(ALL_MULAW_BYTES, out=out)
+    assert bytes(decoded) == decode_mulaw(ALL_MULAW_BYTES)
+    assert out[: len(decoded)] == decoded
+
+    encoded = encode_mulaw(decoded, out=np.empty(len(ALL_MULAW_BYTES), np.uint8))
+    assert bytes(encoded) == encode_mulaw(decoded)
+
+    with pytest.raises(ValueError):
+        decode_mulaw(ALL_MULAW_BYTES, out=bytearray(10))
+
+
+def test_silent_chunk():
+    assert get_silent_chunk(AudioEncoding.MULAW, 160) == b"\xff" * 160
+    assert get_silent_chunk(AudioEncoding.LINEAR16, 320) == b"\x00" * 320
+    assert get_silent_chunk(AudioEncoding.MULAW, 160) is get_silent_chunk(
+        AudioEncoding.MULAW, 160
+    )
@@ -0,0 +1,105 @@
+import asyncio
+import gc
+
+import pytest
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.synthesizer import RimeSynthesizerConfig
+from vocode.streaming.synthesizer.factory import SynthesizerFactory
+from vocode.streaming.utils.client_pool import ClientPool
+from vocode.streaming.utils.session_pool import close_shared_sessions
+
+
+def create_rime_config(speaker: str) -> RimeSynthesizerConfig:
+    return RimeSynthesizerConfig(
+        speaker=speaker, sampling_rate=8000, audio_encoding=AudioEncoding.MULAW
+    )
+
+
+class FakeClient:
+    def __init__(self):
+        self.is_connected = True
+
+
+def test_shared_client_is_recreated_when_unhealthy():
+    pool = ClientPool()
+    client = pool.get_client("provider", FakeClient)
+    assert pool.get_client("provider", FakeClient) is client
+
+    client.is_connected = False
+    new_client = pool.get_client(
+        "provider", FakeClient, is_healthy=lambda c: c.is_connected
+    )
+    assert new_client is not client
+
+
+def test_shared_clients_are_bounded():
+    pool = ClientPool(max_shared_clients=2)
+    first_client = pool.get_client("first", FakeClient)
+    pool.get_client("second", FakeClient)
+    pool.get_client("third", FakeClient)
+    assert pool.get_client("first", FakeClient) is not first_client
+
+
+def test_checked_in_clients_are_reused():
+    pool = ClientPool(max_idle_clients_per_key=1)
+    pool.checkin("provider", FakeClient())
+    pool.checkin("provider", FakeClient())
+    assert len(pool.idle_clients["provider"]) == 1
+
+    client = pool.checkout("provider", FakeClient)
+    # a second conversation doesn't share the checked out client
+    other_client = pool.checkout("provider", FakeClient)
+    assert other_client is not client
+
+    pool.checkin("provider", client)
+    client.is_connected = False
+    pool.checkin("provider", other_client)
+    assert pool.checkout(
+        "provider", FakeClient, is_healthy=lambda c: c.is_connected
+    ) not in (client, other_client)
+
+
+class FakeLoopClient:
+    """Holds its loop like a grpc.aio channel does"""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.is_closed = False
+
+    async def close(self):
+        self.is_closed = True
+
+
+def test_loop_clients_are_closed_with_their_loop():
+    pool = ClientPool()
+
+    async def get_loop_client():
+        client = pool.get_loop_client(
+            "provider", FakeLoopClient, close=FakeLoopClient.close
+        )
+        assert pool.get_loop_client("provider", FakeLoopClient) is client
+        await pool.close_loop_clients()
+        assert client.is_closed
+        return client
+
+    clients = [asyncio.run(get_loop_client()) for _ in range(3)]
+    # a new loop can't use the channel of a client created on another one
+    assert len(set(map(id, clients))) == 3
+    gc.collect()
+    assert pool.clients_by_loop == {}
+
+
+@pytest.mark.asyncio
+async def test_synthesizers_share_provider_sessions():
+    factory = SynthesizerFactory()
+    session = factory.get_aiohttp_session(create_rime_config("young_male"))
+    assert session is not None
+    assert session is factory.get_aiohttp_session(create_rime_config("old_female"))
+    assert (
+        SynthesizerFactory(use_shared_sessions=False).get_aiohttp_session(
+            create_rime_config("young_male")
+        )
+        is None
+    )
+    await close_shared_sessions()
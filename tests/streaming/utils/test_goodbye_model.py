@@ -0,0 +1,25 @@
+import pytest
+
+from vocode.streaming.models.agent import GoodbyeModelType
+from vocode.streaming.utils.goodbye_model import (
+    LexicalGoodbyeModel,
+    create_goodbye_model,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "text,is_goodbye",
+    [
+        ("Okay, bye!", True),
+        ("Thanks so much, have a good day.", True),
+        ("Great, talk to you later then", True),
+        ("Can you take care of my billing issue?", False),
+        ("What time do you close?", False),
+    ],
+)
+async def test_lexical_goodbye_model(text: str, is_goodbye: bool):
+    goodbye_model = create_goodbye_model(GoodbyeModelType.LEXICAL)
+    assert isinstance(goodbye_model, LexicalGoodbyeModel)
+    await goodbye_model.initialize_embeddings()
+    assert await goodbye_model.is_goodbye(text) == is_goodbye
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.events import Sender
+from vocode.streaming.models.transcript import Transcript
+from vocode.streaming.utils.rate_limiter import (
+    LLMRateLimiter,
+    LLMRateLimitExceeded,
+    RequestPriority,
+    estimate_tokens,
+    set_llm_rate_limiter,
+)
+
+
+def test_estimate_tokens():
+    messages = [{"role": "user", "content": "a" * 40}, {"role": "assistant"}]
+    assert estimate_tokens(messages=messages, max_tokens=100) == 118
+
+
+@pytest.mark.asyncio
+async def test_live_turns_go_ahead_of_background_work():
+    # refills 100 tokens a second
+    rate_limiter = LLMRateLimiter(requests_per_minute=1000, tokens_per_minute=6000)
+    await rate_limiter.acquire(6000)
+
+    completed = []
+
+    async def acquire(name, priority):
+        await rate_limiter.acquire(10, priority=priority)
+        completed.append(name)
+
+    background = asyncio.create_task(acquire("background", RequestPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    live_turn = asyncio.create_task(acquire("live_turn", RequestPriority.LIVE_TURN))
+    await asyncio.gather(background, live_turn)
+    assert completed == ["live_turn", "background"]
+
+
+@pytest.mark.asyncio
+async def test_drops_requests_that_cannot_make_their_deadline():
+    rate_limiter = LLMRateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+    await rate_limiter.acquire(600)
+    with pytest.raises(LLMRateLimitExceeded):
+        await rate_limiter.acquire(100, timeout=1)
+    # a dropped request doesn't hold up the ones behind it
+    await rate_limiter.acquire(1, timeout=1)
+    assert rate_limiter.queue == []
+
+
+@pytest.mark.asyncio
+async def test_agent_falls_back_to_a_filler_when_dropped():
+    rate_limiter = LLMRateLimiter(
+        requests_per_minute=1,
+        tokens_per_minute=6000,
+        max_queue_seconds_by_priority={RequestPriority.LIVE_TURN: 0.1},
+    )
+    await rate_limiter.acquire(1)
+    set_llm_rate_limiter(rate_limiter)
+    try:
+        agent = ChatGPTAgent(
+            ChatGPTAgentConfig(prompt_preamble="You are a helpful assistant"),
+            openai_api_key="test",
+        )
+        transcript = Transcript()
+        transcript.add_message_from_props(
+            "What time do you open?", Sender.HUMAN, "conv"
+        )
+        agent.attach_transcript(transcript)
+        responses = [
+            response
+            async for response in agent.generate_response(
+                "What time do you open?", "conv"
+            )
+        ]
+    finally:
+        set_llm_rate_limiter(None)
+    assert responses == ["Sorry?"]
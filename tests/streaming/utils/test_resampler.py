@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+
+from vocode.streaming.utils.resampler import Resampler, get_up_down, resample
+
+
+def create_noise(sample_rate: int) -> bytes:
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(sample_rate) * 3000).astype("<i2").tobytes()
+
+
+@pytest.mark.parametrize(
+    "input_sample_rate,output_sample_rate",
+    [(44100, 8000), (24000, 8000), (16000, 8000), (8000, 16000)],
+)
+def test_streaming_matches_resampling_at_once(input_sample_rate, output_sample_rate):
+    audio = create_noise(input_sample_rate)
+    expected = resample_poly(
+        np.frombuffer(audio, dtype="<i2").astype(np.float64),
+        *get_up_down(input_sample_rate, output_sample_rate),
+    )
+
+    resampler = Resampler(input_sample_rate, output_sample_rate)
+    chunk_size = 2 * input_sample_rate // 50
+    output = b"".join(
+        resampler.resample(audio[i : i + chunk_size])
+        for i in range(0, len(audio), chunk_size)
+    )
+    output += resampler.flush()
+
+    assert output == resample(audio, input_sample_rate, output_sample_rate)
+    output_samples = np.frombuffer(output, dtype="<i2")
+    assert len(output_samples) == len(expected)
+    assert np.abs(output_samples - np.clip(expected, -32768, 32767)).max() <= 1
+
+
+def test_removes_frequencies_above_output_nyquist():
+    t = np.arange(24000) / 24000
+    # a 6kHz tone would alias to 2kHz at 8kHz without the lowpass filter
+    audio = (8000 * np.sin(2 * np.pi * 6000 * t)).astype("<i2").tobytes()
+    output = np.frombuffer(resample(audio, 24000, 8000), dtype="<i2")
+    assert np.abs(output[100:-100]).max() < 80
@@ -0,0 +1,104 @@
+import pytest
+
+from tests.streaming.fixtures.synthesizer import TestSynthesizer, TestSynthesizerConfig
+from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
+from vocode.streaming.models.agent import EchoAgentConfig, FillerAudioConfig
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.synthesizer.base_synthesizer import FillerAudio
+from vocode.streaming.utils.warmup_registry import (
+    WarmupRegistry,
+    get_speech_chunk_size,
+)
+
+
+class CountingSynthesizer(TestSynthesizer):
+    num_speech_created = 0
+    num_filler_audios_created = 0
+
+    async def get_phrase_filler_audios(self):
+        CountingSynthesizer.num_filler_audios_created += 1
+        return [
+            FillerAudio(
+                message=BaseMessage(text="Um..."),
+                audio_data=b"\x00" * 800,
+                synthesizer_config=self.synthesizer_config,
+            )
+        ]
+
+    async def create_speech(self, message, chunk_size, bot_sentiment=None):
+        CountingSynthesizer.num_speech_created += 1
+        return await super().create_speech(message, chunk_size, bot_sentiment)
+
+
+def create_synthesizer() -> CountingSynthesizer:
+    return CountingSynthesizer(
+        TestSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.MULAW)
+    )
+
+
+@pytest.mark.asyncio
+async def test_warm_up_renders_assets_once():
+    registry = WarmupRegistry()
+    initial_message = BaseMessage(text="Hello, how can I help?")
+    agent_config = EchoAgentConfig(
+        initial_message=initial_message,
+        send_filler_audio=True,
+    )
+    warmup_synthesizer = create_synthesizer()
+    await registry.warm_up(agent_config, warmup_synthesizer)
+    await warmup_synthesizer.tear_down()
+    assert CountingSynthesizer.num_speech_created == 1
+
+    # a call with the same synthesizer config only does lookups
+    synthesizer = create_synthesizer()
+    chunk_size = get_speech_chunk_size(synthesizer.get_synthesizer_config())
+    synthesis_result = registry.get_synthesis_result(
+        synthesizer, initial_message, chunk_size
+    )
+    assert synthesis_result is not None
+    fresh_result = await synthesizer.create_speech(initial_message, chunk_size)
+    assert [
+        chunk_result.chunk async for chunk_result in synthesis_result.chunk_generator
+    ] == [chunk_result.chunk async for chunk_result in fresh_result.chunk_generator]
+    assert (
+        registry.get_synthesis_result(
+            synthesizer, BaseMessage(text="something else"), chunk_size
+        )
+        is None
+    )
+
+    await registry.set_filler_audios(synthesizer, FillerAudioConfig())
+    assert synthesizer.filler_audios[0].message.text == "Um..."
+    assert CountingSynthesizer.num_filler_audios_created == 1
+    await synthesizer.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_speech_is_keyed_by_sentiment_and_evicted_lru():
+    registry = WarmupRegistry(max_cached_speech=2)
+    synthesizer = create_synthesizer()
+    chunk_size = get_speech_chunk_size(synthesizer.get_synthesizer_config())
+    hello, goodbye, thanks = (
+        BaseMessage(text=text) for text in ("Hello", "Goodbye", "Thanks")
+    )
+    await registry.render_speech(synthesizer, hello, chunk_size)
+    # audio rendered without a sentiment isn't played for a sentiment-colored turn
+    assert (
+        registry.get_synthesis_result(
+            synthesizer,
+            hello,
+            chunk_size,
+            bot_sentiment=BotSentiment(emotion="cheerful", degree=0.8),
+        )
+        is None
+    )
+
+    await registry.render_speech(synthesizer, goodbye, chunk_size)
+    assert registry.get_synthesis_result(synthesizer, hello, chunk_size) is not None
+    await registry.render_speech(synthesizer, thanks, chunk_size)
+    # looking up "Hello" made "Goodbye" the least recently used
+    assert registry.get_synthesis_result(synthesizer, goodbye, chunk_size) is None
+    assert registry.get_synthesis_result(synthesizer, hello, chunk_size) is not None
+    assert registry.get_synthesis_result(synthesizer, thanks, chunk_size) is not None
+    await synthesizer.tear_down()
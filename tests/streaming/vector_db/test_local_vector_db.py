@@ -0,0 +1,116 @@
+import hashlib
+from typing import List
+
+import numpy as np
+import pytest
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.vector_db.factory import VectorDBFactory
+from vocode.streaming.vector_db.local_vector_db import LocalVectorDB
+
+DIMENSIONS = 16
+
+
+def fake_embedding(text: str) -> List[float]:
+    seed = int(hashlib.sha256(text.encode()).hexdigest(), 16) % 2**32
+    return list(np.random.default_rng(seed).normal(size=DIMENSIONS))
+
+
+class FakeEmbeddingsLocalVectorDB(LocalVectorDB):
+    async def create_openai_embedding(self, text, model=None) -> List[float]:
+        return fake_embedding(text)
+
+    async def create_openai_embeddings(self, texts, model=None):
+        return [fake_embedding(text) for text in texts]
+
+
+def create_vector_db(tmp_path, **kwargs) -> LocalVectorDB:
+    return FakeEmbeddingsLocalVectorDB(
+        LocalVectorDBConfig(index_path=str(tmp_path), **kwargs)
+    )
+
+
+@pytest.mark.asyncio
+async def test_factory(tmp_path):
+    vector_db = VectorDBFactory().create_vector_db(
+        LocalVectorDBConfig(index_path=str(tmp_path))
+    )
+    assert isinstance(vector_db, LocalVectorDB)
+    await vector_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_search(tmp_path):
+    vector_db = create_vector_db(tmp_path, top_k=2)
+    texts = [f"document {i}" for i in range(10)]
+    await vector_db.add_texts(
+        texts, metadatas=[{"source": "test", "i": i} for i in range(10)]
+    )
+
+    results = await vector_db.similarity_search_with_score("document 3")
+    assert len(results) == 2
+    document, score = results[0]
+    assert document.page_content == "document 3"
+    assert document.metadata == {"source": "test", "i": 3}
+    assert score == pytest.approx(1.0, abs=1e-5)
+    assert results[1][1] < score
+
+    results = await vector_db.similarity_search_with_score(
+        "document 3", filter={"i": {"$in": [5, 6]}}
+    )
+    assert sorted(document.metadata["i"] for document, _ in results) == [5, 6]
+    assert (
+        await vector_db.similarity_search_with_score("document 3", namespace="other")
+        == []
+    )
+    await vector_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_incremental_adds_are_shared(tmp_path):
+    writer = create_vector_db(tmp_path)
+    reader = create_vector_db(tmp_path)
+    await writer.add_texts(["first"], ids=["a"])
+    await writer.add_texts(["second"], ids=["b"])
+    results = await reader.similarity_search_with_score("second")
+    assert results[0][0].page_content == "second"
+
+    # upserting an existing id overwrites it in place
+    await writer.add_texts(["third"], ids=["b"])
+    results = await reader.similarity_search_with_score("third")
+    assert results[0][0].page_content == "third"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert reader.num_rows == 2
+    await writer.tear_down()
+    await reader.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_partitioned_search(tmp_path):
+    vector_db = create_vector_db(tmp_path, num_partitions=4, num_probes=1)
+    texts = [f"document {i}" for i in range(200)]
+    await vector_db.add_texts(texts)
+    assert vector_db.partitions is not None
+    for text in texts[:20]:
+        results = await vector_db.similarity_search_with_score(text)
+        assert results[0][0].page_content == text
+    await vector_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_index_is_shared_and_read_off_the_event_loop(tmp_path):
+    writer = create_vector_db(tmp_path)
+    await writer.add_texts(["first"], ids=["a"])
+
+    reader = create_vector_db(tmp_path)
+    assert reader.index is writer.index
+    # a different partitioning needs its own index
+    partitioned = create_vector_db(tmp_path, num_partitions=4)
+    assert partitioned.index is not writer.index
+    # creating a vector DB for a conversation doesn't read the index files
+    assert partitioned.num_rows == 0
+    results = await partitioned.similarity_search_with_score("first")
+    assert results[0][0].page_content == "first"
+    assert partitioned.num_rows == 1
+    for vector_db in (writer, reader, partitioned):
+        await vector_db.tear_down()
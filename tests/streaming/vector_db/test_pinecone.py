@@ -0,0 +1,100 @@
+import os
+from typing import List
+
+import openai
+import pytest
+from aioresponses import aioresponses
+from yarl import URL
+
+from vocode.streaming.models.vector_db import PineconeConfig
+from vocode.streaming.vector_db import base_vector_db, pinecone
+from vocode.streaming.vector_db.pinecone import PineconeDB
+
+UPSERT_URL = "https://index.svc.env.pinecone.io/vectors/upsert"
+
+
+class FakeEmbeddingsPineconeDB(PineconeDB):
+    def __init__(self, **kwargs):
+        super().__init__(
+            PineconeConfig(
+                index="index",
+                api_key="key",
+                api_environment="env",
+                embedding_batch_size=2,
+                upsert_batch_size=3,
+                **kwargs,
+            )
+        )
+        self.embedding_requests: List[List[str]] = []
+        self.num_rate_limited_requests = 0
+
+    async def create_openai_embeddings(self, texts, model=None):
+        self.embedding_requests.append(texts)
+        if self.num_rate_limited_requests:
+            self.num_rate_limited_requests -= 1
+            raise openai.error.RateLimitError("rate limited")
+        return [[float(len(text))] for text in texts]
+
+
+def get_upserts(m: aioresponses):
+    return m.requests.get(("POST", URL(UPSERT_URL)), [])
+
+
+@pytest.mark.asyncio
+async def test_add_texts_batches_and_caches():
+    pinecone_db = FakeEmbeddingsPineconeDB()
+    texts = [f"text {i}" for i in range(5)]
+    with aioresponses() as m:
+        m.post(UPSERT_URL, status=200, payload={"upsertedCount": 3}, repeat=True)
+        ids = await pinecone_db.add_texts(texts)
+        assert len(ids) == 5
+        assert [len(batch) for batch in pinecone_db.embedding_requests] == [2, 2, 1]
+        assert sorted(
+            len(call.kwargs["json"]["vectors"]) for call in get_upserts(m)
+        ) == [2, 3]
+
+        # unchanged texts are served from the embedding cache
+        await pinecone_db.add_texts(texts)
+        assert len(pinecone_db.embedding_requests) == 3
+    await pinecone_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_upsert_retries(monkeypatch):
+    monkeypatch.setattr(pinecone, "UPSERT_INITIAL_BACKOFF_SECONDS", 0)
+    pinecone_db = FakeEmbeddingsPineconeDB()
+    with aioresponses() as m:
+        m.post(UPSERT_URL, status=503, body="unavailable")
+        m.post(UPSERT_URL, status=200, payload={"upsertedCount": 1})
+        await pinecone_db.add_texts(["text"])
+        assert len(get_upserts(m)) == 2
+    await pinecone_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_embedding_retries(monkeypatch):
+    monkeypatch.setattr(base_vector_db, "EMBEDDING_INITIAL_BACKOFF_SECONDS", 0)
+    pinecone_db = FakeEmbeddingsPineconeDB()
+    pinecone_db.num_rate_limited_requests = 1
+    with aioresponses() as m:
+        m.post(UPSERT_URL, status=200, payload={"upsertedCount": 1})
+        await pinecone_db.add_texts(["text"])
+        assert pinecone_db.embedding_requests == [["text"], ["text"]]
+        assert len(get_upserts(m)) == 1
+    await pinecone_db.tear_down()
+
+
+@pytest.mark.asyncio
+async def test_persisted_embedding_cache_is_shared(tmp_path):
+    embedding_cache_path = os.path.join(tmp_path, "embeddings")
+    first = FakeEmbeddingsPineconeDB(embedding_cache_path=embedding_cache_path)
+    second = FakeEmbeddingsPineconeDB(embedding_cache_path=embedding_cache_path)
+    # one handle per file, since the shelf doesn't support concurrent writers
+    assert first.embedding_cache is second.embedding_cache
+    with aioresponses() as m:
+        m.post(UPSERT_URL, status=200, payload={"upsertedCount": 1}, repeat=True)
+        await first.add_texts(["text"])
+        await first.tear_down()
+        await second.add_texts(["text"])
+    assert second.embedding_requests == []
+    await second.tear_down()
@@ -0,0 +1,122 @@
+import asyncio
+from typing import List, Optional
+
+import numpy as np
+import pytest
+from langchain.docstore.document import Document
+
+from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+from vocode.streaming.models.actions import ActionOutput
+from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.events import Sender
+from vocode.streaming.models.transcript import ActionFinish, Message, Transcript
+from vocode.streaming.models.vector_db import VectorDBConfig
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.retrieval_pipeline import RetrievalPipeline
+
+EMBEDDINGS = {
+    "what is the refund policy": [1.0, 0.0, 0.0],
+    "whats the refund policy": [0.99, 0.1, 0.0],
+    "where are you located": [0.0, 1.0, 0.0],
+    "how late are you open": [0.0, 0.0, 1.0],
+}
+
+
+class FakeVectorDB(VectorDB):
+    def __init__(self, search_delay_seconds: float = 0.0):
+        self.search_delay_seconds = search_delay_seconds
+        self.num_embeddings = 0
+        self.num_searches = 0
+
+    async def create_openai_embedding(self, text, model=None) -> List[float]:
+        self.num_embeddings += 1
+        return EMBEDDINGS[text.lower().strip("?")]
+
+    async def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ):
+        self.num_searches += 1
+        await asyncio.sleep(self.search_delay_seconds)
+        return [(Document(page_content=str(embedding)), 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_and_cache():
+    vector_db = FakeVectorDB()
+    pipeline = RetrievalPipeline(vector_db, VectorDBConfig())
+    pipeline.prefetch("What is the refund policy")
+    docs = await pipeline.retrieve("what is the refund policy?")
+    assert docs is not None
+    assert vector_db.num_embeddings == 1 and vector_db.num_searches == 1
+
+    # a near-duplicate query reuses the cached results
+    assert await pipeline.retrieve("whats the refund policy") == docs
+    assert vector_db.num_embeddings == 2 and vector_db.num_searches == 1
+
+
+@pytest.mark.asyncio
+async def test_late_results_are_used_on_next_turn():
+    vector_db = FakeVectorDB(search_delay_seconds=0.2)
+    pipeline = RetrievalPipeline(
+        vector_db, VectorDBConfig(retrieval_latency_budget_seconds=0.05)
+    )
+    assert await pipeline.retrieve("what is the refund policy") is None
+    await asyncio.sleep(0.3)
+
+    vector_db.search_delay_seconds = 1
+    docs = await pipeline.retrieve("where are you located")
+    assert docs is not None
+    assert docs[0][0].page_content == str([1.0, 0.0, 0.0])
+    pipeline.cancel()
+
+
+@pytest.mark.asyncio
+async def test_late_results_survive_cache_hits_and_cancellation():
+    vector_db = FakeVectorDB(search_delay_seconds=0.2)
+    pipeline = RetrievalPipeline(
+        vector_db, VectorDBConfig(retrieval_latency_budget_seconds=0.05)
+    )
+    pipeline.results["where are you located"] = (
+        np.asarray(EMBEDDINGS["where are you located"]),
+        [(Document(page_content="cached"), 1.0)],
+    )
+    assert await pipeline.retrieve("what is the refund policy") is None
+    await asyncio.sleep(0.3)
+    late_results = pipeline.late_results
+    assert late_results is not None
+
+    # a cached answer doesn't use up the late results
+    docs = await pipeline.retrieve("where are you located")
+    assert docs[0][0].page_content == "cached"
+    assert pipeline.late_results == late_results
+
+    # neither does a retrieval that's cancelled, like when the agent terminates
+    vector_db.search_delay_seconds = 1
+    pipeline.latency_budget_seconds = 1
+    retrieval = asyncio.create_task(pipeline.retrieve("how late are you open"))
+    await asyncio.sleep(0.05)
+    pipeline.cancel()
+    assert await retrieval == late_results
+    assert pipeline.late_results is None
+
+
+def test_action_result_turns_retrieve_for_the_last_user_message():
+    agent = ChatGPTAgent(
+        ChatGPTAgentConfig(prompt_preamble="You are a helpful assistant"),
+        openai_api_key="test",
+    )
+    agent.attach_transcript(
+        Transcript(
+            event_logs=[
+                Message(sender=Sender.HUMAN, text="What is the refund policy?"),
+                ActionFinish(
+                    action_type="lookup",
+                    action_output=ActionOutput(action_type="lookup", response={}),
+                ),
+            ]
+        )
+    )
+    assert agent.get_retrieval_query('{"response": {}}') == "What is the refund policy?"
@@ -0,0 +1,231 @@
+import asyncio
+import ctypes
+import threading
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import AzureSynthesizerConfig
+from vocode.streaming.synthesizer.azure_synthesizer import (
+    AzureSpeechSynthesizerClient,
+    AzureSynthesizer,
+    WordBoundaryEventPool,
+    read_chunk,
+)
+from vocode.streaming.utils.client_pool import ClientPool
+
+
+class FakeAudioDataStream:
+    def __init__(self, reads: List[bytes], gate: Optional[threading.Event] = None):
+        self.reads = reads
+        self.gate = gate
+
+    def read_data(self, audio_buffer: bytes) -> int:
+        if self.gate is not None:
+            self.gate.wait()
+        if not self.reads:
+            return 0
+        data = self.reads.pop(0)
+        assert len(data) <= len(audio_buffer)
+        ctypes.memmove(audio_buffer, data, len(data))
+        return len(data)
+
+
+class FakeSignal:
+    def __init__(self):
+        self.callbacks: List[Callable] = []
+
+    def connect(self, callback: Callable):
+        self.callbacks.append(callback)
+
+    def disconnect_all(self):
+        self.callbacks = []
+
+    def signal(self, event):
+        for callback in self.callbacks:
+            callback(event)
+
+
+class FakeStopFuture:
+    def __init__(self, synthesizer: "FakeSpeechSynthesizer"):
+        self.synthesizer = synthesizer
+
+    def get(self):
+        self.synthesizer.num_stops_waited_for += 1
+
+
+class FakeSpeechSynthesizer:
+    def __init__(self):
+        self.synthesis_word_boundary = FakeSignal()
+        self.num_stops = 0
+        self.num_stops_waited_for = 0
+        # set to unblock the stream being read when the synthesizer is stopped
+        self.on_stop: Optional[threading.Event] = None
+
+    def stop_speaking_async(self) -> FakeStopFuture:
+        self.num_stops += 1
+        if self.on_stop is not None:
+            self.on_stop.set()
+        return FakeStopFuture(self)
+
+
+class FakeWordBoundaryEvent:
+    def __init__(self, text_offset: int, audio_offset: int):
+        self.text_offset = text_offset
+        # in ticks of 100ns
+        self.audio_offset = audio_offset
+
+
+class FakeClient(AzureSpeechSynthesizerClient):
+    def __init__(self):
+        self.synthesizer = FakeSpeechSynthesizer()
+        self.is_disconnected = False
+
+
+class FakeAzureSynthesizer(AzureSynthesizer):
+    def __init__(self, streams: Dict[str, FakeAudioDataStream], **kwargs):
+        super().__init__(**kwargs)
+        self.streams = streams
+
+    def create_ssml(self, message: str, bot_sentiment=None) -> str:
+        return message
+
+    def synthesize_ssml(self, ssml: str, synthesizer=None) -> FakeAudioDataStream:
+        # "<speak>Hello there</speak>": "Hello" at 0.1s, "there" at 0.5s
+        for text_offset, audio_offset in [(7, 0.1), (13, 0.5)]:
+            synthesizer.synthesis_word_boundary.signal(
+                FakeWordBoundaryEvent(text_offset, int(audio_offset * 10**7))
+            )
+        return self.streams[ssml]
+
+
+def create_synthesizer(streams: Dict[str, FakeAudioDataStream]):
+    synthesizer_config = AzureSynthesizerConfig(
+        sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16
+    )
+    client_pool = ClientPool()
+    client_key = (
+        "azure_speech_synthesizer",
+        "key",
+        "region",
+        synthesizer_config.audio_encoding,
+        synthesizer_config.sampling_rate,
+    )
+    for _ in range(2):
+        client_pool.checkin(client_key, FakeClient())
+    return FakeAzureSynthesizer(
+        streams,
+        synthesizer_config=synthesizer_config,
+        azure_speech_key="key",
+        azure_speech_region="region",
+        client_pool=client_pool,
+    )
+
+
+def test_read_chunk_waits_for_a_full_chunk():
+    stream = FakeAudioDataStream([b"ab", b"cd", b"ef", b"g"])
+    assert read_chunk(stream, 4) == b"abcd"
+    assert read_chunk(stream, 4) == b"efg"
+    assert read_chunk(stream, 4) == b""
+
+
+@pytest.mark.asyncio
+async def test_utterances_synthesize_concurrently():
+    gate = threading.Event()
+    synthesizer = create_synthesizer(
+        {
+            "first": FakeAudioDataStream([b"aaaa", b"aa"], gate=gate),
+            "second": FakeAudioDataStream([b"bbbb", b"bbbb"]),
+        }
+    )
+
+    first = await synthesizer.create_speech(BaseMessage(text="first"), 4)
+    second = await synthesizer.create_speech(BaseMessage(text="second"), 4)
+
+    # the second utterance doesn't wait behind the first one's blocked stream
+    try:
+        second_chunks = [
+            await asyncio.wait_for(second.chunk_generator.__anext__(), timeout=1)
+            for _ in range(3)
+        ]
+    finally:
+        gate.set()
+    assert [(c.chunk, c.is_last_chunk) for c in second_chunks] == [
+        (b"bbbb", False),
+        (b"bbbb", False),
+        (b"", True),
+    ]
+
+    first_chunks = [chunk_result async for chunk_result in first.chunk_generator]
+    assert [(c.chunk, c.is_last_chunk) for c in first_chunks] == [
+        (b"aaaa", False),
+        (b"aa", True),
+    ]
+    await asyncio.sleep(0.01)
+    assert len(synthesizer.clients) == 2
+    assert len(synthesizer.idle_clients) == 2
+    await synthesizer.tear_down()
+
+
+def test_word_boundaries_are_looked_up_in_audio_order():
+    pool = WordBoundaryEventPool()
+    for text_offset, audio_offset in [(0, 0.0), (10, 1.0), (5, 0.5), (15, 1.5)]:
+        pool.add(FakeWordBoundaryEvent(text_offset, int(audio_offset * 10**7)))
+    assert pool.get_text_offset_after(0.2) == 5
+    assert pool.get_text_offset_after(1.2) == 15
+    assert pool.get_text_offset_after(2.0) is None
+
+
+@pytest.mark.asyncio
+async def test_word_boundary_handlers_are_disconnected_after_the_utterance():
+    ssml = "<speak>Hello there</speak>"
+    synthesizer = create_synthesizer({ssml: FakeAudioDataStream([b"aa"])})
+    synthesizer.create_ssml = lambda message, bot_sentiment=None: ssml
+
+    synthesis_result = await synthesizer.create_speech(
+        BaseMessage(text="Hello there"), 4
+    )
+    async for _ in synthesis_result.chunk_generator:
+        pass
+    assert synthesis_result.get_message_up_to(0.3) == "Hello "
+    assert synthesis_result.get_message_up_to(1) == "Hello there"
+
+    # the client is released once its reader thread is done with the utterance
+    async def wait_for_release():
+        while not synthesizer.idle_clients:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(wait_for_release(), timeout=1)
+    assert synthesizer.client.synthesizer.synthesis_word_boundary.callbacks == []
+
+
+@pytest.mark.asyncio
+async def test_tear_down_waits_for_in_flight_utterances():
+    gate = threading.Event()
+    synthesizer = create_synthesizer(
+        {"first": FakeAudioDataStream([b"aaaa", b"aaaa", b"aa"], gate=gate)}
+    )
+    client = synthesizer.client
+    client.synthesizer.on_stop = gate
+    idle_clients = synthesizer.client_pool.idle_clients[synthesizer.client_key]
+
+    synthesis_result = await synthesizer.create_speech(BaseMessage(text="first"), 4)
+    await synthesizer.tear_down()
+    # the streaming client isn't handed to the next conversation while it's in use
+    assert client not in idle_clients
+    assert client.synthesizer.num_stops == 1
+
+    # tearing down stopped the stream, so the reader thread exits
+    for _ in range(100):
+        if client in idle_clients:
+            break
+        await asyncio.sleep(0.01)
+    assert client in idle_clients
+    # the stop that unblocked the reader isn't waited for, so the client waits for
+    # one more before and during its reset; nothing can land on the next conversation
+    assert client.synthesizer.num_stops == 3
+    assert client.synthesizer.num_stops_waited_for == 2
+    assert client.synthesizer.synthesis_word_boundary.callbacks == []
+    await synthesis_result.chunk_generator.aclose()
@@ -0,0 +1,92 @@
+import io
+import wave
+
+import pytest
+
+from tests.streaming.fixtures.synthesizer import TestSynthesizer
+from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.synthesizer.base_synthesizer import (
+    FillerAudio,
+    encode_as_wav,
+    get_wav_data,
+    split_into_chunks,
+)
+
+SYNTHESIZER_CONFIG = SynthesizerConfig(
+    sampling_rate=16000,
+    audio_encoding=AudioEncoding.LINEAR16,
+    should_encode_as_wav=True,
+)
+
+
+def encode_with_wave(chunk: bytes) -> bytes:
+    output_bytes_io = io.BytesIO()
+    with wave.open(output_bytes_io, "wb") as in_memory_wav:
+        in_memory_wav.setnchannels(1)
+        in_memory_wav.setsampwidth(2)
+        in_memory_wav.setframerate(SYNTHESIZER_CONFIG.sampling_rate)
+        in_memory_wav.writeframes(chunk)
+    return output_bytes_io.getvalue()
+
+
+@pytest.mark.parametrize("num_bytes", [0, 2, 3200, 32000])
+def test_encode_as_wav_matches_wave(num_bytes):
+    chunk = bytes(range(256)) * (num_bytes // 256) + bytes(num_bytes % 256)
+    assert encode_as_wav(memoryview(chunk), SYNTHESIZER_CONFIG) == encode_with_wave(
+        chunk
+    )
+
+
+def test_get_wav_data_skips_the_header():
+    samples = bytes(range(256)) * 4
+    wav = encode_with_wave(samples)
+    assert get_wav_data(wav) == samples
+    assert get_wav_data(wav).obj is wav
+
+    # chunks before the samples, like the LIST metadata some services add
+    list_chunk = b"LIST" + (3).to_bytes(4, "little") + b"abc\x00"
+    assert get_wav_data(wav[:36] + list_chunk + wav[36:]) == samples
+    assert get_wav_data(samples) == samples
+
+
+def test_split_into_chunks_does_not_copy():
+    audio_data = bytes(range(100))
+    chunks = list(split_into_chunks(audio_data, 30))
+    assert [is_last_chunk for _, is_last_chunk in chunks] == [False] * 3 + [True]
+    assert b"".join(chunk for chunk, _ in chunks) == audio_data
+    assert all(chunk.obj is audio_data for chunk, _ in chunks)
+
+    # the last chunk is flagged even when it's full
+    chunks = list(split_into_chunks(audio_data, 50))
+    assert [is_last_chunk for _, is_last_chunk in chunks] == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_filler_audio_chunks_are_wav_encoded():
+    audio_data = bytes(2 * SYNTHESIZER_CONFIG.sampling_rate * 3 // 2)
+    filler_audio = FillerAudio(
+        BaseMessage(text="Um..."), audio_data, SYNTHESIZER_CONFIG
+    )
+    chunks = [
+        chunk_result.chunk
+        async for chunk_result in filler_audio.create_synthesis_result().chunk_generator
+    ]
+    assert chunks == [
+        encode_with_wave(audio_data[: 2 * SYNTHESIZER_CONFIG.sampling_rate]),
+        encode_with_wave(audio_data[2 * SYNTHESIZER_CONFIG.sampling_rate :]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_message_cutoff_from_voice_speed():
+    synthesizer = TestSynthesizer(SYNTHESIZER_CONFIG)
+    get_message_cutoff = synthesizer.create_message_cutoff_from_voice_speed(
+        BaseMessage(text="Hi there,  how are you?"), words_per_minute=120
+    )
+    assert get_message_cutoff(0) == ""
+    assert get_message_cutoff(1.2) == "Hi there,"
+    assert get_message_cutoff(1.5) == "Hi there,  how"
+    assert get_message_cutoff(10) == "Hi there,  how are you?"
+    await synthesizer.tear_down()
@@ -18,6 +18,9 @@ ActionConfigType = TypeVar("ActionConfigType", bound=ActionConfig)
 
 class BaseAction(Generic[ActionConfigType, ParametersType, ResponseType]):
     description: str = ""
+    # stateless actions keep no per-conversation state and are shared across
+    # conversations, so the conversation state manager is never attached to them
+    is_stateless: bool = False
 
     def __init__(
         self,
@@ -32,6 +32,7 @@ class NylasSendEmail(
     description: str = "Sends an email using Nylas API."
     parameters_type: Type[NylasSendEmailParameters] = NylasSendEmailParameters
     response_type: Type[NylasSendEmailResponse] = NylasSendEmailResponse
+    is_stateless: bool = True
 
     async def run(
         self, action_input: ActionInput[NylasSendEmailParameters]
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Any, Dict, Tuple, Type
+
+from vocode.streaming.action.base_action import BaseAction
+from vocode.streaming.action.factory import ActionFactory
+from vocode.streaming.models.actions import ActionConfig
+
+ActionKey = Tuple[Type[ActionFactory], str]
+
+
+class ActionRegistry:
+    """Caches OpenAI function schemas and stateless action instances for the process.
+
+    Entries are keyed by the factory class and a hash of the action config, so
+    agents sharing a config share the schema computed by the first of them.
+    """
+
+    def __init__(self):
+        self.functions: Dict[ActionKey, Dict[str, Any]] = {}
+        self.stateless_actions: Dict[ActionKey, BaseAction] = {}
+
+    @staticmethod
+    def get_key(
+        action_factory: ActionFactory, action_config: ActionConfig
+    ) -> ActionKey:
+        config_hash = hashlib.sha256(
+            action_config.json(sort_keys=True).encode()
+        ).hexdigest()
+        return type(action_factory), config_hash
+
+    def get_action(
+        self, action_factory: ActionFactory, action_config: ActionConfig
+    ) -> BaseAction:
+        key = self.get_key(action_factory, action_config)
+        action = self.stateless_actions.get(key)
+        if action is None:
+            action = action_factory.create_action(action_config)
+            if action.is_stateless:
+                self.stateless_actions[key] = action
+        return action
+
+    def get_openai_function(
+        self, action_factory: ActionFactory, action_config: ActionConfig
+    ) -> Dict[str, Any]:
+        key = self.get_key(action_factory, action_config)
+        function = self.functions.get(key)
+        if function is None:
+            function = self.get_action(
+                action_factory, action_config
+            ).get_openai_function()
+            self.functions[key] = function
+        return function
+
+    def clear(self):
+        self.functions.clear()
+        self.stateless_actions.clear()
+
+
+_action_registry = ActionRegistry()
+
+
+def get_action_registry() -> ActionRegistry:
+    return _action_registry
@@ -34,6 +34,7 @@ class TransferCall(
     description: str = "transfers the call. use when you need to connect the active call to another phone line."
     parameters_type: Type[TransferCallParameters] = TransferCallParameters
     response_type: Type[TransferCallResponse] = TransferCallResponse
+    is_stateless: bool = True
 
     async def transfer_call(self, twilio_call_sid, to_phone):
         twilio_account_sid = os.environ["TWILIO_ACCOUNT_SID"]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Optional
 from vocode.streaming.action.factory import ActionFactory
+from vocode.streaming.action.registry import ActionRegistry, get_action_registry
 from vocode.streaming.agent.base_agent import ActionResultAgentInput, AgentInput
 from vocode.streaming.models.actions import (
     ActionInput,
@@ -23,6 +25,7 @@ class ActionsWorker(InterruptibleWorker):
         output_queue: asyncio.Queue[InterruptibleEvent[AgentInput]],
         interruptible_event_factory: InterruptibleEventFactory = InterruptibleEventFactory(),
         action_factory: ActionFactory = ActionFactory(),
+        action_registry: Optional[ActionRegistry] = None,
     ):
         super().__init__(
             input_queue=input_queue,
@@ -30,6 +33,7 @@ class ActionsWorker(InterruptibleWorker):
             interruptible_event_factory=interruptible_event_factory,
         )
         self.action_factory = action_factory
+        self.action_registry = action_registry or get_action_registry()
 
     def attach_conversation_state_manager(
         self, conversation_state_manager: ConversationStateManager
@@ -38,8 +42,11 @@ class ActionsWorker(InterruptibleWorker):
 
     async def process(self, item: InterruptibleEvent[ActionInput]):
         action_input = item.payload
-        action = self.action_factory.create_action(action_input.action_config)
-        action.attach_conversation_state_manager(self.conversation_state_manager)
+        action = self.action_registry.get_action(
+            self.action_factory, action_input.action_config
+        )
+        if not action.is_stateless:
+            action.attach_conversation_state_manager(self.conversation_state_manager)
         action_output = await action.run(action_input)
         self.produce_interruptible_event_nonblocking(
             ActionResultAgentInput(
@@ -5,10 +5,10 @@ import logging
 from typing import Optional, Tuple
 from vocode.streaming.agent.base_agent import RespondAgent
 
-from vocode.streaming.agent.utils import get_sentence_from_buffer
+from vocode.streaming.agent.utils import anthropic_get_tokens, collate_response_async
 
 from langchain import ConversationChain
-from langchain.schema import ChatMessage, AIMessage, HumanMessage
+from langchain.schema import BaseMessage, ChatMessage, AIMessage, HumanMessage
 from langchain.chat_models import ChatAnthropic
 import logging
 from vocode import getenv
@@ -75,6 +75,28 @@ class ChatAnthropicAgent(RespondAgent[ChatAnthropicAgentConfig]):
         self.conversation = ConversationChain(
             memory=self.memory, prompt=self.prompt, llm=self.llm
         )
+        self.human_prompt = anthropic.HUMAN_PROMPT
+        self.ai_prompt = anthropic.AI_PROMPT
+        # the prompt rendered from memory so far, extended with new messages each turn
+        self.rendered_prompt = ""
+        self.num_rendered_messages = 0
+
+    def render_message(self, message: BaseMessage) -> str:
+        if isinstance(message, HumanMessage):
+            return f"{self.human_prompt} {message.content}"
+        if isinstance(message, AIMessage):
+            return f"{self.ai_prompt} {message.content}"
+        if isinstance(message, ChatMessage):
+            return f"\n\n{message.role.capitalize()}: {message.content}"
+        raise ValueError(f"Got unknown message type {message}")
+
+    def get_prompt(self) -> str:
+        messages = self.memory.chat_memory.messages
+        # the last message is the response being generated, it's rendered next turn once complete
+        for message in messages[self.num_rendered_messages : -1]:
+            self.rendered_prompt += self.render_message(message)
+        self.num_rendered_messages = len(messages) - 1
+        return (self.rendered_prompt + self.render_message(messages[-1])).rstrip()
 
     async def respond(
         self,
@@ -96,7 +118,7 @@ class ChatAnthropicAgent(RespondAgent[ChatAnthropicAgentConfig]):
 
         bot_memory_message = AIMessage(content="")
         self.memory.chat_memory.messages.append(bot_memory_message)
-        prompt = self.llm._convert_messages_to_prompt(self.memory.chat_memory.messages)
+        prompt = self.get_prompt()
 
         streamed_response = await self.anthropic_client.acompletion_stream(
             prompt=prompt,
@@ -104,19 +126,15 @@ class ChatAnthropicAgent(RespondAgent[ChatAnthropicAgentConfig]):
             model=self.agent_config.model_name,
         )
 
-        buffer = ""
-        async for message in streamed_response:
-            completion = message["completion"]
-            delta = completion[len(bot_memory_message.content + buffer) :]
-            buffer += delta
-
-            sentence, remainder = get_sentence_from_buffer(buffer)
-
-            if sentence:
-                bot_memory_message.content = bot_memory_message.content + sentence
-                buffer = remainder
-                yield sentence
-            continue
+        async for sentence in collate_response_async(
+            anthropic_get_tokens(streamed_response)
+        ):
+            # only collated text comes back without get_functions
+            assert isinstance(sentence, str)
+            bot_memory_message.content = (
+                f"{bot_memory_message.content} {sentence}".lstrip()
+            )
+            yield sentence
 
     def update_last_bot_message_on_cut_off(self, message: str):
         for memory_message in self.memory.chat_memory.messages[::-1]:
@@ -125,4 +143,7 @@ class ChatAnthropicAgent(RespondAgent[ChatAnthropicAgentConfig]):
                 and memory_message.role == "assistant"
             ) or isinstance(memory_message, AIMessage):
                 memory_message.content = message
+                # the edited message may already be part of the rendered prompt
+                self.rendered_prompt = ""
+                self.num_rendered_messages = 0
                 return
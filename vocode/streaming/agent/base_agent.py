@@ -5,6 +5,7 @@ from enum import Enum
 import json
 import logging
 import random
+import time
 from typing import (
     AsyncGenerator,
     Generator,
@@ -19,6 +20,7 @@ import typing
 from opentelemetry import trace
 from opentelemetry.trace import Span
 from vocode.streaming.action.factory import ActionFactory
+from vocode.streaming.action.registry import get_action_registry
 from vocode.streaming.action.phone_call_action import (
     TwilioPhoneCallAction,
     VonagePhoneCallAction,
@@ -34,13 +36,15 @@ from vocode.streaming.models.actions import (
 from vocode.streaming.models.agent import (
     AgentConfig,
     ChatGPTAgentConfig,
+    FillerAudioConfig,
     LLMAgentConfig,
 )
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.model import BaseModel, TypedModel
 from vocode.streaming.transcriber.base_transcriber import Transcription
 from vocode.streaming.utils import remove_non_letters_digits
-from vocode.streaming.utils.goodbye_model import GoodbyeModel
+from vocode.streaming.utils.latency_estimator import LatencyEstimator
+from vocode.streaming.utils.goodbye_model import create_goodbye_model
 from vocode.streaming.models.transcript import Transcript
 from vocode.streaming.utils.worker import (
     InterruptibleAgentResponseEvent,
@@ -101,7 +105,8 @@ class AgentResponseStop(AgentResponse, type=AgentResponseType.STOP.value):
 class AgentResponseFillerAudio(
     AgentResponse, type=AgentResponseType.FILLER_AUDIO.value
 ):
-    pass
+    # how long the agent expects to take to its first sentence, None until it has answered a turn
+    expected_wait_seconds: Optional[float] = None
 
 
 AgentConfigType = TypeVar("AgentConfigType", bound=AgentConfig)
@@ -150,17 +155,26 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
             interruptible_event_factory=interruptible_event_factory,
         )
         self.action_factory = action_factory
+        self.action_registry = get_action_registry()
         self.actions_queue: asyncio.Queue[
             InterruptibleEvent[ActionInput]
         ] = asyncio.Queue()
         self.logger = logger or logging.getLogger(__name__)
         self.goodbye_model = None
         if self.agent_config.end_conversation_on_goodbye:
-            self.goodbye_model = GoodbyeModel()
+            self.goodbye_model = create_goodbye_model(
+                self.agent_config.goodbye_model_type
+            )
             self.goodbye_model_initialize_task = asyncio.create_task(
                 self.goodbye_model.initialize_embeddings()
             )
         self.transcript: Optional[Transcript] = None
+        self.time_to_first_sentence: Optional[LatencyEstimator] = None
+        self.turn_started_at: Optional[float] = None
+        if self.agent_config.send_filler_audio:
+            self.time_to_first_sentence = LatencyEstimator(
+                self.get_filler_audio_config().latency_window_size
+            )
 
         self.functions = self.get_functions() if self.agent_config.actions else None
         self.is_muted = False
@@ -168,6 +182,32 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
     def get_functions(self):
         raise NotImplementedError
 
+    def get_filler_audio_config(self) -> FillerAudioConfig:
+        if isinstance(self.agent_config.send_filler_audio, FillerAudioConfig):
+            return self.agent_config.send_filler_audio
+        return FillerAudioConfig()
+
+    def get_expected_wait_seconds(self) -> Optional[float]:
+        if self.time_to_first_sentence is None:
+            return None
+        return self.time_to_first_sentence.get_estimate()
+
+    def should_send_filler_audio(self, expected_wait_seconds: Optional[float]) -> bool:
+        if expected_wait_seconds is None:
+            return True
+        filler_audio_config = self.get_filler_audio_config()
+        return (
+            expected_wait_seconds
+            > filler_audio_config.silence_threshold_seconds
+            + filler_audio_config.min_expected_gap_seconds
+        )
+
+    def record_first_sentence(self):
+        if self.turn_started_at is None or self.time_to_first_sentence is None:
+            return
+        self.time_to_first_sentence.record(time.monotonic() - self.turn_started_at)
+        self.turn_started_at = None
+
     def attach_transcript(self, transcript: Transcript):
         self.transcript = transcript
 
@@ -193,6 +233,11 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
         assert self.goodbye_model is not None
         return asyncio.create_task(self.goodbye_model.is_goodbye(message))
 
+    def prefetch(self, transcription: Transcription):
+        """Called with interim transcriptions so that agents can start work, e.g.
+        retrieval, before the human has finished speaking"""
+        pass
+
 
 class RespondAgent(BaseAgent[AgentConfigType]):
     async def handle_generate_response(
@@ -212,22 +257,23 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             conversation_id=conversation_id,
         )
         is_first_response = True
-        function_call = None
         async for response in responses:
             if isinstance(response, FunctionCall):
-                function_call = response
+                # dispatched as soon as its arguments are complete, any user_message
+                # is synthesized while the action runs
+                if self.agent_config.actions is not None:
+                    await self.call_function(response, agent_input)
                 continue
             if is_first_response:
                 agent_span_first.end()
                 is_first_response = False
+                self.record_first_sentence()
             self.produce_interruptible_agent_response_event_nonblocking(
                 AgentResponseMessage(message=BaseMessage(text=response)),
                 is_interruptible=self.agent_config.allow_agent_to_be_cut_off,
             )
         # TODO: implement should_stop for generate_responses
         agent_span.end()
-        if function_call and self.agent_config.actions is not None:
-            await self.call_function(function_call, agent_input)
         return False
 
     async def handle_respond(
@@ -246,6 +292,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
             response = None
             return True
         if response:
+            self.record_first_sentence()
             self.produce_interruptible_agent_response_event_nonblocking(
                 AgentResponseMessage(message=BaseMessage(text=response)),
                 is_interruptible=self.agent_config.allow_agent_to_be_cut_off,
@@ -294,9 +341,18 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                     transcription.message
                 )
             if self.agent_config.send_filler_audio:
-                self.produce_interruptible_agent_response_event_nonblocking(
-                    AgentResponseFillerAudio()
-                )
+                self.turn_started_at = time.monotonic()
+                expected_wait_seconds = self.get_expected_wait_seconds()
+                if self.should_send_filler_audio(expected_wait_seconds):
+                    self.produce_interruptible_agent_response_event_nonblocking(
+                        AgentResponseFillerAudio(
+                            expected_wait_seconds=expected_wait_seconds
+                        )
+                    )
+                else:
+                    self.logger.debug(
+                        f"Skipping filler audio, response expected in {expected_wait_seconds:.2f}s"
+                    )
             self.logger.debug("Responding to transcription")
             should_stop = False
             if self.agent_config.generate_responses:
@@ -315,21 +371,25 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                 )
                 return
             if goodbye_detected_task:
-                try:
-                    goodbye_detected = await asyncio.wait_for(
-                        goodbye_detected_task, 0.1
-                    )
-                    if goodbye_detected:
-                        self.logger.debug("Goodbye detected, ending conversation")
-                        self.produce_interruptible_agent_response_event_nonblocking(
-                            AgentResponseStop()
-                        )
-                        return
-                except asyncio.TimeoutError:
-                    self.logger.debug("Goodbye detection timed out")
+                # the response has been produced, so stop whenever detection finishes
+                goodbye_detected_task.add_done_callback(self.on_goodbye_detected)
         except asyncio.CancelledError:
             pass
 
+    def on_goodbye_detected(self, goodbye_detected_task: asyncio.Task):
+        if goodbye_detected_task.cancelled():
+            return
+        if goodbye_detected_task.exception() is not None:
+            self.logger.error(
+                f"Goodbye detection failed: {goodbye_detected_task.exception()}"
+            )
+            return
+        if goodbye_detected_task.result():
+            self.logger.debug("Goodbye detected, ending conversation")
+            self.produce_interruptible_agent_response_event_nonblocking(
+                AgentResponseStop()
+            )
+
     def _get_action_config(self, function_name: str) -> Optional[ActionConfig]:
         if self.agent_config.actions is None:
             return None
@@ -345,7 +405,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
                 f"Function {function_call.name} not found in agent config, skipping"
             )
             return
-        action = self.action_factory.create_action(action_config)
+        action = self.action_registry.get_action(self.action_factory, action_config)
         params = json.loads(function_call.arguments)
         user_message_tracker = None
         if "user_message" in params:
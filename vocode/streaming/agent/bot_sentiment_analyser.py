@@ -4,6 +4,11 @@ from langchain.prompts import PromptTemplate
 from pydantic import BaseModel
 
 from vocode import getenv
+from vocode.streaming.utils.rate_limiter import (
+    RequestPriority,
+    acquire_llm_capacity,
+    estimate_tokens,
+)
 
 TEMPLATE = """
 Read the following conversation classify the final emotion of the Bot as one of [{emotions}].
@@ -43,6 +48,11 @@ class BotSentimentAnalyser:
 
     async def analyse(self, transcript: str) -> BotSentiment:
         prompt = self.prompt.format(transcript=transcript)
+        # sentiment can lag behind the conversation, so it waits behind live turns
+        await acquire_llm_capacity(
+            estimate_tokens(prompt=prompt, max_tokens=self.llm.max_tokens),
+            priority=RequestPriority.BACKGROUND,
+        )
         response = (await self.llm.agenerate([prompt])).generations[0][0].text.strip()
         tokens = response.split(",")
         if len(tokens) != 2:
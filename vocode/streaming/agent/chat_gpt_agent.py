@@ -1,4 +1,6 @@
 import logging
+import random
+import time
 
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -11,8 +13,10 @@ from pydantic import BaseModel
 from vocode import getenv
 from vocode.streaming.action.factory import ActionFactory
 from vocode.streaming.agent.base_agent import RespondAgent
+from vocode.streaming.agent.llm_router import LLMRouter
+from vocode.streaming.agent.model_cascade import ModelCascade, ModelRoute
 from vocode.streaming.models.actions import FunctionCall, FunctionFragment
-from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.agent import ChatGPTAgentConfig, CutOffResponse
 from vocode.streaming.agent.utils import (
     format_openai_chat_messages_from_transcript,
     collate_response_async,
@@ -20,8 +24,19 @@ from vocode.streaming.agent.utils import (
     vector_db_result_to_openai_chat_message,
 )
 from vocode.streaming.models.events import Sender
-from vocode.streaming.models.transcript import Transcript
+from vocode.streaming.models.transcript import Message, Transcript
+from vocode.streaming.transcriber.base_transcriber import Transcription
+from vocode.streaming.utils.rate_limiter import (
+    LLMRateLimitExceeded,
+    RequestPriority,
+    acquire_llm_capacity,
+    estimate_tokens,
+)
 from vocode.streaming.vector_db.factory import VectorDBFactory
+from vocode.streaming.vector_db.retrieval_pipeline import (
+    DocsWithScores,
+    RetrievalPipeline,
+)
 
 
 class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
@@ -36,7 +51,13 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
         super().__init__(
             agent_config=agent_config, action_factory=action_factory, logger=logger
         )
-        if agent_config.azure_params:
+        self.llm_router: Optional[LLMRouter] = None
+        if agent_config.llm_router_config:
+            # each request carries its endpoint's credentials, the global client is left untouched
+            self.llm_router = LLMRouter(
+                agent_config.llm_router_config, logger=self.logger
+            )
+        elif agent_config.azure_params:
             openai.api_type = agent_config.azure_params.api_type
             openai.api_base = getenv("AZURE_OPENAI_API_BASE")
             openai.api_version = agent_config.azure_params.api_version
@@ -46,7 +67,7 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
             openai.api_base = "https://api.openai.com/v1"
             openai.api_version = None
             openai.api_key = openai_api_key or getenv("OPENAI_API_KEY")
-        if not openai.api_key:
+        if not self.llm_router and not openai.api_key:
             raise ValueError("OPENAI_API_KEY must be set in environment or passed in")
         self.first_response = (
             self.create_first_response(agent_config.expected_first_prompt)
@@ -55,21 +76,42 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
         )
         self.is_first_response = True
 
+        self.model_cascade = (
+            ModelCascade(
+                self.agent_config.model_cascade,
+                has_actions=bool(self.agent_config.actions),
+                logger=self.logger,
+            )
+            if self.agent_config.model_cascade
+            else None
+        )
+        if self.model_cascade is not None and not self.has_fast_model():
+            self.logger.warning(
+                "model_cascade has no fast model to use, every turn uses the primary model"
+            )
+
         if self.agent_config.vector_db_config:
             self.vector_db = vector_db_factory.create_vector_db(
                 self.agent_config.vector_db_config
             )
+            self.retrieval_pipeline = RetrievalPipeline(
+                self.vector_db, self.agent_config.vector_db_config, logger=self.logger
+            )
 
     def get_functions(self):
         assert self.agent_config.actions
         if not self.action_factory:
             return None
         return [
-            self.action_factory.create_action(action_config).get_openai_function()
+            self.action_registry.get_openai_function(self.action_factory, action_config)
             for action_config in self.agent_config.actions
         ]
 
-    def get_chat_parameters(self, messages: Optional[List] = None):
+    def get_chat_parameters(
+        self,
+        messages: Optional[List] = None,
+        model_route: ModelRoute = ModelRoute.PRIMARY,
+    ):
         assert self.transcript is not None
         messages = messages or format_openai_chat_messages_from_transcript(
             self.transcript, self.agent_config.prompt_preamble
@@ -81,8 +123,19 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
             "temperature": self.agent_config.temperature,
         }
 
-        if self.agent_config.azure_params is not None:
+        if (
+            self.agent_config.azure_params is not None
+            and self.agent_config.llm_router_config is None
+        ):
             parameters["engine"] = self.agent_config.azure_params.engine
+            if (
+                model_route == ModelRoute.FAST
+                and self.agent_config.model_cascade
+                and self.agent_config.model_cascade.fast_engine
+            ):
+                parameters["engine"] = self.agent_config.model_cascade.fast_engine
+        elif model_route == ModelRoute.FAST and self.agent_config.model_cascade:
+            parameters["model"] = self.agent_config.model_cascade.fast_model_name
         else:
             parameters["model"] = self.agent_config.model_name
 
@@ -91,6 +144,56 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
 
         return parameters
 
+    def has_fast_model(self) -> bool:
+        # router endpoints that pin a deployment or model override the fast model
+        if self.agent_config.llm_router_config is not None:
+            return not any(
+                endpoint.engine or endpoint.model_name
+                for endpoint in self.agent_config.llm_router_config.endpoints
+            )
+        # on Azure the fast model is its own deployment, which may not be configured
+        if self.agent_config.azure_params is not None:
+            return bool(
+                self.agent_config.model_cascade
+                and self.agent_config.model_cascade.fast_engine
+            )
+        return True
+
+    def get_retrieval_query(self, human_input: str) -> str:
+        # on action result turns the input is the action's output, the user's question
+        # is still their last message
+        assert self.transcript is not None
+        for event_log in reversed(self.transcript.event_logs):
+            if isinstance(event_log, Message) and event_log.sender == Sender.HUMAN:
+                return event_log.text
+        return human_input
+
+    def get_model_route(self, human_input: str) -> ModelRoute:
+        # turns are only counted as fast when the fast model actually answers them
+        if self.model_cascade is None or not self.has_fast_model():
+            return ModelRoute.PRIMARY
+        assert self.transcript is not None
+        last_bot_message = None
+        for event_log in reversed(self.transcript.event_logs):
+            if isinstance(event_log, Message) and event_log.sender == Sender.BOT:
+                last_bot_message = event_log.text
+                break
+        return self.model_cascade.route(human_input, last_bot_message)
+
+    async def acquire_rate_limit(self, chat_parameters: Dict[str, Any]):
+        await acquire_llm_capacity(
+            estimate_tokens(
+                messages=chat_parameters["messages"],
+                max_tokens=chat_parameters["max_tokens"],
+            ),
+            priority=RequestPriority.LIVE_TURN,
+        )
+
+    def get_rate_limited_response(self) -> str:
+        # say something short instead of going silent when the LLM queue drops the turn
+        cut_off_response = self.agent_config.cut_off_response or CutOffResponse()
+        return random.choice(cut_off_response.messages).text
+
     def create_first_response(self, first_prompt):
         messages = [
             (
@@ -102,11 +205,33 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
         ]
 
         parameters = self.get_chat_parameters(messages)
+        if self.llm_router:
+            parameters = self.llm_router.get_endpoint_parameters(
+                self.llm_router.rank_endpoints()[0], parameters
+            )
         return openai.ChatCompletion.create(**parameters)
 
     def attach_transcript(self, transcript: Transcript):
         self.transcript = transcript
 
+    def prefetch(self, transcription: Transcription):
+        if self.agent_config.vector_db_config:
+            self.retrieval_pipeline.prefetch(transcription.message)
+
+    def format_vector_db_result(self, docs_with_scores: DocsWithScores) -> str:
+        docs_with_scores_str = "\n\n".join(
+            [
+                "Document: "
+                + doc[0].metadata["source"]
+                + f" (Confidence: {doc[1]})\n"
+                + doc[0].lc_kwargs["page_content"].replace(r"\n", "\n")
+                for doc in docs_with_scores
+            ]
+        )
+        return (
+            f"Found {len(docs_with_scores)} similar documents:\n{docs_with_scores_str}"
+        )
+
     async def respond(
         self,
         human_input,
@@ -123,9 +248,31 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
             self.is_first_response = False
             text = self.first_response
         else:
-            chat_parameters = self.get_chat_parameters()
-            chat_completion = await openai.ChatCompletion.acreate(**chat_parameters)
-            text = chat_completion.choices[0].message.content
+            model_route = self.get_model_route(human_input)
+            chat_parameters = self.get_chat_parameters(model_route=model_route)
+            try:
+                await self.acquire_rate_limit(chat_parameters)
+            except LLMRateLimitExceeded as e:
+                self.logger.warning(f"Falling back to a filler response: {e}")
+                return self.get_rate_limited_response(), False
+            started_at = time.monotonic()
+            if self.llm_router:
+                text = "".join(
+                    [
+                        token
+                        async for token in openai_get_tokens(
+                            self.llm_router.stream_chat_completion(chat_parameters)
+                        )
+                        if isinstance(token, str)
+                    ]
+                )
+            else:
+                chat_completion = await openai.ChatCompletion.acreate(**chat_parameters)
+                text = chat_completion.choices[0].message.content
+            if self.model_cascade:
+                self.model_cascade.record_latency(
+                    model_route, time.monotonic() - started_at
+                )
         self.logger.debug(f"LLM response: {text}")
         return text, False
 
@@ -141,32 +288,49 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfig]):
             return
         assert self.transcript is not None
 
-        if self.agent_config.vector_db_config:
-            docs_with_scores = await self.vector_db.similarity_search_with_score(
-                self.transcript.get_last_user_message()[1]
-            )
-            docs_with_scores_str = "\n\n".join(
-                [
-                    "Document: "
-                    + doc[0].metadata["source"]
-                    + f" (Confidence: {doc[1]})\n"
-                    + doc[0].lc_kwargs["page_content"].replace(r"\n", "\n")
-                    for doc in docs_with_scores
-                ]
+        docs_with_scores = (
+            await self.retrieval_pipeline.retrieve(
+                self.get_retrieval_query(human_input)
             )
-            vector_db_result = f"Found {len(docs_with_scores)} similar documents:\n{docs_with_scores_str}"
+            if self.agent_config.vector_db_config
+            else None
+        )
+        if docs_with_scores is not None:
+            vector_db_result = self.format_vector_db_result(docs_with_scores)
             messages = format_openai_chat_messages_from_transcript(
                 self.transcript, self.agent_config.prompt_preamble
             )
             messages.insert(
                 -1, vector_db_result_to_openai_chat_message(vector_db_result)
             )
-            chat_parameters = self.get_chat_parameters(messages)
         else:
-            chat_parameters = self.get_chat_parameters()
-        chat_parameters["stream"] = True
-        stream = await openai.ChatCompletion.acreate(**chat_parameters)
+            messages = None
+        model_route = self.get_model_route(human_input)
+        chat_parameters = self.get_chat_parameters(messages, model_route)
+        try:
+            await self.acquire_rate_limit(chat_parameters)
+        except LLMRateLimitExceeded as e:
+            self.logger.warning(f"Falling back to a filler response: {e}")
+            yield self.get_rate_limited_response()
+            return
+        started_at = time.monotonic()
+        if self.llm_router:
+            stream = self.llm_router.stream_chat_completion(chat_parameters)
+        else:
+            chat_parameters["stream"] = True
+            stream = await openai.ChatCompletion.acreate(**chat_parameters)
+        is_first_message = True
         async for message in collate_response_async(
             openai_get_tokens(stream), get_functions=True
         ):
+            if is_first_message and self.model_cascade:
+                self.model_cascade.record_latency(
+                    model_route, time.monotonic() - started_at
+                )
+            is_first_message = False
             yield message
+
+    def terminate(self):
+        if self.agent_config.vector_db_config:
+            self.retrieval_pipeline.cancel()
+        return super().terminate()
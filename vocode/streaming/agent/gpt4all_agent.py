@@ -1,19 +1,37 @@
-from typing import Optional, Tuple
-from vocode.streaming.agent.base_agent import BaseAgent, RespondAgent
+import logging
+from typing import AsyncGenerator, Optional, Tuple
+from vocode.streaming.agent.base_agent import RespondAgent
+from vocode.streaming.agent.gpt4all_model_pool import get_gpt4all_model_pool
+from vocode.streaming.agent.utils import collate_response_async
 from vocode.streaming.models.agent import GPT4AllAgentConfig
-from vocode.turn_based.agent.gpt4all_agent import GPT4AllAgent as TurnBasedGPT4AllAgent
+
+DEFAULT_PROMPT_TEMPLATE = "{history}\nHuman: {human_input}\nAI:"
 
 
 class GPT4AllAgent(RespondAgent[GPT4AllAgentConfig]):
-    def __init__(self, agent_config: GPT4AllAgentConfig):
-        super().__init__(agent_config=agent_config)
-        self.turn_based_agent = TurnBasedGPT4AllAgent(
-            model_path=agent_config.model_path,
-            system_prompt=agent_config.prompt_preamble,
-            initial_message=agent_config.initial_message.text
+    def __init__(
+        self,
+        agent_config: GPT4AllAgentConfig,
+        logger: Optional[logging.Logger] = None,
+    ):
+        super().__init__(agent_config=agent_config, logger=logger)
+        self.prompt_template = (
+            f"{agent_config.prompt_preamble}\n\n{DEFAULT_PROMPT_TEMPLATE}"
+        )
+        self.memory = (
+            [f"AI: {agent_config.initial_message.text}"]
             if agent_config.initial_message
-            else None,
+            else []
         )
+        # the model is loaded once per process and shared by every conversation
+        self.model_pool = get_gpt4all_model_pool(agent_config.model_path)
+
+    def create_prompt(self, human_input):
+        history = "\n".join(self.memory[-5:])
+        return self.prompt_template.format(history=history, human_input=human_input)
+
+    def get_memory_entry(self, human_input, response):
+        return f"Human: {human_input}\nAI: {response}"
 
     async def respond(
         self,
@@ -21,4 +39,31 @@ class GPT4AllAgent(RespondAgent[GPT4AllAgentConfig]):
         conversation_id: str,
         is_interrupt: bool = False,
     ) -> Tuple[Optional[str], bool]:
-        return (await self.turn_based_agent.respond_async(human_input)), False
+        prompt = self.create_prompt(human_input)
+        response = "".join(
+            [token async for token in self.model_pool.generate(prompt)]
+        ).strip()
+        self.memory.append(self.get_memory_entry(human_input, response))
+        self.logger.debug(f"LLM response: {response}")
+        return response, False
+
+    async def generate_response(
+        self,
+        human_input,
+        conversation_id: str,
+        is_interrupt: bool = False,
+    ) -> AsyncGenerator[str, None]:
+        prompt = self.create_prompt(human_input)
+        self.memory.append(self.get_memory_entry(human_input, ""))
+        response_buffer = ""
+        async for sentence in collate_response_async(self.model_pool.generate(prompt)):
+            # only collated text comes back without get_functions
+            assert isinstance(sentence, str)
+            response_buffer = f"{response_buffer} {sentence}".lstrip()
+            self.memory[-1] = self.get_memory_entry(human_input, response_buffer)
+            yield sentence
+
+    def update_last_bot_message_on_cut_off(self, message: str):
+        if self.memory:
+            human_entry = self.memory[-1].split("\nAI: ")[0]
+            self.memory[-1] = f"{human_entry}\nAI: {message}"
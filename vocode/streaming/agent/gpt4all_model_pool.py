@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import queue
+import threading
+from typing import Any, AsyncGenerator, Dict, Optional
+
+DEFAULT_STOP_SEQUENCE = "Human:"
+
+
+class StopGeneration(Exception):
+    pass
+
+
+class GenerationRequest:
+    def __init__(
+        self,
+        prompt: str,
+        stop_sequence: str,
+        loop: asyncio.AbstractEventLoop,
+        output_queue: "asyncio.Queue[Optional[Any]]",
+    ):
+        self.prompt = prompt
+        self.stop_sequence = stop_sequence
+        self.loop = loop
+        self.output_queue = output_queue
+        # set from the event loop, checked by the generation thread before every token
+        self.cancelled = threading.Event()
+
+    def put(self, item: Optional[Any]):
+        self.loop.call_soon_threadsafe(self.output_queue.put_nowait, item)
+
+
+class GPT4AllModelPool:
+    """Shares one loaded GPT4All model across conversations.
+
+    The model generates for a single prompt at a time, so requests are queued and
+    served in order by a scheduler thread that streams tokens back to each caller's loop.
+    """
+
+    def __init__(self, model_path: str, logger: Optional[logging.Logger] = None):
+        self.model_path = model_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.requests: "queue.Queue[GenerationRequest]" = queue.Queue()
+        self.model: Any = None
+        self.scheduler_thread = threading.Thread(
+            target=self.schedule, name="gpt4all-scheduler", daemon=True
+        )
+        self.scheduler_thread.start()
+
+    def load_model(self):
+        from pygpt4all.models.gpt4all_j import GPT4All_J
+
+        return GPT4All_J(self.model_path)
+
+    def schedule(self):
+        while True:
+            request = self.requests.get()
+            if request.cancelled.is_set():
+                request.put(None)
+                continue
+            try:
+                if self.model is None:
+                    self.model = self.load_model()
+                self.run(request)
+            except StopGeneration:
+                pass
+            except Exception as e:
+                self.logger.error(f"GPT4All generation failed: {e}")
+                request.put(e)
+                continue
+            request.put(None)
+
+    def run(self, request: GenerationRequest):
+        # the model echoes the prompt through the callback before generating
+        num_prompt_chars_left = len(request.prompt) + 1
+        pending_text = ""
+
+        def new_text_callback(text: str):
+            nonlocal num_prompt_chars_left, pending_text
+            if request.cancelled.is_set():
+                raise StopGeneration()
+            if num_prompt_chars_left > 0:
+                num_skipped = min(num_prompt_chars_left, len(text))
+                num_prompt_chars_left -= num_skipped
+                text = text[num_skipped:]
+            pending_text += text
+            stop_index = pending_text.find(request.stop_sequence)
+            if stop_index != -1:
+                if stop_index > 0:
+                    request.put(pending_text[:stop_index])
+                raise StopGeneration()
+            # hold back a tail that could be the start of the stop sequence
+            num_held = next(
+                (
+                    length
+                    for length in range(
+                        min(len(request.stop_sequence) - 1, len(pending_text)), 0, -1
+                    )
+                    if request.stop_sequence.startswith(pending_text[-length:])
+                ),
+                0,
+            )
+            ready_text = pending_text[: len(pending_text) - num_held]
+            pending_text = pending_text[len(ready_text) :]
+            if ready_text:
+                request.put(ready_text)
+
+        self.model.generate(request.prompt, new_text_callback=new_text_callback)
+        if pending_text:
+            request.put(pending_text)
+
+    async def generate(
+        self, prompt: str, stop_sequence: str = DEFAULT_STOP_SEQUENCE
+    ) -> AsyncGenerator[str, None]:
+        output_queue: "asyncio.Queue[Optional[Any]]" = asyncio.Queue()
+        request = GenerationRequest(
+            prompt, stop_sequence, asyncio.get_running_loop(), output_queue
+        )
+        self.requests.put(request)
+        try:
+            while True:
+                item = await output_queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # stops the generation at the next token if it's still running, or skips it if queued
+            request.cancelled.set()
+
+
+_model_pools: Dict[str, GPT4AllModelPool] = {}
+_model_pools_lock = threading.Lock()
+
+
+def get_gpt4all_model_pool(model_path: str) -> GPT4AllModelPool:
+    with _model_pools_lock:
+        model_pool = _model_pools.get(model_path)
+        if model_pool is None:
+            model_pool = GPT4AllModelPool(model_path)
+            _model_pools[model_path] = model_pool
+        return model_pool
@@ -11,6 +11,11 @@ from vocode import getenv
 from vocode.streaming.agent.base_agent import BaseAgent, RespondAgent
 from vocode.streaming.agent.utils import collate_response_async, openai_get_tokens
 from vocode.streaming.models.agent import LLMAgentConfig
+from vocode.streaming.utils.rate_limiter import (
+    RequestPriority,
+    acquire_llm_capacity,
+    estimate_tokens,
+)
 
 
 class LLMAgent(RespondAgent[LLMAgentConfig]):
@@ -101,6 +106,10 @@ class LLMAgent(RespondAgent[LLMAgentConfig]):
         return response, False
 
     async def _stream_sentences(self, prompt):
+        await acquire_llm_capacity(
+            estimate_tokens(prompt=prompt, max_tokens=self.agent_config.max_tokens),
+            priority=RequestPriority.LIVE_TURN,
+        )
         stream = await openai.Completion.acreate(
             prompt=prompt,
             max_tokens=self.agent_config.max_tokens,
@@ -0,0 +1,252 @@
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import openai
+
+from vocode import getenv
+from vocode.streaming.models.agent import (
+    OPENAI_DEFAULT_API_BASE,
+    LLMRouterConfig,
+    OpenAIEndpointConfig,
+)
+from vocode.streaming.utils.session_pool import get_shared_session
+
+# how much an endpoint's expected TTFT is inflated per unit of error rate when ranking
+ERROR_RATE_PENALTY = 10.0
+
+
+class EndpointStats:
+    def __init__(self, window_size: int):
+        self.ttfts: Deque[float] = deque(maxlen=window_size)
+        self.errors: Deque[bool] = deque(maxlen=window_size)
+
+    def record_ttft(self, ttft: float):
+        self.ttfts.append(ttft)
+        self.errors.append(False)
+
+    def record_error(self):
+        self.errors.append(True)
+
+    def record_lost_hedge(self):
+        # it only tells us the first token would have come later than the winner's,
+        # a TTFT sample that low would make the endpoint look faster than it is
+        self.record_error()
+
+    @property
+    def error_rate(self) -> float:
+        if not self.errors:
+            return 0.0
+        return sum(self.errors) / len(self.errors)
+
+    def get_ttft_percentile(self, percentile: float) -> Optional[float]:
+        if not self.ttfts:
+            return None
+        return float(np.percentile(self.ttfts, percentile))
+
+    def get_score(self, default_ttft: float) -> float:
+        """Expected TTFT penalized by the error rate, lower is healthier"""
+        median_ttft = self.get_ttft_percentile(50)
+        expected_ttft = default_ttft if median_ttft is None else median_ttft
+        return expected_ttft * (1 + ERROR_RATE_PENALTY * self.error_rate)
+
+
+# endpoint health is shared by every conversation in the process
+_endpoint_stats: Dict[Tuple[str, str, Optional[str]], EndpointStats] = {}
+
+
+def get_endpoint_stats(
+    endpoint: OpenAIEndpointConfig, window_size: int
+) -> EndpointStats:
+    key = (
+        endpoint.api_type,
+        endpoint.api_base or "",
+        endpoint.engine or endpoint.model_name,
+    )
+    stats = _endpoint_stats.get(key)
+    if stats is None:
+        stats = EndpointStats(window_size)
+        _endpoint_stats[key] = stats
+    return stats
+
+
+def reset_endpoint_stats():
+    _endpoint_stats.clear()
+
+
+class LLMRouter:
+    """Sends each chat completion to the healthiest endpoint, hedging with the next one
+    when the first token is late and failing over when an endpoint errors."""
+
+    def __init__(
+        self,
+        router_config: LLMRouterConfig,
+        logger: Optional[logging.Logger] = None,
+    ):
+        assert router_config.endpoints, "LLMRouterConfig needs at least one endpoint"
+        self.router_config = router_config
+        self.logger = logger or logging.getLogger(__name__)
+        self.endpoints = [
+            self.resolve_endpoint(endpoint) for endpoint in router_config.endpoints
+        ]
+
+    def resolve_endpoint(self, endpoint: OpenAIEndpointConfig) -> OpenAIEndpointConfig:
+        is_azure = endpoint.api_type.startswith("azure")
+        api_base = endpoint.api_base or (
+            getenv("AZURE_OPENAI_API_BASE") if is_azure else OPENAI_DEFAULT_API_BASE
+        )
+        api_key = endpoint.api_key or (
+            getenv("AZURE_OPENAI_API_KEY") if is_azure else getenv("OPENAI_API_KEY")
+        )
+        if not api_base:
+            raise ValueError(
+                "AZURE_OPENAI_API_BASE must be set in environment or passed in"
+            )
+        if not api_key:
+            raise ValueError(
+                f"{'AZURE_OPENAI_API_KEY' if is_azure else 'OPENAI_API_KEY'} must be set in environment or passed in"
+            )
+        return endpoint.copy(update={"api_base": api_base, "api_key": api_key})
+
+    def get_stats(self, endpoint: OpenAIEndpointConfig) -> EndpointStats:
+        return get_endpoint_stats(endpoint, self.router_config.stats_window_size)
+
+    def rank_endpoints(self) -> List[OpenAIEndpointConfig]:
+        # endpoints without samples are expected to be as slow as the hedge allows,
+        # the sort is stable so ties keep the configured order
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: self.get_stats(endpoint).get_score(
+                self.router_config.max_hedge_delay_seconds
+            ),
+        )
+
+    def get_hedge_delay(self, endpoint: OpenAIEndpointConfig) -> float:
+        ttft = self.get_stats(endpoint).get_ttft_percentile(
+            self.router_config.hedge_percentile
+        )
+        if ttft is None:
+            return self.router_config.max_hedge_delay_seconds
+        return min(
+            max(ttft, self.router_config.min_hedge_delay_seconds),
+            self.router_config.max_hedge_delay_seconds,
+        )
+
+    def get_endpoint_parameters(
+        self, endpoint: OpenAIEndpointConfig, parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        endpoint_parameters = {
+            key: value
+            for key, value in parameters.items()
+            if key not in ("engine", "model")
+        }
+        if endpoint.engine:
+            endpoint_parameters["engine"] = endpoint.engine
+        else:
+            endpoint_parameters["model"] = endpoint.model_name or parameters.get(
+                "model"
+            )
+        endpoint_parameters.update(
+            api_type=endpoint.api_type,
+            api_base=endpoint.api_base,
+            api_version=endpoint.api_version,
+            api_key=endpoint.api_key,
+        )
+        return endpoint_parameters
+
+    async def open_stream(
+        self, endpoint: OpenAIEndpointConfig, parameters: Dict[str, Any]
+    ) -> Tuple[Optional[Any], Optional[AsyncGenerator]]:
+        """Starts a streamed completion and waits for its first event"""
+        # runs as its own task so this only applies to this request: reusing a keep-alive
+        # connection instead of openai's per-request session saves a handshake off the TTFT
+        assert endpoint.api_base is not None, "endpoints are resolved in __init__"
+        openai.aiosession.set(get_shared_session(endpoint.api_base))
+        stream = await openai.ChatCompletion.acreate(
+            **self.get_endpoint_parameters(endpoint, parameters), stream=True
+        )
+        try:
+            return await stream.__anext__(), stream
+        except StopAsyncIteration:
+            return None, None
+        except BaseException:
+            await stream.aclose()
+            raise
+
+    async def stream_chat_completion(
+        self, parameters: Dict[str, Any]
+    ) -> AsyncGenerator[Any, None]:
+        remaining_endpoints = self.rank_endpoints()
+        attempts: Dict[asyncio.Task, Tuple[OpenAIEndpointConfig, float]] = {}
+
+        def start_attempt() -> float:
+            endpoint = remaining_endpoints.pop(0)
+            task = asyncio.create_task(self.open_stream(endpoint, parameters))
+            attempts[task] = (endpoint, time.monotonic())
+            return time.monotonic() + self.get_hedge_delay(endpoint)
+
+        hedge_deadline = start_attempt()
+        should_hedge = self.router_config.hedge
+        first_event, stream = None, None
+        winner: Optional[OpenAIEndpointConfig] = None
+        last_error: Optional[BaseException] = None
+        try:
+            while attempts and winner is None:
+                timeout = None
+                if should_hedge and remaining_endpoints:
+                    timeout = max(hedge_deadline - time.monotonic(), 0)
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    should_hedge = False
+                    self.logger.debug(
+                        f"No first token from {attempts[next(iter(attempts))][0].api_base}, hedging"
+                    )
+                    start_attempt()
+                    continue
+                for task in done:
+                    endpoint, started_at = attempts.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        self.logger.warning(
+                            f"Chat completion failed on {endpoint.api_base}: {error!r}"
+                        )
+                        self.get_stats(endpoint).record_error()
+                        last_error = error
+                    elif winner is None:
+                        self.get_stats(endpoint).record_ttft(
+                            time.monotonic() - started_at
+                        )
+                        winner = endpoint
+                        first_event, stream = task.result()
+                    else:
+                        _, extra_stream = task.result()
+                        if extra_stream is not None:
+                            await extra_stream.aclose()
+                if winner is None and not attempts and remaining_endpoints:
+                    # fail over to the next endpoint
+                    hedge_deadline = start_attempt()
+        finally:
+            for task, (endpoint, _) in attempts.items():
+                task.cancel()
+                if winner is not None:
+                    self.get_stats(endpoint).record_lost_hedge()
+            for result in await asyncio.gather(*attempts, return_exceptions=True):
+                # an attempt may have opened its stream before the cancellation landed
+                if isinstance(result, tuple) and result[1] is not None:
+                    await result[1].aclose()
+        if winner is None:
+            assert last_error is not None
+            raise last_error
+        if stream is None:
+            return
+        try:
+            yield first_event
+            async for event in stream:
+                yield event
+        finally:
+            await stream.aclose()
@@ -0,0 +1,141 @@
+from enum import Enum
+from functools import lru_cache
+import logging
+import re
+from typing import Dict, Optional
+
+from opentelemetry import metrics
+
+from vocode.streaming.models.agent import ModelCascadeConfig
+
+# words that make up acknowledgements, backchannels and short confirmations
+SIMPLE_TURN_WORDS = {
+    "yes",
+    "yeah",
+    "yep",
+    "yup",
+    "no",
+    "nope",
+    "nah",
+    "ok",
+    "okay",
+    "sure",
+    "right",
+    "alright",
+    "thats",
+    "correct",
+    "exactly",
+    "absolutely",
+    "definitely",
+    "great",
+    "perfect",
+    "cool",
+    "fine",
+    "good",
+    "sounds",
+    "got",
+    "it",
+    "i",
+    "see",
+    "thanks",
+    "thank",
+    "you",
+    "mhm",
+    "mm",
+    "hmm",
+    "uh",
+    "huh",
+    "um",
+    "oh",
+    "ah",
+    "well",
+    "so",
+    "and",
+    "that",
+    "is",
+    "makes",
+    "sense",
+    "of",
+    "course",
+    "please",
+}
+
+meter = metrics.get_meter(__name__)
+route_latency_hist = meter.create_histogram(
+    name="agent.model_cascade.time_to_first_token",
+    unit="seconds",
+)
+route_counter = meter.create_counter(
+    name="agent.model_cascade.turns",
+)
+
+
+class ModelRoute(str, Enum):
+    PRIMARY = "model_route_primary"
+    FAST = "model_route_fast"
+
+
+@lru_cache(maxsize=1024)
+def is_simple_turn(text: str, max_words: int) -> bool:
+    words = re.sub(r"[^\w\s]", "", text.lower()).split()
+    return 0 < len(words) <= max_words and all(
+        word in SIMPLE_TURN_WORDS for word in words
+    )
+
+
+class RouteStats:
+    def __init__(self):
+        self.num_turns = 0
+        self.total_latency = 0.0
+
+    @property
+    def average_latency(self) -> Optional[float]:
+        if self.num_turns == 0:
+            return None
+        return self.total_latency / self.num_turns
+
+
+class ModelCascade:
+    """Decides per turn whether the fast model can answer in place of the primary model"""
+
+    def __init__(
+        self,
+        cascade_config: ModelCascadeConfig,
+        has_actions: bool = False,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.cascade_config = cascade_config
+        self.has_actions = has_actions
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats: Dict[ModelRoute, RouteStats] = {
+            route: RouteStats() for route in ModelRoute
+        }
+
+    def route(
+        self, human_input: str, last_bot_message: Optional[str] = None
+    ) -> ModelRoute:
+        if not is_simple_turn(human_input, self.cascade_config.max_simple_turn_words):
+            return ModelRoute.PRIMARY
+        if (
+            self.has_actions
+            and self.cascade_config.use_primary_model_for_actions
+            and last_bot_message is not None
+            and last_bot_message.rstrip().endswith("?")
+        ):
+            # "yes" to "should I transfer you?" needs the model that calls functions reliably
+            return ModelRoute.PRIMARY
+        return ModelRoute.FAST
+
+    def record_latency(self, route: ModelRoute, latency: float):
+        stats = self.stats[route]
+        stats.num_turns += 1
+        stats.total_latency += latency
+        route_latency_hist.record(latency, {"route": route.value})
+        route_counter.add(1, {"route": route.value})
+        self.logger.debug(
+            "Model cascade routes: %s",
+            ", ".join(
+                f"{route.value}={route_stats.num_turns} (avg {route_stats.average_latency or 0:.2f}s)"
+                for route, route_stats in self.stats.items()
+            ),
+        )
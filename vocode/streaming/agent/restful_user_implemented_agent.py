@@ -1,4 +1,8 @@
-from .base_agent import BaseAgent, RespondAgent
+import codecs
+import json
+import re
+from .base_agent import AgentResponseStop, BaseAgent, RespondAgent
+from .utils import collate_response_async
 from ..models.agent import (
     RESTfulUserImplementedAgentConfig,
     RESTfulAgentInput,
@@ -6,11 +10,19 @@ from ..models.agent import (
     RESTfulAgentOutputType,
     RESTfulAgentText,
 )
-from typing import Generator, Optional, Tuple, cast
+from ..utils.session_pool import get_shared_session
+from typing import AsyncGenerator, Generator, Optional, Tuple, cast
 import requests
 import logging
 import aiohttp
 
+NDJSON_CONTENT_TYPES = ["application/x-ndjson", "application/jsonl"]
+
+
+def split_into_tokens(text: str):
+    # chunks can hold several sentences, so split them up for the sentence segmenter
+    return re.split(r"(?<=\s)(?=\S)", text)
+
 
 class RESTfulUserImplementedAgent(RespondAgent[RESTfulUserImplementedAgentConfig]):
     def __init__(
@@ -19,11 +31,14 @@ class RESTfulUserImplementedAgent(RespondAgent[RESTfulUserImplementedAgentConfig
         logger=None,
     ):
         super().__init__(agent_config)
-        if self.agent_config.generate_responses:
-            raise NotImplementedError(
-                "Use the WebSocket user implemented agent to stream responses"
-            )
         self.logger = logger or logging.getLogger(__name__)
+        self.end_received = False
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        # shared keep-alive session per endpoint, so turns reuse warm connections
+        return get_shared_session(
+            url, connection_limit=self.agent_config.connection_limit
+        )
 
     async def respond(
         self,
@@ -33,28 +48,91 @@ class RESTfulUserImplementedAgent(RespondAgent[RESTfulUserImplementedAgentConfig
     ) -> Tuple[Optional[str], bool]:
         config = self.agent_config.respond
         try:
-            # TODO: cache session
-            async with aiohttp.ClientSession() as session:
-                payload = RESTfulAgentInput(
-                    human_input=human_input, conversation_id=conversation_id
-                ).dict()
-                async with session.request(
-                    config.method,
-                    config.url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
-                    assert response.status == 200
-                    output: RESTfulAgentOutput = RESTfulAgentOutput.parse_obj(
-                        await response.json()
-                    )
-                    output_response = None
-                    should_stop = False
-                    if output.type == RESTfulAgentOutputType.TEXT:
-                        output_response = cast(RESTfulAgentText, output).response
-                    elif output.type == RESTfulAgentOutputType.END:
-                        should_stop = True
-                    return output_response, should_stop
+            session = self.get_session(config.url)
+            payload = RESTfulAgentInput(
+                human_input=human_input, conversation_id=conversation_id
+            ).dict()
+            async with session.request(
+                config.method,
+                config.url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.agent_config.timeout_seconds),
+            ) as response:
+                assert response.status == 200
+                output: RESTfulAgentOutput = RESTfulAgentOutput.parse_obj(
+                    await response.json()
+                )
+                output_response = None
+                should_stop = False
+                if output.type == RESTfulAgentOutputType.TEXT:
+                    output_response = cast(RESTfulAgentText, output).response
+                elif output.type == RESTfulAgentOutputType.END:
+                    should_stop = True
+                return output_response, should_stop
         except Exception as e:
             self.logger.error(f"Error in response from RESTful agent: {e}")
             return None, True
+
+    async def generate_response(
+        self,
+        human_input,
+        conversation_id: str,
+        is_interrupt: bool = False,
+    ) -> AsyncGenerator[str, None]:
+        """Streams the endpoint's response sentence by sentence.
+
+        The endpoint can either stream NDJSON, one RESTfulAgentOutput per line, or
+        stream plain text with chunked transfer encoding.
+        """
+        config = self.agent_config.generate_response or self.agent_config.respond
+        self.end_received = False
+        should_stop = False
+        try:
+            session = self.get_session(config.url)
+            payload = RESTfulAgentInput(
+                human_input=human_input, conversation_id=conversation_id
+            ).dict()
+            async with session.request(
+                config.method,
+                config.url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.agent_config.timeout_seconds),
+            ) as response:
+                assert response.status == 200
+                if response.content_type in NDJSON_CONTENT_TYPES:
+                    tokens = self._get_ndjson_tokens(response)
+                else:
+                    tokens = self._get_text_tokens(response)
+                async for sentence in collate_response_async(tokens):
+                    yield cast(str, sentence)
+                should_stop = self.end_received
+        except Exception as e:
+            self.logger.error(f"Error in streamed response from RESTful agent: {e}")
+            should_stop = True
+        if should_stop:
+            self.produce_interruptible_agent_response_event_nonblocking(
+                AgentResponseStop()
+            )
+
+    async def _get_ndjson_tokens(
+        self, response: aiohttp.ClientResponse
+    ) -> AsyncGenerator[str, None]:
+        async for line in response.content:
+            if not line.strip():
+                continue
+            output = RESTfulAgentOutput.parse_obj(json.loads(line))
+            if output.type == RESTfulAgentOutputType.TEXT:
+                for token in split_into_tokens(cast(RESTfulAgentText, output).response):
+                    yield token
+            elif output.type == RESTfulAgentOutputType.END:
+                self.end_received = True
+                return
+
+    async def _get_text_tokens(
+        self, response: aiohttp.ClientResponse
+    ) -> AsyncGenerator[str, None]:
+        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")()
+        async for chunk in response.content.iter_any():
+            for token in split_into_tokens(decoder.decode(chunk)):
+                yield token
+        yield decoder.decode(b"", final=True)
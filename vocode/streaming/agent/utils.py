@@ -1,4 +1,5 @@
 from copy import deepcopy
+import json
 import re
 from typing import (
     Dict,
@@ -27,6 +28,48 @@ from vocode.streaming.models.transcript import (
 SENTENCE_ENDINGS = [".", "!", "?", "\n"]
 
 
+class JSONCompletenessTracker:
+    """Tracks whether a JSON value streamed in chunks has been closed, looking at
+    each character once"""
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.is_complete = False
+
+    def feed(self, chunk: str) -> bool:
+        for char in chunk:
+            if self.is_complete:
+                break
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+                self.started = True
+            elif char in "}]":
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    self.is_complete = True
+        return self.is_complete
+
+
+def is_valid_json(text: str) -> bool:
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
 async def collate_response_async(
     gen: AsyncIterable[Union[str, FunctionFragment]],
     sentence_endings: List[str] = SENTENCE_ENDINGS,
@@ -37,6 +80,8 @@ async def collate_response_async(
     buffer = ""
     function_name_buffer = ""
     function_args_buffer = ""
+    function_args_tracker = JSONCompletenessTracker()
+    function_call_yielded = False
     prev_ends_with_money = False
     async for token in gen:
         if not token:
@@ -62,12 +107,29 @@ async def collate_response_async(
                     buffer = ""
             prev_ends_with_money = ends_with_money
         elif isinstance(token, FunctionFragment):
+            if function_call_yielded:
+                continue
             function_name_buffer += token.name
             function_args_buffer += token.arguments
+            if (
+                get_functions
+                and function_name_buffer
+                and function_args_tracker.feed(token.arguments)
+                and is_valid_json(function_args_buffer)
+            ):
+                # the arguments are complete, so the action can start before the stream ends
+                to_return = buffer.strip()
+                if to_return:
+                    yield to_return
+                buffer = ""
+                yield FunctionCall(
+                    name=function_name_buffer, arguments=function_args_buffer
+                )
+                function_call_yielded = True
     to_return = buffer.strip()
     if to_return:
         yield to_return
-    if function_name_buffer and get_functions:
+    if function_name_buffer and get_functions and not function_call_yielded:
         yield FunctionCall(name=function_name_buffer, arguments=function_args_buffer)
 
 
@@ -97,19 +159,14 @@ async def openai_get_tokens(gen) -> AsyncGenerator[Union[str, FunctionFragment],
             )
 
 
-def find_last_punctuation(buffer: str) -> Optional[int]:
-    indices = [buffer.rfind(ending) for ending in SENTENCE_ENDINGS]
-    if not indices:
-        return None
-    return max(indices)
-
-
-def get_sentence_from_buffer(buffer: str):
-    last_punctuation = find_last_punctuation(buffer)
-    if last_punctuation:
-        return buffer[: last_punctuation + 1], buffer[last_punctuation + 1 :]
-    else:
-        return None, None
+async def anthropic_get_tokens(gen) -> AsyncGenerator[str, None]:
+    """Anthropic streams the cumulative completion, so yield only what's new since the last event"""
+    cursor = 0
+    async for event in gen:
+        completion = event["completion"]
+        if len(completion) > cursor:
+            yield completion[cursor:]
+            cursor = len(completion)
 
 
 def format_openai_chat_messages_from_transcript(
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Deque, Dict, List, Optional, Tuple
+import zlib
+from collections import deque
+
+from websockets.client import connect, WebSocketClientProtocol
+
+from vocode.streaming.models.websocket_agent import (
+    WebSocketAgentMessage,
+    DEFAULT_MAX_PENDING_MESSAGES_PER_CONVERSATION,
+    DEFAULT_NUM_MULTIPLEXED_CONNECTIONS,
+)
+
+RECONNECT_INITIAL_BACKOFF_SECONDS = 0.1
+RECONNECT_MAX_BACKOFF_SECONDS = 5.0
+
+
+class MultiplexedSubscription:
+    """A single conversation's view of a shared websocket connection.
+
+    Outgoing messages are flow controlled per conversation: at most
+    `max_pending_messages` can be waiting to be written to the socket, after which
+    `send` waits, so one chatty conversation can't starve the others.
+    """
+
+    def __init__(
+        self,
+        conversation_id: str,
+        connection: "MultiplexedConnection",
+        max_pending_messages: int,
+    ):
+        self.conversation_id = conversation_id
+        self.connection = connection
+        self.pending_messages = asyncio.Semaphore(max_pending_messages)
+        self.incoming: asyncio.Queue[WebSocketAgentMessage] = asyncio.Queue()
+        self.is_unsubscribed = False
+
+    async def send(self, message: WebSocketAgentMessage):
+        message.conversation_id = self.conversation_id
+        await self.pending_messages.acquire()
+        if self.is_unsubscribed:
+            return
+        self.connection.enqueue(self, message.json())
+
+    async def receive(self) -> WebSocketAgentMessage:
+        return await self.incoming.get()
+
+    def on_sent(self):
+        self.pending_messages.release()
+
+
+class MultiplexedConnection:
+    """A websocket shared by many conversations that reconnects transparently.
+
+    Messages stay buffered until they have been written to the socket, so messages
+    queued or in flight while the connection is down are sent after reconnecting.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        subscriptions: Dict[str, MultiplexedSubscription],
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.url = url
+        self.subscriptions = subscriptions
+        self.logger = logger or logging.getLogger(__name__)
+        self.outgoing: Deque[Tuple[MultiplexedSubscription, str]] = deque()
+        self.has_outgoing = asyncio.Event()
+        self.is_connected = asyncio.Event()
+        self.num_connects = 0
+        self.closed = False
+        self.run_task = asyncio.create_task(self._run())
+
+    def enqueue(self, subscription: MultiplexedSubscription, payload: str):
+        self.outgoing.append((subscription, payload))
+        self.has_outgoing.set()
+
+    def discard(self, subscription: MultiplexedSubscription):
+        """Drops the messages an unsubscribed conversation still has queued"""
+        outgoing = deque(
+            (queued_subscription, payload)
+            for queued_subscription, payload in self.outgoing
+            if queued_subscription is not subscription
+        )
+        # frees their slots, so sends still waiting for one return instead of hanging
+        for _ in range(len(self.outgoing) - len(outgoing)):
+            subscription.on_sent()
+        self.outgoing = outgoing
+
+    async def _run(self):
+        backoff = RECONNECT_INITIAL_BACKOFF_SECONDS
+        while not self.closed:
+            try:
+                async with connect(self.url) as ws:
+                    self.num_connects += 1
+                    self.is_connected.set()
+                    backoff = RECONNECT_INITIAL_BACKOFF_SECONDS
+                    await self._pump(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug(f"Multiplexed websocket connection error: {e}")
+            self.is_connected.clear()
+            if self.closed:
+                break
+            self.logger.debug(
+                "Multiplexed websocket connection to %s died, reconnecting in %ss",
+                self.url,
+                backoff,
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RECONNECT_MAX_BACKOFF_SECONDS)
+
+    async def _pump(self, ws: WebSocketClientProtocol):
+        sender = asyncio.create_task(self._sender(ws))
+        receiver = asyncio.create_task(self._receiver(ws))
+        try:
+            await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sender.cancel()
+            receiver.cancel()
+        for task in (sender, receiver):
+            if not task.cancelled() and task.exception():
+                self.logger.debug(
+                    f"Multiplexed websocket task failed: {task.exception()}"
+                )
+
+    async def _sender(self, ws: WebSocketClientProtocol):
+        while True:
+            if not self.outgoing:
+                self.has_outgoing.clear()
+                await self.has_outgoing.wait()
+                continue
+            subscription, payload = self.outgoing.popleft()
+            try:
+                await ws.send(payload)
+            except BaseException:
+                # a dead socket doesn't drop it, it's sent first after reconnecting
+                if not subscription.is_unsubscribed:
+                    self.outgoing.appendleft((subscription, payload))
+                raise
+            subscription.on_sent()
+
+    async def _receiver(self, ws: WebSocketClientProtocol):
+        async for raw_message in ws:
+            try:
+                message = WebSocketAgentMessage.parse_obj(json.loads(raw_message))
+            except Exception as e:
+                self.logger.error(f"Could not parse multiplexed message: {e}")
+                continue
+            subscription = (
+                self.subscriptions.get(message.conversation_id)
+                if message.conversation_id
+                else None
+            )
+            if subscription is None:
+                self.logger.warning(
+                    "Dropping message for unknown conversation %s",
+                    message.conversation_id,
+                )
+                continue
+            subscription.incoming.put_nowait(message)
+
+    async def close(self):
+        self.closed = True
+        self.run_task.cancel()
+        try:
+            await self.run_task
+        except asyncio.CancelledError:
+            pass
+
+
+class MultiplexedWebSocketPool:
+    """A small set of websocket connections to an agent service shared by every
+    conversation in the process. Frames are tagged with the conversation_id and
+    routed back to the conversation's subscription."""
+
+    def __init__(
+        self,
+        url: str,
+        num_connections: int = DEFAULT_NUM_MULTIPLEXED_CONNECTIONS,
+        max_pending_messages: int = DEFAULT_MAX_PENDING_MESSAGES_PER_CONVERSATION,
+        logger: Optional[logging.Logger] = None,
+    ):
+        assert num_connections > 0
+        self.url = url
+        self.max_pending_messages = max_pending_messages
+        self.logger = logger or logging.getLogger(__name__)
+        self.subscriptions: Dict[str, MultiplexedSubscription] = {}
+        self.connections: List[MultiplexedConnection] = [
+            MultiplexedConnection(url, self.subscriptions, logger=self.logger)
+            for _ in range(num_connections)
+        ]
+
+    def get_connection(self, conversation_id: str) -> MultiplexedConnection:
+        # a conversation always uses the same connection, which keeps its messages in order
+        return self.connections[
+            zlib.crc32(conversation_id.encode()) % len(self.connections)
+        ]
+
+    def subscribe(self, conversation_id: str) -> MultiplexedSubscription:
+        assert (
+            conversation_id not in self.subscriptions
+        ), f"Conversation {conversation_id} is already subscribed"
+        subscription = MultiplexedSubscription(
+            conversation_id,
+            self.get_connection(conversation_id),
+            max_pending_messages=self.max_pending_messages,
+        )
+        self.subscriptions[conversation_id] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription: MultiplexedSubscription):
+        self.subscriptions.pop(subscription.conversation_id, None)
+        # an ended conversation's backlog would otherwise hold up everyone else's messages
+        subscription.is_unsubscribed = True
+        subscription.connection.discard(subscription)
+
+    async def close(self):
+        for connection in self.connections:
+            await connection.close()
+
+
+# the pools' tasks hold their loop, so they're dropped explicitly in close_multiplexed_websocket_pools
+_pools_by_loop: Dict[
+    asyncio.AbstractEventLoop, Dict[Tuple[str, int, int], MultiplexedWebSocketPool]
+] = {}
+
+
+def get_multiplexed_websocket_pool(
+    url: str,
+    num_connections: int = DEFAULT_NUM_MULTIPLEXED_CONNECTIONS,
+    max_pending_messages: int = DEFAULT_MAX_PENDING_MESSAGES_PER_CONVERSATION,
+    logger: Optional[logging.Logger] = None,
+) -> MultiplexedWebSocketPool:
+    pools = _pools_by_loop.setdefault(asyncio.get_running_loop(), {})
+    key = (url, num_connections, max_pending_messages)
+    if key not in pools:
+        pools[key] = MultiplexedWebSocketPool(
+            url,
+            num_connections=num_connections,
+            max_pending_messages=max_pending_messages,
+            logger=logger,
+        )
+    return pools[key]
+
+
+async def close_multiplexed_websocket_pools():
+    pools = _pools_by_loop.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.close()
@@ -23,6 +23,10 @@ from vocode.streaming.agent.base_agent import (
     BaseAgent,
     TranscriptionAgentInput,
 )
+from vocode.streaming.agent.websocket_connection_pool import (
+    MultiplexedSubscription,
+    get_multiplexed_websocket_pool,
+)
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.websocket_agent import (
     WebSocketAgentMessage,
@@ -55,6 +59,10 @@ class WebSocketUserImplementedAgent(BaseAgent[WebSocketUserImplementedAgentConfi
     async def _run_loop(self) -> None:
         restarts = 0
         self.logger.info("Starting Socket Agent")
+        if self.get_agent_config().use_multiplexed_connection:
+            # the shared pool reconnects on its own, so there's nothing to restart
+            await self._process_multiplexed()
+            return
         while not self.has_ended and restarts < NUM_RESTARTS:
             await self._process()
             restarts += 1
@@ -163,6 +171,52 @@ class WebSocketUserImplementedAgent(BaseAgent[WebSocketUserImplementedAgentConfi
 
             await asyncio.gather(sender(ws), receiver(ws))
 
+    async def _process_multiplexed(self) -> None:
+        agent_config = self.get_agent_config()
+        pool = get_multiplexed_websocket_pool(
+            agent_config.respond.url,
+            num_connections=agent_config.num_multiplexed_connections,
+            max_pending_messages=agent_config.max_pending_messages_per_conversation,
+            logger=self.logger,
+        )
+        subscription: Optional[MultiplexedSubscription] = None
+        receiver_task: Optional[asyncio.Task] = None
+        try:
+            while not self.has_ended:
+                input = await self.input_queue.get()
+                payload = input.payload
+                if not isinstance(payload, TranscriptionAgentInput):
+                    continue
+                if subscription is None:
+                    # the conversation_id is only known once the first input arrives
+                    subscription = pool.subscribe(payload.conversation_id)
+                    receiver_task = asyncio.create_task(
+                        self._receive_multiplexed(subscription)
+                    )
+                self.logger.info(
+                    "Transcription message: %s", payload.transcription.message
+                )
+                await subscription.send(
+                    WebSocketAgentTextMessage.from_text(
+                        payload.transcription.message,
+                        conversation_id=payload.conversation_id,
+                    )
+                )
+        finally:
+            if receiver_task is not None:
+                receiver_task.cancel()
+            if subscription is not None:
+                pool.unsubscribe(subscription)
+            self.logger.debug("Terminating multiplexed web socket agent")
+
+    async def _receive_multiplexed(self, subscription: MultiplexedSubscription):
+        while not self.has_ended:
+            message = await subscription.receive()
+            try:
+                self._handle_incoming_socket_message(message)
+            except Exception as e:
+                self.logger.error(f'WebSocket Agent Receive Error: "{e}"')
+
     def terminate(self):
         self.produce_interruptible_agent_response_event_nonblocking(AgentResponseStop())
         super().terminate()
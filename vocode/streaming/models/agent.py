@@ -9,6 +9,8 @@ from .model import TypedModel, BaseModel
 from .vector_db import VectorDBConfig
 
 FILLER_AUDIO_DEFAULT_SILENCE_THRESHOLD_SECONDS = 0.5
+FILLER_AUDIO_DEFAULT_MIN_EXPECTED_GAP_SECONDS = 0.5
+FILLER_AUDIO_DEFAULT_LATENCY_WINDOW_SIZE = 10
 LLM_AGENT_DEFAULT_TEMPERATURE = 1.0
 LLM_AGENT_DEFAULT_MAX_TOKENS = 256
 LLM_AGENT_DEFAULT_MODEL_NAME = "text-curie-001"
@@ -19,6 +21,16 @@ CHAT_VERTEX_AI_DEFAULT_MODEL_NAME = "chat-bison@001"
 AZURE_OPENAI_DEFAULT_API_TYPE = "azure"
 AZURE_OPENAI_DEFAULT_API_VERSION = "2023-03-15-preview"
 AZURE_OPENAI_DEFAULT_ENGINE = "gpt-35-turbo"
+OPENAI_DEFAULT_API_TYPE = "open_ai"
+OPENAI_DEFAULT_API_BASE = "https://api.openai.com/v1"
+LLM_ROUTER_DEFAULT_STATS_WINDOW_SIZE = 50
+LLM_ROUTER_DEFAULT_HEDGE_PERCENTILE = 95
+LLM_ROUTER_DEFAULT_MIN_HEDGE_DELAY_SECONDS = 0.2
+LLM_ROUTER_DEFAULT_MAX_HEDGE_DELAY_SECONDS = 2.0
+MODEL_CASCADE_DEFAULT_FAST_MODEL_NAME = "gpt-3.5-turbo-0613"
+MODEL_CASCADE_DEFAULT_MAX_SIMPLE_TURN_WORDS = 6
+RESTFUL_AGENT_DEFAULT_CONNECTION_LIMIT = 100
+RESTFUL_AGENT_DEFAULT_TIMEOUT_SECONDS = 15
 
 
 class AgentType(str, Enum):
@@ -36,10 +48,21 @@ class AgentType(str, Enum):
     ACTION = "agent_action"
 
 
+class GoodbyeModelType(str, Enum):
+    # compares OpenAI embeddings of utterances against the goodbye phrases
+    EMBEDDING = "goodbye_model_embedding"
+    # matches goodbye phrases locally, without any network calls
+    LEXICAL = "goodbye_model_lexical"
+
+
 class FillerAudioConfig(BaseModel):
     silence_threshold_seconds: float = FILLER_AUDIO_DEFAULT_SILENCE_THRESHOLD_SECONDS
     use_phrases: bool = True
     use_typing_noise: bool = False
+    # filler only plays when the response is expected at least this long after the silence threshold
+    min_expected_gap_seconds: float = FILLER_AUDIO_DEFAULT_MIN_EXPECTED_GAP_SECONDS
+    # number of recent turns the expected time to first sentence is estimated over
+    latency_window_size: int = FILLER_AUDIO_DEFAULT_LATENCY_WINDOW_SIZE
 
     @validator("use_typing_noise")
     def typing_noise_excludes_phrases(cls, v, values):
@@ -60,12 +83,46 @@ class AzureOpenAIConfig(BaseModel):
     engine: str = AZURE_OPENAI_DEFAULT_ENGINE
 
 
+class OpenAIEndpointConfig(BaseModel):
+    api_type: str = OPENAI_DEFAULT_API_TYPE
+    # defaults to the OpenAI API, or AZURE_OPENAI_API_BASE for azure endpoints
+    api_base: Optional[str] = None
+    api_version: Optional[str] = None
+    # defaults to OPENAI_API_KEY, or AZURE_OPENAI_API_KEY for azure endpoints
+    api_key: Optional[str] = None
+    # the azure deployment to use, openai endpoints use model_name instead
+    engine: Optional[str] = None
+    # defaults to the agent's model_name
+    model_name: Optional[str] = None
+
+
+class LLMRouterConfig(BaseModel):
+    endpoints: List[OpenAIEndpointConfig]
+    stats_window_size: int = LLM_ROUTER_DEFAULT_STATS_WINDOW_SIZE
+    hedge: bool = True
+    # a second endpoint is tried once the first token is later than this percentile of the chosen endpoint's TTFT
+    hedge_percentile: float = LLM_ROUTER_DEFAULT_HEDGE_PERCENTILE
+    min_hedge_delay_seconds: float = LLM_ROUTER_DEFAULT_MIN_HEDGE_DELAY_SECONDS
+    max_hedge_delay_seconds: float = LLM_ROUTER_DEFAULT_MAX_HEDGE_DELAY_SECONDS
+
+
+class ModelCascadeConfig(BaseModel):
+    fast_model_name: str = MODEL_CASCADE_DEFAULT_FAST_MODEL_NAME
+    # the azure deployment of the fast model, used when the agent has azure_params
+    fast_engine: Optional[str] = None
+    # longer user messages always go to the primary model
+    max_simple_turn_words: int = MODEL_CASCADE_DEFAULT_MAX_SIMPLE_TURN_WORDS
+    # a short reply to the bot's question may confirm an action, which the primary model should handle
+    use_primary_model_for_actions: bool = True
+
+
 class AgentConfig(TypedModel, type=AgentType.BASE.value):
     initial_message: Optional[BaseMessage] = None
     generate_responses: bool = True
     allowed_idle_time_seconds: Optional[float] = None
     allow_agent_to_be_cut_off: bool = True
     end_conversation_on_goodbye: bool = False
+    goodbye_model_type: GoodbyeModelType = GoodbyeModelType.EMBEDDING
     send_filler_audio: Union[bool, FillerAudioConfig] = False
     webhook_config: Optional[WebhookConfig] = None
     track_bot_sentiment: bool = False
@@ -94,6 +151,10 @@ class ChatGPTAgentConfig(AgentConfig, type=AgentType.CHAT_GPT.value):
     cut_off_response: Optional[CutOffResponse] = None
     azure_params: Optional[AzureOpenAIConfig] = None
     vector_db_config: Optional[VectorDBConfig] = None
+    # routes each request across several endpoints, overrides azure_params when set
+    llm_router_config: Optional[LLMRouterConfig] = None
+    # sends simple turns, like acknowledgements, to a faster model
+    model_cascade: Optional[ModelCascadeConfig] = None
 
 
 class ChatAnthropicAgentConfig(AgentConfig, type=AgentType.CHAT_ANTHROPIC.value):
@@ -137,7 +198,10 @@ class RESTfulUserImplementedAgentConfig(
 
     respond: EndpointConfig
     generate_responses: bool = False
-    # generate_response: Optional[EndpointConfig]
+    # streaming endpoint, falls back to `respond` if not set
+    generate_response: Optional[EndpointConfig] = None
+    connection_limit: int = RESTFUL_AGENT_DEFAULT_CONNECTION_LIMIT
+    timeout_seconds: float = RESTFUL_AGENT_DEFAULT_TIMEOUT_SECONDS
 
 
 class RESTfulAgentInput(BaseModel):
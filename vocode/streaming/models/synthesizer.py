@@ -27,8 +27,16 @@ class SynthesizerType(str, Enum):
     BARK = "synthesizer_bark"
 
 
+DEFAULT_SENTIMENT_WINDOW_SIZE = 6
+DEFAULT_SENTIMENT_DEBOUNCE_SECONDS = 0.5
+
+
 class SentimentConfig(BaseModel):
     emotions: List[str] = ["angry", "friendly", "sad", "whispering"]
+    # number of recent messages the sentiment is analysed over
+    window_size: int = DEFAULT_SENTIMENT_WINDOW_SIZE
+    # new messages within this long of each other trigger a single update
+    debounce_seconds: float = DEFAULT_SENTIMENT_DEBOUNCE_SECONDS
 
     @validator("emotions")
     def emotions_must_not_be_empty(cls, v):
@@ -3,15 +3,32 @@ from typing import Optional
 from .model import TypedModel
 
 DEFAULT_EMBEDDINGS_MODEL = "text-embedding-ada-002"
+DEFAULT_RETRIEVAL_LATENCY_BUDGET_SECONDS = 0.5
+DEFAULT_QUERY_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_RETRIEVAL_CACHE_SIZE = 32
+DEFAULT_EMBEDDING_BATCH_SIZE = 100
+DEFAULT_UPSERT_BATCH_SIZE = 100
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
 
 
 class VectorDBType(str, Enum):
     BASE = "vector_db_base"
     PINECONE = "vector_db_pinecone"
+    LOCAL = "vector_db_local"
 
 
 class VectorDBConfig(TypedModel, type=VectorDBType.BASE.value):
     embeddings_model: str = DEFAULT_EMBEDDINGS_MODEL
+    # how long a turn waits on retrieval before the LLM proceeds without it
+    retrieval_latency_budget_seconds: float = DEFAULT_RETRIEVAL_LATENCY_BUDGET_SECONDS
+    # queries whose embeddings are at least this similar reuse cached results
+    query_similarity_threshold: float = DEFAULT_QUERY_SIMILARITY_THRESHOLD
+    retrieval_cache_size: int = DEFAULT_RETRIEVAL_CACHE_SIZE
+    # indexing: texts per embeddings request, concurrent requests, and an optional
+    # file to persist embeddings in so unchanged texts aren't embedded again
+    embedding_batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    embedding_cache_path: Optional[str] = None
 
 
 class PineconeConfig(VectorDBConfig, type=VectorDBType.PINECONE.value):
@@ -19,3 +36,14 @@ class PineconeConfig(VectorDBConfig, type=VectorDBType.PINECONE.value):
     api_key: Optional[str]
     api_environment: Optional[str]
     top_k: int = 3
+    upsert_batch_size: int = DEFAULT_UPSERT_BATCH_SIZE
+
+
+class LocalVectorDBConfig(VectorDBConfig, type=VectorDBType.LOCAL.value):
+    # directory holding the memory-mapped vectors and the documents
+    index_path: str
+    top_k: int = 3
+    # split large indexes into this many IVF partitions and only search the closest
+    # num_probes of them, None searches every vector
+    num_partitions: Optional[int] = None
+    num_probes: int = 4
@@ -1,6 +1,6 @@
 import base64
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.client_backend import InputAudioConfig, OutputAudioConfig
@@ -30,7 +30,7 @@ class AudioMessage(WebSocketMessage, type=WebSocketMessageType.AUDIO):
     data: str
 
     @classmethod
-    def from_bytes(cls, chunk: bytes):
+    def from_bytes(cls, chunk: Union[bytes, memoryview]):
         return cls(data=base64.b64encode(chunk).decode("utf-8"))
 
     def get_bytes(self) -> bytes:
@@ -4,6 +4,9 @@ from vocode.streaming.models.agent import AgentConfig, AgentType
 
 from vocode.streaming.models.model import BaseModel, TypedModel
 
+DEFAULT_NUM_MULTIPLEXED_CONNECTIONS = 4
+DEFAULT_MAX_PENDING_MESSAGES_PER_CONVERSATION = 32
+
 
 class WebSocketAgentMessageType(str, Enum):
     BASE = "websocket_agent_base"
@@ -41,3 +44,10 @@ class WebSocketUserImplementedAgentConfig(
         url: str
 
     respond: RouteConfig
+    # share a small pool of websockets across all conversations in the process,
+    # messages are routed by conversation_id
+    use_multiplexed_connection: bool = False
+    num_multiplexed_connections: int = DEFAULT_NUM_MULTIPLEXED_CONNECTIONS
+    max_pending_messages_per_conversation: int = (
+        DEFAULT_MAX_PENDING_MESSAGES_PER_CONVERSATION
+    )
@@ -1,3 +1,5 @@
+from typing import Union
+
 from vocode.streaming.models.audio_encoding import AudioEncoding
 
 
@@ -9,7 +11,8 @@ class BaseOutputDevice:
     def start(self):
         pass
 
-    def consume_nonblocking(self, chunk: bytes):
+    def consume_nonblocking(self, chunk: Union[bytes, memoryview]):
+        """chunk can be a view into the synthesized audio, don't copy it unless you need to"""
         raise NotImplemented
     
     def maybe_send_mark_nonblocking(self, message):
@@ -6,6 +6,7 @@ import numpy as np
 from vocode.streaming.models.audio_encoding import AudioEncoding
 
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
+from vocode.streaming.utils.audio_codec import get_silent_chunk
 from vocode.streaming.utils.worker import ThreadAsyncWorker
 
 
@@ -32,7 +33,9 @@ class BlockingSpeakerOutput(BaseOutputDevice, ThreadAsyncWorker):
             device=int(self.device_info["index"]),
         )
         self._ended = False
-        self.input_queue.put_nowait(self.sampling_rate * b"\x00")
+        self.input_queue.put_nowait(
+            get_silent_chunk(AudioEncoding.LINEAR16, self.sampling_rate)
+        )
         self.stream.start()
 
     def start(self):
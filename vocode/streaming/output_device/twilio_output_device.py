@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import base64
-from typing import Optional
+from typing import Optional, Union
 
 from fastapi import WebSocket
 
@@ -32,7 +32,7 @@ class TwilioOutputDevice(BaseOutputDevice):
             message = await self.queue.get()
             await self.ws.send_text(message)
 
-    def consume_nonblocking(self, chunk: bytes):
+    def consume_nonblocking(self, chunk: Union[bytes, memoryview]):
         twilio_message = {
             "event": "media",
             "streamSid": self.stream_sid,
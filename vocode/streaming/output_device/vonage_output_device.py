@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional
+from typing import Optional, Union
 import wave
 
 from fastapi import WebSocket
@@ -24,7 +24,7 @@ class VonageOutputDevice(BaseOutputDevice):
         )
         self.ws = ws
         self.active = True
-        self.queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self.queue: asyncio.Queue[Union[bytes, memoryview]] = asyncio.Queue()
         self.process_task = asyncio.create_task(self.process())
         self.output_to_speaker = output_to_speaker
         if output_to_speaker:
@@ -41,7 +41,7 @@ class VonageOutputDevice(BaseOutputDevice):
                 subchunk = chunk[i : i + VONAGE_CHUNK_SIZE]
                 await self.ws.send_bytes(subchunk)
 
-    def consume_nonblocking(self, chunk: bytes):
+    def consume_nonblocking(self, chunk: Union[bytes, memoryview]):
         self.queue.put_nowait(chunk)
 
     def maybe_send_mark_nonblocking(self, message_sent):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Union
 from fastapi import WebSocket
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
@@ -31,7 +32,7 @@ class WebsocketOutputDevice(BaseOutputDevice):
             message = await self.queue.get()
             await self.ws.send_text(message)
 
-    def consume_nonblocking(self, chunk: bytes):
+    def consume_nonblocking(self, chunk: Union[bytes, memoryview]):
         if self.active:
             audio_message = AudioMessage.from_bytes(chunk)
             self.queue.put_nowait(audio_message.json())
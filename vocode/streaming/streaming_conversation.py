@@ -4,11 +4,23 @@ import asyncio
 import queue
 import random
 import threading
-from typing import Any, Awaitable, Callable, Generic, Optional, Tuple, TypeVar, cast
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 import logging
 import time
 import typing
 
+from opentelemetry import metrics
+
 from vocode.streaming.action.worker import ActionsWorker
 
 from vocode.streaming.agent.bot_sentiment_analyser import (
@@ -27,7 +39,6 @@ from vocode.streaming.models.transcriber import EndpointingConfig, TranscriberCo
 from vocode.streaming.output_device.base_output_device import BaseOutputDevice
 from vocode.streaming.utils.conversation_logger_adapter import wrap_logger
 from vocode.streaming.utils.events_manager import EventsManager
-from vocode.streaming.utils.goodbye_model import GoodbyeModel
 
 from vocode.streaming.models.agent import ChatGPTAgentConfig, FillerAudioConfig
 from vocode.streaming.models.synthesizer import (
@@ -59,6 +70,7 @@ from vocode.streaming.transcriber.base_transcriber import (
     BaseTranscriber,
 )
 from vocode.streaming.utils.state_manager import ConversationStateManager
+from vocode.streaming.utils.warmup_registry import get_warmup_registry
 from vocode.streaming.utils.worker import (
     AsyncQueueWorker,
     InterruptibleAgentResponseWorker,
@@ -70,6 +82,12 @@ from vocode.streaming.utils.worker import (
 
 OutputDeviceType = TypeVar("OutputDeviceType", bound=BaseOutputDevice)
 
+meter = metrics.get_meter(__name__)
+filler_audio_delay_hist = meter.create_histogram(
+    name="conversation.filler_audio.response_delay",
+    unit="seconds",
+)
+
 
 class StreamingConversation(Generic[OutputDeviceType]):
     class QueueingInterruptibleEventFactory(InterruptibleEventFactory):
@@ -142,6 +160,8 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 self.conversation.current_transcription_is_interrupt
             )
             self.conversation.is_human_speaking = not transcription.is_final
+            if not transcription.is_final:
+                self.conversation.agent.prefetch(transcription)
             if transcription.is_final:
                 # we use getattr here to avoid the dependency cycle between VonageCall and StreamingConversation
                 event = self.interruptible_event_factory.create_interruptible_event(
@@ -153,6 +173,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                     )
                 )
                 self.output_queue.put_nowait(event)
+                self.conversation.request_bot_sentiment_update()
 
     class FillerAudioWorker(InterruptibleAgentResponseWorker):
         """
@@ -172,11 +193,14 @@ class StreamingConversation(Generic[OutputDeviceType]):
             self.current_filler_seconds_per_chunk: Optional[int] = None
             self.filler_audio_started_event: Optional[threading.Event] = None
 
+        def is_filler_audio_playing(self) -> bool:
+            return (
+                self.filler_audio_started_event is not None
+                and self.filler_audio_started_event.is_set()
+            )
+
         async def wait_for_filler_audio_to_finish(self):
-            if (
-                self.filler_audio_started_event is None
-                or not self.filler_audio_started_event.set()
-            ):
+            if not self.is_filler_audio_playing():
                 self.conversation.logger.debug(
                     "Not waiting for filler audio to finish since we didn't send any chunks"
                 )
@@ -187,6 +211,16 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 await self.interruptible_event.agent_response_tracker.wait()
 
         def interrupt_current_filler_audio(self):
+            # filler that hasn't started by the time the response arrives would only delay it
+            while not self.input_queue.empty():
+                self.input_queue.get_nowait()
+            if (
+                self.current_task
+                and not self.current_task.done()
+                and not self.is_filler_audio_playing()
+            ):
+                self.current_task.cancel()
+                return True
             return self.interruptible_event and self.interruptible_event.interrupt()
 
         async def process(self, item: InterruptibleAgentResponseEvent[FillerAudio]):
@@ -195,6 +229,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 assert self.conversation.filler_audio_config is not None
                 filler_synthesis_result = filler_audio.create_synthesis_result()
                 self.current_filler_seconds_per_chunk = filler_audio.seconds_per_chunk
+                self.filler_audio_started_event = None
                 silence_threshold = (
                     self.conversation.filler_audio_config.silence_threshold_seconds
                 )
@@ -210,7 +245,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 )
                 item.agent_response_tracker.set()
             except asyncio.CancelledError:
-                pass
+                item.agent_response_tracker.set()
 
     class AgentResponsesWorker(InterruptibleAgentResponseWorker):
         """Runs Synthesizer.create_speech and sends the SynthesisResult to the output queue"""
@@ -240,24 +275,53 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 * TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS
             )
 
-        def send_filler_audio(self, agent_response_tracker: Optional[asyncio.Event]):
+        def choose_filler_audio(
+            self, expected_wait_seconds: Optional[float]
+        ) -> Optional[FillerAudio]:
+            filler_audios = self.conversation.synthesizer.filler_audios
+            if expected_wait_seconds is None:
+                return random.choice(filler_audios)
+            assert self.conversation.filler_audio_config is not None
+            expected_gap_seconds = (
+                expected_wait_seconds
+                - self.conversation.filler_audio_config.silence_threshold_seconds
+            )
+            fitting_filler_audios = [
+                filler_audio
+                for filler_audio in filler_audios
+                if filler_audio.duration_seconds <= expected_gap_seconds
+            ]
+            if not fitting_filler_audios:
+                return None
+            return random.choice(fitting_filler_audios)
+
+        def send_filler_audio(
+            self,
+            agent_response: AgentResponseFillerAudio,
+            agent_response_tracker: Optional[asyncio.Event],
+        ):
             assert self.conversation.filler_audio_worker is not None
             self.conversation.logger.debug("Sending filler audio")
-            if self.conversation.synthesizer.filler_audios:
-                filler_audio = random.choice(
-                    self.conversation.synthesizer.filler_audios
-                )
-                self.conversation.logger.debug(f"Chose {filler_audio.message.text}")
-                event = self.interruptible_event_factory.create_interruptible_agent_response_event(
-                    filler_audio,
-                    is_interruptible=filler_audio.is_interruptible,
-                    agent_response_tracker=agent_response_tracker,
-                )
-                self.conversation.filler_audio_worker.consume_nonblocking(event)
-            else:
+            if not self.conversation.synthesizer.filler_audios:
                 self.conversation.logger.debug(
                     "No filler audio available for synthesizer"
                 )
+                return
+            filler_audio = self.choose_filler_audio(
+                agent_response.expected_wait_seconds
+            )
+            if filler_audio is None:
+                self.conversation.logger.debug(
+                    f"No filler audio fits the expected wait of {agent_response.expected_wait_seconds:.2f}s"
+                )
+                return
+            self.conversation.logger.debug(f"Chose {filler_audio.message.text}")
+            event = self.interruptible_event_factory.create_interruptible_agent_response_event(
+                filler_audio,
+                is_interruptible=filler_audio.is_interruptible,
+                agent_response_tracker=agent_response_tracker,
+            )
+            self.conversation.filler_audio_worker.consume_nonblocking(event)
 
         async def process(self, item: InterruptibleAgentResponseEvent[AgentResponse]):
             if not self.conversation.synthesis_enabled:
@@ -268,7 +332,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
             try:
                 agent_response = item.payload
                 if isinstance(agent_response, AgentResponseFillerAudio):
-                    self.send_filler_audio(item.agent_response_tracker)
+                    self.send_filler_audio(agent_response, item.agent_response_tracker)
                     return
                 if isinstance(agent_response, AgentResponseStop):
                     self.conversation.logger.debug("Agent requested to stop")
@@ -281,17 +345,32 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 )
 
                 if self.conversation.filler_audio_worker is not None:
-                    if (
-                        self.conversation.filler_audio_worker.interrupt_current_filler_audio()
-                    ):
-                        await self.conversation.filler_audio_worker.wait_for_filler_audio_to_finish()
-
-                self.conversation.logger.debug("Synthesizing speech for message")
-                synthesis_result = await self.conversation.synthesizer.create_speech(
-                    agent_response_message.message,
-                    self.chunk_size,
-                    bot_sentiment=self.conversation.bot_sentiment,
+                    started_waiting_at = time.monotonic()
+                    self.conversation.filler_audio_worker.interrupt_current_filler_audio()
+                    # filler that's already playing finishes first, or is cut off if interruptible
+                    await self.conversation.filler_audio_worker.wait_for_filler_audio_to_finish()
+                    self.conversation.record_filler_audio_delay(
+                        time.monotonic() - started_waiting_at
+                    )
+
+                # messages rendered at startup, like the initial message, are only looked up
+                synthesis_result = (
+                    self.conversation.warmup_registry.get_synthesis_result(
+                        self.conversation.synthesizer,
+                        agent_response_message.message,
+                        self.chunk_size,
+                        bot_sentiment=self.conversation.bot_sentiment,
+                    )
                 )
+                if synthesis_result is None:
+                    self.conversation.logger.debug("Synthesizing speech for message")
+                    synthesis_result = (
+                        await self.conversation.synthesizer.create_speech(
+                            agent_response_message.message,
+                            self.chunk_size,
+                            bot_sentiment=self.conversation.bot_sentiment,
+                        )
+                    )
                 self.produce_interruptible_agent_response_event_nonblocking(
                     (agent_response_message.message, synthesis_result),
                     is_interruptible=item.is_interruptible,
@@ -343,6 +422,7 @@ class StreamingConversation(Generic[OutputDeviceType]):
                     conversation_id=self.conversation.id,
                 )
                 item.agent_response_tracker.set()
+                self.conversation.request_bot_sentiment_update()
                 self.conversation.logger.debug("Message sent: {}".format(message_sent))
                 if cut_off:
                     self.conversation.agent.update_last_bot_message_on_cut_off(
@@ -354,17 +434,25 @@ class StreamingConversation(Generic[OutputDeviceType]):
                             message_sent
                         )
                     )
-                    try:
-                        if await asyncio.wait_for(goodbye_detected_task, 0.1):
-                            self.conversation.logger.debug(
-                                "Agent said goodbye, ending call"
-                            )
-                            await self.conversation.terminate()
-                    except asyncio.TimeoutError:
-                        pass
+                    # don't hold up the next utterance, end the call once detection finishes
+                    goodbye_detected_task.add_done_callback(
+                        self.on_agent_goodbye_detected
+                    )
             except asyncio.CancelledError:
                 pass
 
+        def on_agent_goodbye_detected(self, goodbye_detected_task: asyncio.Task):
+            if goodbye_detected_task.cancelled():
+                return
+            if goodbye_detected_task.exception() is not None:
+                self.conversation.logger.error(
+                    f"Goodbye detection failed: {goodbye_detected_task.exception()}"
+                )
+                return
+            if goodbye_detected_task.result() and self.conversation.is_active():
+                self.conversation.logger.debug("Agent said goodbye, ending call")
+                asyncio.create_task(self.conversation.terminate())
+
     def __init__(
         self,
         output_device: OutputDeviceType,
@@ -426,6 +514,9 @@ class StreamingConversation(Generic[OutputDeviceType]):
         )
         self.filler_audio_worker = None
         self.filler_audio_config: Optional[FillerAudioConfig] = None
+        self.warmup_registry = get_warmup_registry()
+        # total time responses waited on filler audio that was playing when they arrived
+        self.filler_audio_delay_seconds = 0.0
         if self.agent.get_agent_config().send_filler_audio:
             self.filler_audio_worker = self.FillerAudioWorker(
                 input_queue=self.filler_audio_queue, conversation=self
@@ -437,6 +528,14 @@ class StreamingConversation(Generic[OutputDeviceType]):
         self.transcript = Transcript()
         self.transcript.attach_events_manager(self.events_manager)
         self.bot_sentiment = None
+        self.bot_sentiment_update_requested = asyncio.Event()
+        self.bot_sentiment_window: Tuple[Tuple[int, str], ...] = ()
+        self.bot_sentiment_window_string = ""
+        self.last_analysed_bot_sentiment_window: Optional[str] = None
+        self.should_track_bot_sentiment = bool(
+            self.agent.get_agent_config().track_bot_sentiment
+            and self.synthesizer.get_synthesizer_config().sentiment_config
+        )
         if self.agent.get_agent_config().track_bot_sentiment:
             self.sentiment_config = (
                 self.synthesizer.get_synthesizer_config().sentiment_config
@@ -464,7 +563,9 @@ class StreamingConversation(Generic[OutputDeviceType]):
         return ConversationStateManager(conversation=self)
 
     async def start(self, mark_ready: Optional[Callable[[], Awaitable[None]]] = None):
-        self.transcriber.start()
+        # a pre-connected transcriber is already running
+        if self.transcriber.worker_task is None:
+            self.transcriber.start()
         self.transcriptions_worker.start()
         self.agent_responses_worker.start()
         self.synthesis_results_worker.start()
@@ -473,19 +574,11 @@ class StreamingConversation(Generic[OutputDeviceType]):
             self.filler_audio_worker.start()
         if self.actions_worker is not None:
             self.actions_worker.start()
-        is_ready = await self.transcriber.ready()
+        is_ready, _ = await asyncio.gather(
+            self.transcriber.ready(), self.set_up_filler_audio()
+        )
         if not is_ready:
             raise Exception("Transcriber startup failed")
-        if self.agent.get_agent_config().send_filler_audio:
-            if not isinstance(
-                self.agent.get_agent_config().send_filler_audio, FillerAudioConfig
-            ):
-                self.filler_audio_config = FillerAudioConfig()
-            else:
-                self.filler_audio_config = typing.cast(
-                    FillerAudioConfig, self.agent.get_agent_config().send_filler_audio
-                )
-            await self.synthesizer.set_filler_audios(self.filler_audio_config)
 
         self.agent.start()
         initial_message = self.agent.get_agent_config().initial_message
@@ -494,10 +587,10 @@ class StreamingConversation(Generic[OutputDeviceType]):
         self.agent.attach_transcript(self.transcript)
         if mark_ready:
             await mark_ready()
-        if self.synthesizer.get_synthesizer_config().sentiment_config:
-            await self.update_bot_sentiment()
         self.active = True
-        if self.synthesizer.get_synthesizer_config().sentiment_config:
+        if self.should_track_bot_sentiment:
+            # the first update runs in the background, synthesis uses no sentiment until it lands
+            self.bot_sentiment_update_requested.set()
             self.track_bot_sentiment_task = asyncio.create_task(
                 self.track_bot_sentiment()
             )
@@ -505,6 +598,21 @@ class StreamingConversation(Generic[OutputDeviceType]):
         if len(self.events_manager.subscriptions) > 0:
             self.events_task = asyncio.create_task(self.events_manager.start())
 
+    async def set_up_filler_audio(self):
+        if not self.agent.get_agent_config().send_filler_audio:
+            return
+        if not isinstance(
+            self.agent.get_agent_config().send_filler_audio, FillerAudioConfig
+        ):
+            self.filler_audio_config = FillerAudioConfig()
+        else:
+            self.filler_audio_config = typing.cast(
+                FillerAudioConfig, self.agent.get_agent_config().send_filler_audio
+            )
+        await self.warmup_registry.set_filler_audios(
+            self.synthesizer, self.filler_audio_config
+        )
+
     async def send_initial_message(self, initial_message: BaseMessage):
         # TODO: configure if initial message is interruptible
         self.transcriber.mute()
@@ -532,19 +640,57 @@ class StreamingConversation(Generic[OutputDeviceType]):
                 return
             await asyncio.sleep(15)
 
+    def record_filler_audio_delay(self, delay_seconds: float):
+        if self.filler_audio_worker is None or delay_seconds < 0.001:
+            return
+        self.filler_audio_delay_seconds += delay_seconds
+        filler_audio_delay_hist.record(delay_seconds)
+        self.logger.debug(f"Filler audio delayed the response by {delay_seconds:.2f}s")
+
+    def request_bot_sentiment_update(self):
+        if self.should_track_bot_sentiment:
+            self.bot_sentiment_update_requested.set()
+
     async def track_bot_sentiment(self):
-        """Updates self.bot_sentiment every second based on the current transcript"""
-        prev_transcript = None
+        """Updates self.bot_sentiment when new messages come in, debounced so that a
+        burst of messages causes a single update"""
+        is_first_update = True
         while self.is_active():
-            await asyncio.sleep(1)
-            if self.transcript.to_string() != prev_transcript:
+            await self.bot_sentiment_update_requested.wait()
+            if not is_first_update:
+                await asyncio.sleep(self.sentiment_config.debounce_seconds)
+            is_first_update = False
+            self.bot_sentiment_update_requested.clear()
+            try:
                 await self.update_bot_sentiment()
-                prev_transcript = self.transcript.to_string()
+            except Exception as e:
+                self.logger.error(f"Error updating bot sentiment: {e}")
+
+    def get_bot_sentiment_window(self) -> str:
+        """Renders the last few messages of the transcript, re-rendering only when they changed"""
+        assert self.sentiment_config is not None
+        messages: List[Message] = []
+        for event_log in reversed(self.transcript.event_logs):
+            if len(messages) == self.sentiment_config.window_size:
+                break
+            if isinstance(event_log, Message) and event_log.text:
+                messages.append(event_log)
+        messages.reverse()
+        # bot messages are filled in as they're spoken and edited on cut off, so the text is part of the key
+        window = tuple((id(message), message.text) for message in messages)
+        if window != self.bot_sentiment_window:
+            self.bot_sentiment_window = window
+            self.bot_sentiment_window_string = "\n".join(
+                message.to_string() for message in messages
+            )
+        return self.bot_sentiment_window_string
 
     async def update_bot_sentiment(self):
-        new_bot_sentiment = await self.bot_sentiment_analyser.analyse(
-            self.transcript.to_string()
-        )
+        window = self.get_bot_sentiment_window()
+        if window == self.last_analysed_bot_sentiment_window:
+            return
+        self.last_analysed_bot_sentiment_window = window
+        new_bot_sentiment = await self.bot_sentiment_analyser.analyse(window)
         if new_bot_sentiment.emotion:
             self.logger.debug("Bot sentiment: %s", new_bot_sentiment)
             self.bot_sentiment = new_bot_sentiment
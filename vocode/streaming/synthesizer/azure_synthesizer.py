@@ -1,9 +1,12 @@
 import asyncio
+import bisect
 from concurrent.futures import ThreadPoolExecutor
 import logging
+import math
 import os
 import re
-from typing import Any, List, Optional, Tuple
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from xml.etree import ElementTree
 import aiohttp
 from vocode import getenv
@@ -23,6 +26,7 @@ from vocode.streaming.synthesizer.base_synthesizer import (
 )
 from vocode.streaming.models.synthesizer import AzureSynthesizerConfig, SynthesizerType
 from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.utils.client_pool import ClientPool, get_client_pool
 
 import azure.cognitiveservices.speech as speechsdk
 
@@ -35,23 +39,115 @@ NAMESPACES = {
 ElementTree.register_namespace("", NAMESPACES[""])
 ElementTree.register_namespace("mstts", NAMESPACES["mstts"])
 
+# every utterance being streamed holds one of these threads while it blocks on Azure
+AZURE_SYNTHESIS_MAX_WORKERS = 32
+
+_synthesis_executor = ThreadPoolExecutor(
+    max_workers=AZURE_SYNTHESIS_MAX_WORKERS, thread_name_prefix="azure_synthesis"
+)
+
+
+def get_synthesis_executor() -> ThreadPoolExecutor:
+    return _synthesis_executor
+
+
+def read_chunk(audio_data_stream: speechsdk.AudioDataStream, chunk_size: int) -> bytes:
+    """Blocks until chunk_size bytes are read; a shorter chunk means the stream ended"""
+    parts: List[bytes] = []
+    num_bytes = 0
+    while num_bytes < chunk_size:
+        # read_data fills the buffer in place, so every chunk gets its own
+        buffer = bytes(chunk_size - num_bytes)
+        filled_size = audio_data_stream.read_data(buffer)
+        if filled_size == 0:
+            break
+        parts.append(buffer if filled_size == len(buffer) else buffer[:filled_size])
+        num_bytes += filled_size
+    return parts[0] if len(parts) == 1 else b"".join(parts)
+
 
 class WordBoundaryEventPool:
+    """Word boundaries of one utterance as (audio offset in seconds, text offset), in audio order"""
+
     def __init__(self):
-        self.events = []
+        self.offsets: List[Tuple[float, int]] = []
 
     def add(self, event):
-        self.events.append(
-            {
-                "text": event.text,
-                "text_offset": event.text_offset,
-                "audio_offset": (event.audio_offset + 5000) / (10000 * 1000),
-                "boudary_type": event.boundary_type,
-            }
+        offset = ((event.audio_offset + 5000) / (10000 * 1000), event.text_offset)
+        # Azure sends boundaries in order, so this appends; one list keeps the
+        # pairs consistent for lookups from the event loop while the SDK's thread adds
+        if not self.offsets or offset >= self.offsets[-1]:
+            self.offsets.append(offset)
+        else:
+            bisect.insort(self.offsets, offset)
+
+    def get_text_offset_after(self, seconds: float) -> Optional[int]:
+        """Text offset of the first word that starts after seconds of audio"""
+        index = bisect.bisect_right(self.offsets, (seconds, math.inf))
+        if index == len(self.offsets):
+            return None
+        return self.offsets[index][1]
+
+
+def create_speech_config(
+    synthesizer_config: AzureSynthesizerConfig,
+    azure_speech_key: str,
+    azure_speech_region: str,
+) -> speechsdk.SpeechConfig:
+    speech_config = speechsdk.SpeechConfig(
+        subscription=azure_speech_key, region=azure_speech_region
+    )
+    if synthesizer_config.audio_encoding == AudioEncoding.LINEAR16:
+        if synthesizer_config.sampling_rate == 44100:
+            speech_config.set_speech_synthesis_output_format(
+                speechsdk.SpeechSynthesisOutputFormat.Raw44100Hz16BitMonoPcm
+            )
+        if synthesizer_config.sampling_rate == 48000:
+            speech_config.set_speech_synthesis_output_format(
+                speechsdk.SpeechSynthesisOutputFormat.Raw48Khz16BitMonoPcm
+            )
+        if synthesizer_config.sampling_rate == 24000:
+            speech_config.set_speech_synthesis_output_format(
+                speechsdk.SpeechSynthesisOutputFormat.Raw24Khz16BitMonoPcm
+            )
+        elif synthesizer_config.sampling_rate == 16000:
+            speech_config.set_speech_synthesis_output_format(
+                speechsdk.SpeechSynthesisOutputFormat.Raw16Khz16BitMonoPcm
+            )
+        elif synthesizer_config.sampling_rate == 8000:
+            speech_config.set_speech_synthesis_output_format(
+                speechsdk.SpeechSynthesisOutputFormat.Raw8Khz16BitMonoPcm
+            )
+    elif synthesizer_config.audio_encoding == AudioEncoding.MULAW:
+        speech_config.set_speech_synthesis_output_format(
+            speechsdk.SpeechSynthesisOutputFormat.Raw8Khz8BitMonoMULaw
         )
+    return speech_config
+
+
+class AzureSpeechSynthesizerClient:
+    """A speechsdk.SpeechSynthesizer whose connection is opened before its first request"""
 
-    def get_events_sorted(self):
-        return sorted(self.events, key=lambda event: event["audio_offset"])
+    def __init__(self, speech_config: speechsdk.SpeechConfig):
+        self.synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=speech_config, audio_config=None
+        )
+        self.is_disconnected = False
+        self.connection = speechsdk.Connection.from_speech_synthesizer(self.synthesizer)
+        self.connection.disconnected.connect(self.on_disconnected)
+        self.connection.open(True)
+
+    def on_disconnected(self, event):
+        self.is_disconnected = True
+
+    def is_healthy(self) -> bool:
+        return not self.is_disconnected
+
+    def reset(self):
+        # stops audio the previous conversation didn't play and drops its callbacks;
+        # waits for the stop so it can't land on the next conversation's speech
+        self.synthesizer.stop_speaking_async().get()
+        self.synthesizer.synthesis_word_boundary.disconnect_all()
 
 
 class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
@@ -64,6 +160,7 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         azure_speech_key: Optional[str] = None,
         azure_speech_region: Optional[str] = None,
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
+        client_pool: Optional[ClientPool] = None,
     ):
         super().__init__(synthesizer_config, aiohttp_session)
         # Instantiates a client
@@ -77,44 +174,93 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
             raise ValueError(
                 "Please set AZURE_SPEECH_REGION environment variable or pass it as a parameter"
             )
-        speech_config = speechsdk.SpeechConfig(
-            subscription=azure_speech_key, region=azure_speech_region
-        )
-        if self.synthesizer_config.audio_encoding == AudioEncoding.LINEAR16:
-            if self.synthesizer_config.sampling_rate == 44100:
-                speech_config.set_speech_synthesis_output_format(
-                    speechsdk.SpeechSynthesisOutputFormat.Raw44100Hz16BitMonoPcm
-                )
-            if self.synthesizer_config.sampling_rate == 48000:
-                speech_config.set_speech_synthesis_output_format(
-                    speechsdk.SpeechSynthesisOutputFormat.Raw48Khz16BitMonoPcm
-                )
-            if self.synthesizer_config.sampling_rate == 24000:
-                speech_config.set_speech_synthesis_output_format(
-                    speechsdk.SpeechSynthesisOutputFormat.Raw24Khz16BitMonoPcm
-                )
-            elif self.synthesizer_config.sampling_rate == 16000:
-                speech_config.set_speech_synthesis_output_format(
-                    speechsdk.SpeechSynthesisOutputFormat.Raw16Khz16BitMonoPcm
-                )
-            elif self.synthesizer_config.sampling_rate == 8000:
-                speech_config.set_speech_synthesis_output_format(
-                    speechsdk.SpeechSynthesisOutputFormat.Raw8Khz16BitMonoPcm
-                )
-        elif self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            speech_config.set_speech_synthesis_output_format(
-                speechsdk.SpeechSynthesisOutputFormat.Raw8Khz8BitMonoMULaw
-            )
-        self.synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=speech_config, audio_config=None
+        self.azure_speech_key = azure_speech_key
+        self.azure_speech_region = azure_speech_region
+        self.client_pool = client_pool or get_client_pool()
+        # the synthesizer's connection stays open for the next conversation with the same output format
+        self.client_key = (
+            "azure_speech_synthesizer",
+            azure_speech_key,
+            azure_speech_region,
+            self.synthesizer_config.audio_encoding,
+            self.synthesizer_config.sampling_rate,
         )
+        self.client = self.checkout_client()
+        self.synthesizer = self.client.synthesizer
+        # a client synthesizes one utterance at a time, so concurrent utterances
+        # (e.g. prefetched ones) check out more clients
+        self.clients: List[AzureSpeechSynthesizerClient] = [self.client]
+        self.idle_clients: List[AzureSpeechSynthesizerClient] = [self.client]
+        # clients whose utterance is still being read, with the event that stops it
+        self.stop_events: Dict[AzureSpeechSynthesizerClient, threading.Event] = {}
+        self.is_client_checked_in = False
 
         self.voice_name = self.synthesizer_config.voice_name
         self.pitch = self.synthesizer_config.pitch
         self.rate = self.synthesizer_config.rate
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.thread_pool_executor = get_synthesis_executor()
         self.logger = logger or logging.getLogger(__name__)
 
+    def checkout_client(self) -> AzureSpeechSynthesizerClient:
+        return self.client_pool.checkout(
+            self.client_key,
+            lambda: AzureSpeechSynthesizerClient(
+                create_speech_config(
+                    self.synthesizer_config,
+                    self.azure_speech_key,
+                    self.azure_speech_region,
+                )
+            ),
+            is_healthy=AzureSpeechSynthesizerClient.is_healthy,
+        )
+
+    def checkin_client(self, client: AzureSpeechSynthesizerClient):
+        client.reset()
+        self.client_pool.checkin(
+            self.client_key,
+            client,
+            is_healthy=AzureSpeechSynthesizerClient.is_healthy,
+        )
+
+    async def acquire_client(self) -> AzureSpeechSynthesizerClient:
+        if self.idle_clients:
+            return self.idle_clients.pop()
+        # checking out might have to open a new connection; the default executor keeps
+        # that from queueing behind the streams holding the synthesis executor's threads
+        client = await asyncio.get_running_loop().run_in_executor(
+            None, self.checkout_client
+        )
+        self.clients.append(client)
+        return client
+
+    def release_client(self, client: AzureSpeechSynthesizerClient):
+        """Called on the event loop once the client's reader thread has exited"""
+        stop_event = self.stop_events.pop(client)
+        loop = asyncio.get_running_loop()
+        if stop_event.is_set():
+            # the utterance was stopped: wait for the stop to land before the client
+            # synthesizes anything else, or it would cut that off instead
+            stop_future = loop.run_in_executor(
+                None, lambda: client.synthesizer.stop_speaking_async().get()
+            )
+            stop_future.add_done_callback(lambda _: self.return_client(client))
+        else:
+            self.return_client(client)
+
+    def return_client(self, client: AzureSpeechSynthesizerClient):
+        if self.is_client_checked_in:
+            # the conversation ended while this client was streaming
+            asyncio.get_running_loop().run_in_executor(
+                None, self.checkin_client, client
+            )
+        else:
+            self.idle_clients.append(client)
+
+    def stop_streaming(self, client: AzureSpeechSynthesizerClient):
+        # stopping also unblocks the reader thread if it's waiting on Azure
+        self.stop_events[client].set()
+        client.synthesizer.stop_speaking_async()
+
     async def get_phrase_filler_audios(self) -> List[FillerAudio]:
         filler_phrase_audios = []
         for filler_phrase in FILLER_PHRASES:
@@ -200,13 +346,41 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         prosody.text = message.strip()
         return ElementTree.tostring(ssml_root, encoding="unicode")
 
-    def synthesize_ssml(self, ssml: str) -> speechsdk.AudioDataStream:
-        result = self.synthesizer.start_speaking_ssml_async(ssml).get()
+    def synthesize_ssml(
+        self, ssml: str, synthesizer: Optional[speechsdk.SpeechSynthesizer] = None
+    ) -> speechsdk.AudioDataStream:
+        synthesizer = synthesizer or self.synthesizer
+        result = synthesizer.start_speaking_ssml_async(ssml).get()
         return speechsdk.AudioDataStream(result)
 
+    def stream_ssml(
+        self,
+        ssml: str,
+        synthesizer: speechsdk.SpeechSynthesizer,
+        chunk_size: int,
+        send_chunk: Callable[[bytes, bool], None],
+        stop_event: threading.Event,
+        word_boundary_event_pool: WordBoundaryEventPool,
+    ):
+        """Runs on the synthesis executor, handing chunks to send_chunk as Azure returns them"""
+        # the synthesizer is this utterance's alone until it's released, so its
+        # handlers can be dropped wholesale when the utterance ends
+        synthesizer.synthesis_word_boundary.connect(
+            lambda event: self.word_boundary_cb(event, word_boundary_event_pool)
+        )
+        try:
+            audio_data_stream = self.synthesize_ssml(ssml, synthesizer)
+            while not stop_event.is_set():
+                chunk = read_chunk(audio_data_stream, chunk_size)
+                is_last_chunk = len(chunk) < chunk_size
+                send_chunk(chunk, is_last_chunk)
+                if is_last_chunk:
+                    return
+        finally:
+            synthesizer.synthesis_word_boundary.disconnect_all()
+
     def ready_synthesizer(self):
-        connection = speechsdk.Connection.from_speech_synthesizer(self.synthesizer)
-        connection.open(True)
+        self.client.connection.open(True)
 
     # given the number of seconds the message was allowed to go until, where did we get in the message?
     def get_message_up_to(
@@ -216,13 +390,12 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         seconds: int,
         word_boundary_event_pool: WordBoundaryEventPool,
     ) -> str:
-        events = word_boundary_event_pool.get_events_sorted()
-        for event in events:
-            if event["audio_offset"] > seconds:
-                ssml_fragment = ssml[: event["text_offset"]]
-                # TODO: this is a little hacky, but it works for now
-                return ssml_fragment.split(">")[-1]
-        return message
+        text_offset = word_boundary_event_pool.get_text_offset_after(seconds)
+        if text_offset is None:
+            return message
+        ssml_fragment = ssml[:text_offset]
+        # TODO: this is a little hacky, but it works for now
+        return ssml_fragment.split(">")[-1]
 
     async def create_speech(
         self,
@@ -230,8 +403,6 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         chunk_size: int,
         bot_sentiment: Optional[BotSentiment] = None,
     ) -> SynthesisResult:
-        # offset = int(self.OFFSET_MS * (self.synthesizer_config.sampling_rate / 1000))
-        offset = 0
         self.logger.debug(f"Synthesizing message: {message}")
 
         # Azure will return no audio for certain strings like "-", "[-", and "!"
@@ -243,50 +414,67 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
                 lambda _: message.text,
             )
 
-        async def chunk_generator(
-            audio_data_stream: speechsdk.AudioDataStream, chunk_transform=lambda x: x
-        ):
-            audio_buffer = bytes(chunk_size)
-            while not audio_data_stream.can_read_data(chunk_size):
-                await asyncio.sleep(0)
-            filled_size = audio_data_stream.read_data(audio_buffer)
-            if filled_size != chunk_size:
-                yield SynthesisResult.ChunkResult(
-                    chunk_transform(audio_buffer[offset:]), True
-                )
-                return
-            else:
-                yield SynthesisResult.ChunkResult(
-                    chunk_transform(audio_buffer[offset:]), False
-                )
-            while True:
-                filled_size = audio_data_stream.read_data(audio_buffer)
-                if filled_size != chunk_size:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(audio_buffer[: filled_size - offset]), True
-                    )
-                    break
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
-
+        client = await self.acquire_client()
         word_boundary_event_pool = WordBoundaryEventPool()
-        self.synthesizer.synthesis_word_boundary.connect(
-            lambda event: self.word_boundary_cb(event, word_boundary_event_pool)
-        )
         ssml = (
             message.ssml
             if isinstance(message, SSMLMessage)
             else self.create_ssml(message.text, bot_sentiment=bot_sentiment)
         )
-        audio_data_stream = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.synthesize_ssml, ssml
+
+        # synthesis starts now rather than when the chunks are first awaited,
+        # so prefetched utterances are ready by the time they're played
+        loop = asyncio.get_running_loop()
+        chunk_queue: asyncio.Queue[
+            Union[Tuple[bytes, bool], BaseException]
+        ] = asyncio.Queue()
+        stop_event = threading.Event()
+        self.stop_events[client] = stop_event
+        stream_future = loop.run_in_executor(
+            self.thread_pool_executor,
+            self.stream_ssml,
+            ssml,
+            client.synthesizer,
+            chunk_size,
+            lambda chunk, is_last_chunk: loop.call_soon_threadsafe(
+                chunk_queue.put_nowait, (chunk, is_last_chunk)
+            ),
+            stop_event,
+            word_boundary_event_pool,
         )
+
+        def on_stream_done(future: asyncio.Future):
+            if not future.cancelled():
+                exception = future.exception()
+                if exception is not None:
+                    chunk_queue.put_nowait(exception)
+            self.release_client(client)
+
+        stream_future.add_done_callback(on_stream_done)
+
+        async def chunk_generator(chunk_transform=lambda x: x):
+            try:
+                while True:
+                    item = await chunk_queue.get()
+                    if isinstance(item, BaseException):
+                        raise item
+                    chunk, is_last_chunk = item
+                    yield SynthesisResult.ChunkResult(
+                        chunk_transform(chunk), is_last_chunk
+                    )
+                    if is_last_chunk:
+                        return
+            finally:
+                if not stream_future.done():
+                    # interrupted, free up the executor thread that's reading the stream
+                    self.stop_streaming(client)
+
         if self.synthesizer_config.should_encode_as_wav:
             output_generator = chunk_generator(
-                audio_data_stream,
                 lambda chunk: encode_as_wav(chunk, self.synthesizer_config),
             )
         else:
-            output_generator = chunk_generator(audio_data_stream)
+            output_generator = chunk_generator()
 
         return SynthesisResult(
             output_generator,
@@ -294,3 +482,20 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
                 message.text, ssml, seconds, word_boundary_event_pool
             ),
         )
+
+    async def tear_down(self):
+        await super().tear_down()
+        if self.is_client_checked_in:
+            return
+        self.is_client_checked_in = True
+        # clients still streaming are checked in by release_client once their reader exits
+        for client in list(self.stop_events):
+            self.stop_streaming(client)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(None, self.checkin_client, client)
+                for client in self.idle_clients
+            ]
+        )
+        self.idle_clients = []
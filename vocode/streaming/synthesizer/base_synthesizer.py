@@ -7,14 +7,15 @@ from typing import (
     Generic,
     List,
     Optional,
+    Tuple,
     TypeVar,
+    Union,
 )
+from functools import lru_cache
 import math
-import io
-import wave
+import re
+import struct
 import aiohttp
-from nltk.tokenize import word_tokenize
-from nltk.tokenize.treebank import TreebankWordDetokenizer
 from opentelemetry import trace
 
 from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
@@ -38,16 +39,65 @@ FILLER_AUDIO_PATH = os.path.join(os.path.dirname(__file__), "filler_audio")
 TYPING_NOISE_PATH = "%s/typing-noise.wav" % FILLER_AUDIO_PATH
 
 
-def encode_as_wav(chunk: bytes, synthesizer_config: SynthesizerConfig) -> bytes:
-    output_bytes_io = io.BytesIO()
-    in_memory_wav = wave.open(output_bytes_io, "wb")
-    in_memory_wav.setnchannels(1)
+# chunks are bytes, or memoryviews into the synthesized audio so chunking doesn't copy it
+Chunk = Union[bytes, memoryview]
+
+
+@lru_cache(maxsize=64)
+def get_wav_header(sampling_rate: int, num_bytes: int) -> bytes:
+    """The header wave writes for num_bytes of mono 16-bit PCM"""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + num_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,  # size of the fmt chunk
+        1,  # PCM
+        1,  # mono
+        sampling_rate,
+        sampling_rate * 2,  # bytes per second
+        2,  # bytes per frame
+        16,  # bits per sample
+        b"data",
+        num_bytes,
+    )
+
+
+def encode_as_wav(chunk: Chunk, synthesizer_config: SynthesizerConfig) -> bytes:
     assert synthesizer_config.audio_encoding == AudioEncoding.LINEAR16
-    in_memory_wav.setsampwidth(2)
-    in_memory_wav.setframerate(synthesizer_config.sampling_rate)
-    in_memory_wav.writeframes(chunk)
-    output_bytes_io.seek(0)
-    return output_bytes_io.read()
+    return get_wav_header(synthesizer_config.sampling_rate, len(chunk)) + chunk
+
+
+def get_wav_data(audio: Chunk) -> memoryview:
+    """A view of the samples in an in-memory WAV; headerless audio is returned as is"""
+    audio_view = memoryview(audio)
+    if audio_view[:4] != b"RIFF" or audio_view[8:12] != b"WAVE":
+        return audio_view
+    offset = 12
+    while offset + 8 <= len(audio_view):
+        chunk_id = audio_view[offset : offset + 4]
+        (chunk_length,) = struct.unpack("<I", audio_view[offset + 4 : offset + 8])
+        offset += 8
+        if chunk_id == b"data":
+            # streamed WAVs can leave the length unset, so never read past the end
+            return audio_view[offset : offset + chunk_length]
+        offset += chunk_length + (chunk_length & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def get_word_end_offsets(text: str) -> List[int]:
+    """Character offset at which each whitespace-separated word of text ends"""
+    return [match.end() for match in re.finditer(r"\S+", text)]
+
+
+def split_into_chunks(
+    audio_data: Chunk, chunk_size: int
+) -> Generator[Tuple[memoryview, bool], None, None]:
+    """Yields views of chunk_size bytes of audio_data and whether each is the last one"""
+    audio_view = memoryview(audio_data)
+    for i in range(0, len(audio_data), chunk_size):
+        yield audio_view[i : i + chunk_size], i + chunk_size >= len(audio_data)
 
 
 tracer = trace.get_tracer(__name__)
@@ -55,7 +105,7 @@ tracer = trace.get_tracer(__name__)
 
 class SynthesisResult:
     class ChunkResult:
-        def __init__(self, chunk: bytes, is_last_chunk: bool):
+        def __init__(self, chunk: Chunk, is_last_chunk: bool):
             self.chunk = chunk
             self.is_last_chunk = is_last_chunk
 
@@ -83,6 +133,13 @@ class FillerAudio:
         self.is_interruptible = is_interruptible
         self.seconds_per_chunk = seconds_per_chunk
 
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.audio_data) / get_chunk_size_per_second(
+            self.synthesizer_config.audio_encoding,
+            self.synthesizer_config.sampling_rate,
+        )
+
     def create_synthesis_result(self) -> SynthesisResult:
         chunk_size = (
             get_chunk_size_per_second(
@@ -93,15 +150,8 @@ class FillerAudio:
         )
 
         async def chunk_generator(chunk_transform=lambda x: x):
-            for i in range(0, len(self.audio_data), chunk_size):
-                if i + chunk_size > len(self.audio_data):
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(self.audio_data[i:]), True
-                    )
-                else:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(self.audio_data[i : i + chunk_size]), False
-                    )
+            for chunk, is_last_chunk in split_into_chunks(self.audio_data, chunk_size):
+                yield SynthesisResult.ChunkResult(chunk_transform(chunk), is_last_chunk)
 
         if self.synthesizer_config.should_encode_as_wav:
             output_generator = chunk_generator(
@@ -112,6 +162,15 @@ class FillerAudio:
         return SynthesisResult(output_generator, lambda seconds: self.message.text)
 
 
+@lru_cache(maxsize=None)
+def load_typing_noise(sampling_rate: int, audio_encoding: AudioEncoding) -> bytes:
+    return convert_wav(
+        TYPING_NOISE_PATH,
+        output_sample_rate=sampling_rate,
+        output_encoding=audio_encoding,
+    )
+
+
 SynthesizerConfigType = TypeVar("SynthesizerConfigType", bound=SynthesizerConfig)
 
 
@@ -144,10 +203,9 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
     def get_typing_noise_filler_audio(self) -> FillerAudio:
         return FillerAudio(
             message=BaseMessage(text="<typing noise>"),
-            audio_data=convert_wav(
-                TYPING_NOISE_PATH,
-                output_sample_rate=self.synthesizer_config.sampling_rate,
-                output_encoding=self.synthesizer_config.audio_encoding,
+            audio_data=load_typing_noise(
+                self.synthesizer_config.sampling_rate,
+                self.synthesizer_config.audio_encoding,
             ),
             synthesizer_config=self.synthesizer_config,
             is_interruptible=True,
@@ -179,13 +237,29 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
         estimated_output_seconds_per_char = estimated_output_seconds / len(message.text)
         return message.text[: int(seconds / estimated_output_seconds_per_char)]
 
+    def create_message_cutoff_from_voice_speed(
+        self, message: BaseMessage, words_per_minute: int
+    ) -> Callable[[float], str]:
+        """Splits the message into words once, so each lookup while it plays is just an index"""
+        word_end_offsets = get_word_end_offsets(message.text)
+        words_per_second = words_per_minute / 60
+
+        def get_message_cutoff(seconds: float) -> str:
+            estimated_words_spoken = math.floor(words_per_second * seconds)
+            if estimated_words_spoken <= 0:
+                return ""
+            if estimated_words_spoken >= len(word_end_offsets):
+                return message.text
+            return message.text[: word_end_offsets[estimated_words_spoken - 1]]
+
+        return get_message_cutoff
+
     def get_message_cutoff_from_voice_speed(
         self, message: BaseMessage, seconds: int, words_per_minute: int
     ) -> str:
-        words_per_second = words_per_minute / 60
-        estimated_words_spoken = math.floor(words_per_second * seconds)
-        tokens = word_tokenize(message.text)
-        return TreebankWordDetokenizer().detokenize(tokens[:estimated_words_spoken])
+        return self.create_message_cutoff_from_voice_speed(message, words_per_minute)(
+            seconds
+        )
 
     # returns a chunk generator and a thunk that can tell you what part of the message was read given the number of seconds spoken
     # chunk generator must return a ChunkResult, essentially a tuple (bytes of size chunk_size, flag if it is the last chunk)
@@ -206,7 +280,14 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
             output_sample_rate=self.synthesizer_config.sampling_rate,
             output_encoding=self.synthesizer_config.audio_encoding,
         )
+        return self.create_synthesis_result_from_audio(
+            output_bytes, message, chunk_size
+        )
 
+    # @param output_bytes - audio already in the synthesizer config's encoding and sampling rate
+    def create_synthesis_result_from_audio(
+        self, output_bytes: Chunk, message: BaseMessage, chunk_size: int
+    ) -> SynthesisResult:
         if self.synthesizer_config.should_encode_as_wav:
             chunk_transform = lambda chunk: encode_as_wav(
                 chunk, self.synthesizer_config
@@ -215,15 +296,8 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
             chunk_transform = lambda chunk: chunk
 
         async def chunk_generator(output_bytes):
-            for i in range(0, len(output_bytes), chunk_size):
-                if i + chunk_size > len(output_bytes):
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(output_bytes[i:]), True
-                    )
-                else:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(output_bytes[i : i + chunk_size]), False
-                    )
+            for chunk, is_last_chunk in split_into_chunks(output_bytes, chunk_size):
+                yield SynthesisResult.ChunkResult(chunk_transform(chunk), is_last_chunk)
 
         return SynthesisResult(
             chunk_generator(output_bytes),
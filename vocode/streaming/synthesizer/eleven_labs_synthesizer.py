@@ -142,8 +142,8 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
                 self.experimental_streaming_output_generator(
                     response, chunk_size, create_speech_span
                 ),  # should be wav
-                lambda seconds: self.get_message_cutoff_from_voice_speed(
-                    message, seconds, self.words_per_minute
+                self.create_message_cutoff_from_voice_speed(
+                    message, self.words_per_minute
                 ),
             )
         else:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional
 import typing
@@ -16,31 +17,94 @@ from vocode.streaming.models.synthesizer import (
     SynthesizerType,
 )
 from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
-from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
+from vocode.streaming.synthesizer.eleven_labs_synthesizer import (
+    ELEVEN_LABS_BASE_URL,
+    ElevenLabsSynthesizer,
+)
 from vocode.streaming.synthesizer.google_synthesizer import GoogleSynthesizer
 from vocode.streaming.synthesizer.gtts_synthesizer import GTTSSynthesizer
-from vocode.streaming.synthesizer.play_ht_synthesizer import PlayHtSynthesizer
+from vocode.streaming.synthesizer.play_ht_synthesizer import (
+    TTS_ENDPOINT as PLAY_HT_TTS_ENDPOINT,
+    PlayHtSynthesizer,
+)
 from vocode.streaming.synthesizer.rime_synthesizer import RimeSynthesizer
 from vocode.streaming.synthesizer.stream_elements_synthesizer import (
     StreamElementsSynthesizer,
 )
 from vocode.streaming.synthesizer.coqui_tts_synthesizer import CoquiTTSSynthesizer
+from vocode.streaming.utils.client_pool import ClientPool, get_client_pool
+from vocode.streaming.utils.session_pool import (
+    get_shared_session,
+    preopen_connections,
+)
+
+
+def get_synthesizer_base_url(synthesizer_config: SynthesizerConfig) -> Optional[str]:
+    """The HTTP API the synthesizer calls, if it makes its requests with aiohttp"""
+    if isinstance(synthesizer_config, ElevenLabsSynthesizerConfig):
+        return ELEVEN_LABS_BASE_URL
+    elif isinstance(synthesizer_config, PlayHtSynthesizerConfig):
+        return PLAY_HT_TTS_ENDPOINT
+    elif isinstance(synthesizer_config, RimeSynthesizerConfig):
+        return synthesizer_config.base_url
+    elif isinstance(synthesizer_config, StreamElementsSynthesizerConfig):
+        return StreamElementsSynthesizer.TTS_ENDPOINT
+    return None
 
 
 class SynthesizerFactory:
+    def __init__(
+        self,
+        client_pool: Optional[ClientPool] = None,
+        use_shared_sessions: bool = True,
+    ):
+        self.client_pool = client_pool or get_client_pool()
+        # synthesizers share keep-alive sessions per provider instead of opening their own
+        self.use_shared_sessions = use_shared_sessions
+
+    def get_aiohttp_session(
+        self, synthesizer_config: SynthesizerConfig
+    ) -> Optional[aiohttp.ClientSession]:
+        base_url = get_synthesizer_base_url(synthesizer_config)
+        if not self.use_shared_sessions or base_url is None:
+            return None
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # shared sessions are per loop, the synthesizer opens its own
+            return None
+        return get_shared_session(base_url)
+
+    async def preopen_connections(
+        self, synthesizer_config: SynthesizerConfig, num_connections: int = 1
+    ) -> int:
+        base_url = get_synthesizer_base_url(synthesizer_config)
+        if not self.use_shared_sessions or base_url is None:
+            return 0
+        return await preopen_connections(base_url, num_connections)
+
     def create_synthesizer(
         self,
         synthesizer_config: SynthesizerConfig,
         logger: Optional[logging.Logger] = None,
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
     ):
+        aiohttp_session = aiohttp_session or self.get_aiohttp_session(
+            synthesizer_config
+        )
         if isinstance(synthesizer_config, GoogleSynthesizerConfig):
             return GoogleSynthesizer(
-                synthesizer_config, logger=logger, aiohttp_session=aiohttp_session
+                synthesizer_config,
+                logger=logger,
+                aiohttp_session=aiohttp_session,
+                client_pool=self.client_pool,
             )
         elif isinstance(synthesizer_config, AzureSynthesizerConfig):
             return AzureSynthesizer(
-                synthesizer_config, logger=logger, aiohttp_session=aiohttp_session
+                synthesizer_config,
+                logger=logger,
+                aiohttp_session=aiohttp_session,
+                client_pool=self.client_pool,
             )
         elif isinstance(synthesizer_config, ElevenLabsSynthesizerConfig):
             return ElevenLabsSynthesizer(
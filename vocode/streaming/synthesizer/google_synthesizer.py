@@ -1,9 +1,4 @@
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-import io
 import logging
-import os
-import wave
 from typing import Any, Optional
 import aiohttp
 
@@ -14,12 +9,12 @@ from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.synthesizer.base_synthesizer import (
     BaseSynthesizer,
     SynthesisResult,
-    encode_as_wav,
+    get_wav_data,
     tracer,
 )
 from vocode.streaming.models.synthesizer import GoogleSynthesizerConfig, SynthesizerType
 from vocode.streaming.models.audio_encoding import AudioEncoding
-from vocode.streaming.utils import convert_wav
+from vocode.streaming.utils.client_pool import ClientPool, get_client_pool
 
 from opentelemetry.context.context import Context
 
@@ -30,6 +25,7 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
         synthesizer_config: GoogleSynthesizerConfig,
         logger: Optional[logging.Logger] = None,
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
+        client_pool: Optional[ClientPool] = None,
     ):
         super().__init__(synthesizer_config, aiohttp_session)
 
@@ -39,9 +35,7 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
         google.auth.default()
 
         self.tts = tts
-
-        # Instantiates a client
-        self.client = tts.TextToSpeechClient()
+        self.client_pool = client_pool or get_client_pool()
 
         # Build the voice request, select the language code ("en-US") and the ssml
         # voice gender ("neutral")
@@ -50,22 +44,32 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
             name=synthesizer_config.voice_name,
         )
 
-        # Select the type of audio file you want returned
+        # Google renders the conversation's own encoding and sampling rate, so the
+        # audio can be sent as is
         self.audio_config = tts.AudioConfig(
-            audio_encoding=tts.AudioEncoding.LINEAR16,
-            sample_rate_hertz=24000,
+            audio_encoding=tts.AudioEncoding.MULAW
+            if synthesizer_config.audio_encoding == AudioEncoding.MULAW
+            else tts.AudioEncoding.LINEAR16,
+            sample_rate_hertz=synthesizer_config.sampling_rate,
             speaking_rate=synthesizer_config.speaking_rate,
             pitch=synthesizer_config.pitch,
             effects_profile_id=["telephony-class-application"],
         )
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
 
-    def synthesize(self, message: str) -> Any:
+    def get_client(self) -> Any:
+        # the client's gRPC channel is shared by every conversation on this event loop
+        return self.client_pool.get_loop_client(
+            "google_text_to_speech_async",
+            self.tts.TextToSpeechAsyncClient,
+            close=lambda client: client.transport.close(),
+        )
+
+    async def synthesize(self, message: str) -> Any:
         synthesis_input = self.tts.SynthesisInput(text=message)
 
         # Perform the text-to-speech request on the text input with the selected
         # voice parameters and audio file type
-        return self.client.synthesize_speech(
+        return await self.get_client().synthesize_speech(
             request=self.tts.SynthesizeSpeechRequest(
                 input=synthesis_input,
                 voice=self.voice,
@@ -76,7 +80,6 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
             )
         )
 
-    # TODO: make this nonblocking, see speech.TextToSpeechAsyncClient
     async def create_speech(
         self,
         message: BaseMessage,
@@ -86,29 +89,11 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
         create_speech_span = tracer.start_span(
             f"synthesizer.{SynthesizerType.GOOGLE.value.split('_', 1)[-1]}.create_total",
         )
-        response: self.tts.SynthesizeSpeechResponse = (  # type: ignore
-            await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor, self.synthesize, message.text
-            )
+        response: self.tts.SynthesizeSpeechResponse = await self.synthesize(  # type: ignore
+            message.text
         )
         create_speech_span.end()
-        convert_span = tracer.start_span(
-            f"synthesizer.{SynthesizerType.GOOGLE.value.split('_', 1)[-1]}.convert",
-        )
-        output_sample_rate = response.audio_config.sample_rate_hertz
-
-        output_bytes_io = io.BytesIO()
-        in_memory_wav = wave.open(output_bytes_io, "wb")
-        in_memory_wav.setnchannels(1)
-        in_memory_wav.setsampwidth(2)
-        in_memory_wav.setframerate(output_sample_rate)
-        in_memory_wav.writeframes(response.audio_content)
-        output_bytes_io.seek(0)
-
-        result = self.create_synthesis_result_from_wav(
-            file=output_bytes_io,
-            message=message,
-            chunk_size=chunk_size,
+        # LINEAR16 and MULAW responses come with a WAV header
+        return self.create_synthesis_result_from_audio(
+            get_wav_data(response.audio_content), message, chunk_size
         )
-        convert_span.end()
-        return result
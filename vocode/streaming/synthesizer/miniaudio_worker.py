@@ -6,8 +6,9 @@ import asyncio
 import miniaudio
 
 from vocode.streaming.models.synthesizer import SynthesizerConfig
-from vocode.streaming.utils import convert_wav
-from vocode.streaming.utils.mp3_helper import decode_mp3
+from vocode.streaming.utils import convert_linear_audio
+from vocode.streaming.utils.mp3_helper import MP3_DECODE_SAMPLE_RATE, decode_mp3_samples
+from vocode.streaming.utils.resampler import Resampler
 from vocode.streaming.utils.worker import ThreadAsyncWorker, logger
 
 
@@ -25,11 +26,23 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
         self.chunk_size = chunk_size
         self._ended = False
 
+    def convert_samples(self, samples: bytes) -> bytes:
+        return convert_linear_audio(
+            samples,
+            input_sample_rate=self.synthesizer_config.sampling_rate,
+            output_sample_rate=self.synthesizer_config.sampling_rate,
+            output_encoding=self.synthesizer_config.audio_encoding,
+        )
+
     def _run_loop(self):
         # tracks the mp3 so far
         current_mp3_buffer = bytearray()
-        # tracks the wav so far
-        current_wav_buffer = bytearray()
+        # how much of the decoded mp3 has already been resampled
+        num_decoded_bytes = 0
+        # resamples only the newly decoded audio, carrying the filter state across chunks
+        resampler = Resampler(
+            MP3_DECODE_SAMPLE_RATE, self.synthesizer_config.sampling_rate
+        )
         # the leftover chunks of the wav that haven't been sent to the output queue yet
         current_wav_output_buffer = bytearray()
         while not self._ended:
@@ -40,7 +53,10 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                 continue
             if mp3_chunk is None:
                 current_mp3_buffer.clear()
-                current_wav_buffer.clear()
+                num_decoded_bytes = 0
+                current_wav_output_buffer.extend(
+                    self.convert_samples(resampler.flush())
+                )
                 self.output_janus_queue.sync_q.put(
                     (bytes(current_wav_output_buffer), True)
                 )
@@ -48,7 +64,7 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                 continue
             try:
                 current_mp3_buffer.extend(mp3_chunk)
-                output_bytes = decode_mp3(bytes(current_mp3_buffer))
+                decoded_samples = decode_mp3_samples(bytes(current_mp3_buffer))
             except miniaudio.DecodeError as e:
                 # TODO: better logging
                 logger.exception("MiniaudioWorker error: " + str(e), exc_info=True)
@@ -56,17 +72,13 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                     (bytes(current_wav_output_buffer), True)
                 )  # sentinel
                 continue
-            converted_output_bytes = convert_wav(
-                output_bytes,
-                output_sample_rate=self.synthesizer_config.sampling_rate,
-                output_encoding=self.synthesizer_config.audio_encoding,
+            new_samples = decoded_samples[num_decoded_bytes:]
+            num_decoded_bytes = len(decoded_samples)
+            current_wav_output_buffer.extend(
+                self.convert_samples(resampler.resample(new_samples))
             )
-            # take the difference between the current_wav_buffer and the converted_output_bytes
-            # and put the difference in the output buffer
-            new_bytes = converted_output_bytes[len(current_wav_buffer) :]
-            current_wav_output_buffer.extend(new_bytes)
 
-            # chunk up new_bytes in chunks of chunk_size bytes, but keep the last chunk (less than chunk size) in the wav output buffer
+            # chunk up the new audio in chunks of chunk_size bytes, but keep the last chunk (less than chunk size) in the wav output buffer
             output_buffer_idx = 0
             while output_buffer_idx < len(current_wav_output_buffer) - self.chunk_size:
                 chunk = current_wav_output_buffer[
@@ -78,7 +90,6 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                 output_buffer_idx += self.chunk_size
 
             current_wav_output_buffer = current_wav_output_buffer[output_buffer_idx:]
-            current_wav_buffer.extend(new_bytes)
 
     def terminate(self):
         self._ended = True
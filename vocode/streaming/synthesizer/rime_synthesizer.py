@@ -1,4 +1,3 @@
-import audioop
 import logging
 import aiohttp
 from pydub import AudioSegment
@@ -20,6 +20,7 @@ from vocode.streaming.telephony.config_manager.base_config_manager import (
     BaseConfigManager,
 )
 from vocode.streaming.telephony.constants import DEFAULT_SAMPLING_RATE
+from vocode.streaming.telephony.preconnect_registry import PreconnectedPipeline
 from vocode.streaming.streaming_conversation import StreamingConversation
 from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils.events_manager import EventsManager
@@ -47,6 +48,7 @@ class Call(StreamingConversation[TelephonyOutputDeviceType]):
         agent_factory: AgentFactory = AgentFactory(),
         synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
         events_manager: Optional[EventsManager] = None,
+        preconnected_pipeline: Optional[PreconnectedPipeline] = None,
         logger: Optional[logging.Logger] = None,
     ):
         conversation_id = conversation_id or create_conversation_id()
@@ -59,11 +61,23 @@ class Call(StreamingConversation[TelephonyOutputDeviceType]):
         self.to_phone = to_phone
         self.base_url = base_url
         self.config_manager = config_manager
+        if preconnected_pipeline is not None:
+            transcriber = preconnected_pipeline.transcriber
+            agent = preconnected_pipeline.agent
+            synthesizer = preconnected_pipeline.synthesizer
+        else:
+            transcriber = transcriber_factory.create_transcriber(
+                transcriber_config, logger=logger
+            )
+            agent = agent_factory.create_agent(agent_config, logger=logger)
+            synthesizer = synthesizer_factory.create_synthesizer(
+                synthesizer_config, logger=logger
+            )
         super().__init__(
             output_device,
-            transcriber_factory.create_transcriber(transcriber_config, logger=logger),
-            agent_factory.create_agent(agent_config, logger=logger),
-            synthesizer_factory.create_synthesizer(synthesizer_config, logger=logger),
+            transcriber,
+            agent,
+            synthesizer,
             conversation_id=conversation_id,
             per_chunk_allowance_seconds=0.01,
             events_manager=events_manager,
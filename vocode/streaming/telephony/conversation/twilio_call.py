@@ -8,6 +8,7 @@ from typing import Optional
 from vocode import getenv
 from vocode.streaming.agent.factory import AgentFactory
 from vocode.streaming.models.agent import AgentConfig
+from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.events import PhoneCallConnectedEvent
 
 from vocode.streaming.models.telephony import TwilioConfig
@@ -24,7 +25,9 @@ from vocode.streaming.telephony.config_manager.base_config_manager import (
     BaseConfigManager,
 )
 from vocode.streaming.telephony.conversation.call import Call
+from vocode.streaming.telephony.preconnect_registry import PreconnectedPipeline
 from vocode.streaming.transcriber.factory import TranscriberFactory
+from vocode.streaming.utils.audio_codec import get_silent_chunk
 from vocode.streaming.utils.events_manager import EventsManager
 from vocode.streaming.utils.state_manager import TwilioCallStateManager
 
@@ -50,6 +53,7 @@ class TwilioCall(Call[TwilioOutputDevice]):
         agent_factory: AgentFactory = AgentFactory(),
         synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
         events_manager: Optional[EventsManager] = None,
+        preconnected_pipeline: Optional[PreconnectedPipeline] = None,
         logger: Optional[logging.Logger] = None,
     ):
         super().__init__(
@@ -66,6 +70,7 @@ class TwilioCall(Call[TwilioOutputDevice]):
             transcriber_factory=transcriber_factory,
             agent_factory=agent_factory,
             synthesizer_factory=synthesizer_factory,
+            preconnected_pipeline=preconnected_pipeline,
             logger=logger,
         )
         self.base_url = base_url
@@ -150,8 +155,7 @@ class TwilioCall(Call[TwilioOutputDevice]):
                     int(media["timestamp"]) - (self.latest_media_timestamp + 20)
                 )
                 self.logger.debug(f"Filling {bytes_to_fill} bytes of silence")
-                # NOTE: 0xff is silence for mulaw audio
-                self.receive_audio(b"\xff" * bytes_to_fill)
+                self.receive_audio(get_silent_chunk(AudioEncoding.MULAW, bytes_to_fill))
             self.latest_media_timestamp = int(media["timestamp"])
             self.receive_audio(chunk)
         elif data["event"] == "stop":
@@ -20,6 +20,7 @@ from vocode.streaming.telephony.config_manager.base_config_manager import (
     BaseConfigManager,
 )
 from vocode.streaming.telephony.conversation.call import Call
+from vocode.streaming.telephony.preconnect_registry import PreconnectedPipeline
 from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils.events_manager import EventsManager
 
@@ -48,6 +49,7 @@ class VonageCall(Call[VonageOutputDevice]):
         agent_factory: AgentFactory = AgentFactory(),
         synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
         events_manager: Optional[EventsManager] = None,
+        preconnected_pipeline: Optional[PreconnectedPipeline] = None,
         output_to_speaker: bool = False,
         logger: Optional[logging.Logger] = None,
     ):
@@ -65,6 +67,7 @@ class VonageCall(Call[VonageOutputDevice]):
             transcriber_factory=transcriber_factory,
             agent_factory=agent_factory,
             synthesizer_factory=synthesizer_factory,
+            preconnected_pipeline=preconnected_pipeline,
             logger=logger,
         )
         self.output_to_speaker = output_to_speaker
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from vocode.streaming.agent.base_agent import BaseAgent
+from vocode.streaming.agent.factory import AgentFactory
+from vocode.streaming.models.telephony import BaseCallConfig
+from vocode.streaming.models.transcriber import TranscriberConfig
+from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer
+from vocode.streaming.synthesizer.factory import SynthesizerFactory
+from vocode.streaming.transcriber.base_transcriber import BaseTranscriber
+from vocode.streaming.transcriber.factory import TranscriberFactory
+from vocode.streaming.utils.audio_codec import get_silent_chunk
+from vocode.streaming.utils.conversation_logger_adapter import wrap_logger
+from vocode.streaming.utils.warmup_registry import get_warmup_registry
+
+# the media websocket usually connects within a couple of seconds of the call being answered
+DEFAULT_PRECONNECT_TTL_SECONDS = 30.0
+# streaming transcribers hang up when no audio arrives for a while (Deepgram's sender
+# stops after 5 seconds), so unclaimed pipelines feed them silence more often than that
+DEFAULT_PRECONNECT_KEEPALIVE_INTERVAL_SECONDS = 1.0
+# a claim falls back to building a fresh pipeline rather than holding up the call's media
+DEFAULT_PRECONNECT_WARM_UP_TIMEOUT_SECONDS = 5.0
+
+
+class PreconnectedPipeline:
+    """The transcriber, agent and synthesizer of a call, built before its media websocket connects"""
+
+    def __init__(
+        self,
+        transcriber: BaseTranscriber[TranscriberConfig],
+        agent: BaseAgent,
+        synthesizer: BaseSynthesizer,
+        logger: logging.Logger,
+        keepalive_interval_seconds: float = DEFAULT_PRECONNECT_KEEPALIVE_INTERVAL_SECONDS,
+    ):
+        self.transcriber = transcriber
+        self.agent = agent
+        self.synthesizer = synthesizer
+        self.logger = logger
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        self.warm_up_task: Optional[asyncio.Task] = None
+        self.keepalive_task: Optional[asyncio.Task] = None
+        self.expiry_handle: Optional[asyncio.TimerHandle] = None
+
+    async def keep_transcriber_alive(self):
+        # an idle stream would be closed and restarted, using up the restarts the call
+        # gets for real connection drops before its media has even arrived
+        transcriber_config = self.transcriber.get_transcriber_config()
+        silent_chunk = get_silent_chunk(
+            transcriber_config.audio_encoding, transcriber_config.chunk_size
+        )
+        while True:
+            self.transcriber.send_audio(silent_chunk)
+            await asyncio.sleep(self.keepalive_interval_seconds)
+
+    def stop_keepalive(self):
+        if self.keepalive_task is not None:
+            self.keepalive_task.cancel()
+            self.keepalive_task = None
+
+    async def warm_up(self):
+        # the transcriber handshake and the audio rendering don't depend on each other
+        self.transcriber.start()
+        self.keepalive_task = asyncio.create_task(self.keep_transcriber_alive())
+        results = await asyncio.gather(
+            self.transcriber.ready(),
+            get_warmup_registry().warm_up(
+                self.agent.get_agent_config(), self.synthesizer, logger=self.logger
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Pre-connect warm up failed: {result}")
+
+    async def tear_down(self):
+        if self.warm_up_task is not None:
+            self.warm_up_task.cancel()
+        self.stop_keepalive()
+        self.transcriber.terminate()
+        self.agent.terminate()
+        await self.synthesizer.tear_down()
+
+
+class PreconnectRegistry:
+    """Pipelines of calls that have been answered but whose media websocket hasn't connected yet.
+
+    Pipelines are kept in this process, so the websocket has to land on the process that
+    handled the call webhook to use one; unclaimed pipelines are torn down after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_PRECONNECT_TTL_SECONDS,
+        keepalive_interval_seconds: float = DEFAULT_PRECONNECT_KEEPALIVE_INTERVAL_SECONDS,
+        warm_up_timeout_seconds: float = DEFAULT_PRECONNECT_WARM_UP_TIMEOUT_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        self.warm_up_timeout_seconds = warm_up_timeout_seconds
+        self.pipelines: Dict[str, PreconnectedPipeline] = {}
+
+    def preconnect(
+        self,
+        conversation_id: str,
+        call_config: BaseCallConfig,
+        transcriber_factory: TranscriberFactory = TranscriberFactory(),
+        agent_factory: AgentFactory = AgentFactory(),
+        synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
+        logger: Optional[logging.Logger] = None,
+    ) -> PreconnectedPipeline:
+        conversation_logger: logging.Logger = wrap_logger(
+            logger or logging.getLogger(__name__),
+            conversation_id=conversation_id,
+        )
+        pipeline = PreconnectedPipeline(
+            transcriber_factory.create_transcriber(
+                call_config.transcriber_config, logger=conversation_logger
+            ),
+            agent_factory.create_agent(
+                call_config.agent_config, logger=conversation_logger
+            ),
+            synthesizer_factory.create_synthesizer(
+                call_config.synthesizer_config, logger=conversation_logger
+            ),
+            logger=conversation_logger,
+            keepalive_interval_seconds=self.keepalive_interval_seconds,
+        )
+        pipeline.warm_up_task = asyncio.create_task(pipeline.warm_up())
+        pipeline.expiry_handle = asyncio.get_running_loop().call_later(
+            self.ttl_seconds,
+            lambda: asyncio.create_task(self.discard(conversation_id)),
+        )
+        self.pipelines[conversation_id] = pipeline
+        return pipeline
+
+    async def claim(self, conversation_id: str) -> Optional[PreconnectedPipeline]:
+        """Hands the pipeline over to the call, waiting for whatever warm up is still running.
+
+        Returns None if there's no pipeline or its warm up doesn't finish in time, the
+        call then builds its own.
+        """
+        pipeline = self.pipelines.pop(conversation_id, None)
+        if pipeline is None:
+            return None
+        if pipeline.expiry_handle is not None:
+            pipeline.expiry_handle.cancel()
+        if pipeline.warm_up_task is not None:
+            try:
+                await asyncio.wait_for(
+                    pipeline.warm_up_task, self.warm_up_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                pipeline.logger.warning(
+                    "Pre-connect warm up timed out, tearing down pipeline"
+                )
+                await pipeline.tear_down()
+                return None
+        # the call's media takes over from here
+        pipeline.stop_keepalive()
+        return pipeline
+
+    async def discard(self, conversation_id: str):
+        pipeline = self.pipelines.pop(conversation_id, None)
+        if pipeline is None:
+            return
+        pipeline.logger.debug("Media websocket never connected, tearing down pipeline")
+        await pipeline.tear_down()
+
+
+_preconnect_registry = PreconnectRegistry()
+
+
+def get_preconnect_registry() -> PreconnectRegistry:
+    return _preconnect_registry
@@ -5,6 +5,9 @@ from typing import List, Optional
 from fastapi import APIRouter, Form, Request, Response
 from pydantic import BaseModel, Field
 from vocode.streaming.agent.factory import AgentFactory
+from vocode.streaming.agent.websocket_connection_pool import (
+    close_multiplexed_websocket_pools,
+)
 from vocode.streaming.models.agent import AgentConfig
 from vocode.streaming.models.events import RecordingEvent
 from vocode.streaming.models.synthesizer import SynthesizerConfig
@@ -24,8 +27,12 @@ from vocode.streaming.telephony.constants import (
     VONAGE_SAMPLING_RATE,
 )
 
+from vocode.streaming.telephony.preconnect_registry import get_preconnect_registry
+from vocode.streaming.utils.client_pool import get_client_pool
+from vocode.streaming.utils.session_pool import close_shared_sessions
 from vocode.streaming.telephony.server.router.calls import CallsRouter
 from vocode.streaming.models.telephony import (
+    BaseCallConfig,
     TwilioCallConfig,
     TwilioConfig,
     VonageCallConfig,
@@ -37,6 +44,9 @@ from vocode.streaming.transcriber.base_transcriber import BaseTranscriber
 from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils import create_conversation_id
 from vocode.streaming.utils.events_manager import EventsManager
+from vocode.streaming.utils.warmup_registry import get_warmup_registry
+
+PREOPENED_CONNECTIONS_PER_ROUTE = 2
 
 
 class AbstractInboundCallConfig(BaseModel, abc.ABC):
@@ -70,11 +80,22 @@ class TelephonyServer:
         agent_factory: AgentFactory = AgentFactory(),
         synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
         events_manager: Optional[EventsManager] = None,
+        preconnect_inbound_calls: bool = True,
         logger: Optional[logging.Logger] = None,
     ):
         self.base_url = base_url
         self.logger = logger or logging.getLogger(__name__)
         self.router = APIRouter()
+        self.inbound_call_configs = inbound_call_configs
+        self.transcriber_factory = transcriber_factory
+        self.agent_factory = agent_factory
+        self.synthesizer_factory = synthesizer_factory
+        # builds each inbound call's pipeline while the media websocket is being set up
+        self.preconnect_inbound_calls = preconnect_inbound_calls
+        # renders the inbound agents' audio before the first call comes in
+        self.router.add_event_handler("startup", self.warm_up)
+        # the sessions, clients and connections shared by calls outlive them, so close them with the server
+        self.router.add_event_handler("shutdown", self.close_shared_connections)
         self.config_manager = config_manager
         self.templater = Templater()
         self.events_manager = events_manager
@@ -102,6 +123,60 @@ class TelephonyServer:
         self.router.add_api_route("/recordings/{conversation_id}", self.recordings, methods=["GET", "POST"])
         self.logger.info(f"Set up recordings endpoint at https://{self.base_url}/recordings/{{conversation_id}}")
  
+    async def warm_up(self):
+        warmup_registry = get_warmup_registry()
+        for inbound_call_config in self.inbound_call_configs:
+            synthesizer_config = inbound_call_config.synthesizer_config
+            if synthesizer_config is None:
+                synthesizer_config = (
+                    VonageCallConfig.default_synthesizer_config()
+                    if isinstance(inbound_call_config, VonageInboundCallConfig)
+                    else TwilioCallConfig.default_synthesizer_config()
+                )
+            try:
+                # calls then reuse these connections instead of opening their own
+                await self.synthesizer_factory.preopen_connections(
+                    synthesizer_config, num_connections=PREOPENED_CONNECTIONS_PER_ROUTE
+                )
+                synthesizer = self.synthesizer_factory.create_synthesizer(
+                    synthesizer_config, logger=self.logger
+                )
+                try:
+                    await warmup_registry.warm_up(
+                        inbound_call_config.agent_config, synthesizer, logger=self.logger
+                    )
+                finally:
+                    await synthesizer.tear_down()
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to warm up inbound route {inbound_call_config.url}: {e}"
+                )
+                continue
+            self.logger.info(f"Warmed up inbound route {inbound_call_config.url}")
+
+    async def close_shared_connections(self):
+        await close_shared_sessions()
+        client_pool = get_client_pool()
+        await client_pool.close_loop_clients()
+        client_pool.clear()
+        await close_multiplexed_websocket_pools()
+
+    def preconnect(self, conversation_id: str, call_config: BaseCallConfig):
+        if not self.preconnect_inbound_calls:
+            return
+        try:
+            get_preconnect_registry().preconnect(
+                conversation_id,
+                call_config,
+                transcriber_factory=self.transcriber_factory,
+                agent_factory=self.agent_factory,
+                synthesizer_factory=self.synthesizer_factory,
+                logger=self.logger,
+            )
+        except Exception as e:
+            # the call still connects, it just builds its pipeline when the websocket arrives
+            self.logger.error(f"Failed to pre-connect call {conversation_id}: {e}")
+
     def events(self, request: Request):
         return Response()
 
@@ -135,6 +210,7 @@ class TelephonyServer:
 
             conversation_id = create_conversation_id()
             await self.config_manager.save_config(conversation_id, call_config)
+            self.preconnect(conversation_id, call_config)
             return self.templater.get_connection_twiml(
                 base_url=self.base_url, call_id=conversation_id
             )
@@ -155,6 +231,7 @@ class TelephonyServer:
             )
             conversation_id = create_conversation_id()
             await self.config_manager.save_config(conversation_id, call_config)
+            self.preconnect(conversation_id, call_config)
             return VonageClient.create_call_ncco(
                 base_url=self.base_url, conversation_id=conversation_id, record=vonage_config.record
             )
@@ -16,6 +16,10 @@ from vocode.streaming.telephony.config_manager.base_config_manager import (
 from vocode.streaming.telephony.conversation.call import Call
 from vocode.streaming.telephony.conversation.twilio_call import TwilioCall
 from vocode.streaming.telephony.conversation.vonage_call import VonageCall
+from vocode.streaming.telephony.preconnect_registry import (
+    PreconnectedPipeline,
+    get_preconnect_registry,
+)
 from vocode.streaming.transcriber.factory import TranscriberFactory
 from vocode.streaming.utils.base_router import BaseRouter
 from vocode.streaming.utils.events_manager import EventsManager
@@ -54,6 +58,7 @@ class CallsRouter(BaseRouter):
         agent_factory: AgentFactory = AgentFactory(),
         synthesizer_factory: SynthesizerFactory = SynthesizerFactory(),
         events_manager: Optional[EventsManager] = None,
+        preconnected_pipeline: Optional[PreconnectedPipeline] = None,
     ):
         if isinstance(call_config, TwilioCallConfig):
             return TwilioCall(
@@ -72,6 +77,7 @@ class CallsRouter(BaseRouter):
                 agent_factory=agent_factory,
                 synthesizer_factory=synthesizer_factory,
                 events_manager=events_manager,
+                preconnected_pipeline=preconnected_pipeline,
             )
         elif isinstance(call_config, VonageCallConfig):
             return VonageCall(
@@ -90,6 +96,7 @@ class CallsRouter(BaseRouter):
                 agent_factory=agent_factory,
                 synthesizer_factory=synthesizer_factory,
                 events_manager=events_manager,
+                preconnected_pipeline=preconnected_pipeline,
                 output_to_speaker=call_config.output_to_speaker,
             )
         else:
@@ -101,6 +108,8 @@ class CallsRouter(BaseRouter):
         call_config = await self.config_manager.get_config(id)
         if not call_config:
             raise HTTPException(status_code=400, detail="No active phone call")
+        # built when the call was answered, if this process handled the call webhook
+        preconnected_pipeline = await get_preconnect_registry().claim(id)
 
         call = self._from_call_config(
             base_url=self.base_url,
@@ -111,6 +120,7 @@ class CallsRouter(BaseRouter):
             agent_factory=self.agent_factory,
             synthesizer_factory=self.synthesizer_factory,
             events_manager=self.events_manager,
+            preconnected_pipeline=preconnected_pipeline,
             logger=self.logger,
         )
 
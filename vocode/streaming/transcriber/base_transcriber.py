@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import audioop
 from opentelemetry import trace, metrics
 from typing import Generic, TypeVar, Union
 from vocode.streaming.models.audio_encoding import AudioEncoding
 from vocode.streaming.models.model import BaseModel
 
 from vocode.streaming.models.transcriber import TranscriberConfig
+from vocode.streaming.utils.audio_codec import get_silent_chunk
 from vocode.streaming.utils.worker import AsyncWorker, ThreadAsyncWorker
 
 
@@ -44,12 +44,10 @@ class AbstractTranscriber(Generic[TranscriberConfigType]):
     async def ready(self):
         return True
 
-    def create_silent_chunk(self, chunk_size, sample_width=2):
-        linear_audio = b"\0" * chunk_size
-        if self.get_transcriber_config().audio_encoding == AudioEncoding.LINEAR16:
-            return linear_audio
-        elif self.get_transcriber_config().audio_encoding == AudioEncoding.MULAW:
-            return audioop.lin2ulaw(linear_audio, sample_width)
+    def create_silent_chunk(self, chunk_size):
+        return get_silent_chunk(
+            self.get_transcriber_config().audio_encoding, chunk_size
+        )
 
 
 class BaseAsyncTranscriber(AbstractTranscriber[TranscriberConfigType], AsyncWorker):
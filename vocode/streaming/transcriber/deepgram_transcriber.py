@@ -4,7 +4,6 @@ import logging
 from typing import Optional
 import websockets
 from websockets.client import WebSocketClientProtocol
-import audioop
 from urllib.parse import urlencode
 from vocode import getenv
 
@@ -19,6 +18,7 @@ from vocode.streaming.models.transcriber import (
     EndpointingType,
 )
 from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.utils.resampler import Resampler
 
 
 PUNCTUATION_TERMINATORS = [".", "!", "?"]
@@ -60,6 +60,17 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
         self.is_ready = False
         self.logger = logger or logging.getLogger(__name__)
         self.audio_cursor = 0.
+        self.resampler: Optional[Resampler] = None
+        if (
+            self.transcriber_config.downsampling
+            and self.transcriber_config.audio_encoding == AudioEncoding.LINEAR16
+        ):
+            # keeps filter state between chunks, so chunk edges don't click
+            self.resampler = Resampler(
+                self.transcriber_config.sampling_rate
+                * self.transcriber_config.downsampling,
+                self.transcriber_config.sampling_rate,
+            )
 
     async def _run_loop(self):
         restarts = 0
@@ -71,19 +82,8 @@ class DeepgramTranscriber(BaseAsyncTranscriber[DeepgramTranscriberConfig]):
             )
 
     def send_audio(self, chunk):
-        if (
-            self.transcriber_config.downsampling
-            and self.transcriber_config.audio_encoding == AudioEncoding.LINEAR16
-        ):
-            chunk, _ = audioop.ratecv(
-                chunk,
-                2,
-                1,
-                self.transcriber_config.sampling_rate
-                * self.transcriber_config.downsampling,
-                self.transcriber_config.sampling_rate,
-                None,
-            )
+        if self.resampler is not None:
+            chunk = self.resampler.resample(chunk)
         super().send_audio(chunk)
 
     def terminate(self):
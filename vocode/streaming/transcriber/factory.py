@@ -15,9 +15,13 @@ from vocode.streaming.transcriber.deepgram_transcriber import DeepgramTranscribe
 from vocode.streaming.transcriber.google_transcriber import GoogleTranscriber
 from vocode.streaming.transcriber.rev_ai_transcriber import RevAITranscriber
 from vocode.streaming.transcriber.azure_transcriber import AzureTranscriber
+from vocode.streaming.utils.client_pool import ClientPool, get_client_pool
 
 
 class TranscriberFactory:
+    def __init__(self, client_pool: Optional[ClientPool] = None):
+        self.client_pool = client_pool or get_client_pool()
+
     def create_transcriber(
         self,
         transcriber_config: TranscriberConfig,
@@ -26,7 +30,9 @@ class TranscriberFactory:
         if isinstance(transcriber_config, DeepgramTranscriberConfig):
             return DeepgramTranscriber(transcriber_config, logger=logger)
         elif isinstance(transcriber_config, GoogleTranscriberConfig):
-            return GoogleTranscriber(transcriber_config, logger=logger)
+            return GoogleTranscriber(
+                transcriber_config, logger=logger, client_pool=self.client_pool
+            )
         elif isinstance(transcriber_config, AssemblyAITranscriberConfig):
             return AssemblyAITranscriber(transcriber_config, logger=logger)
         elif isinstance(transcriber_config, RevAITranscriberConfig):
@@ -4,8 +4,6 @@ import base64
 import logging
 from typing import Optional
 import websockets
-import audioop
-import numpy as np
 from urllib.parse import urlencode
 from vocode import getenv
 
@@ -16,6 +14,7 @@ from vocode.streaming.transcriber.base_transcriber import (
     Transcription,
 )
 from vocode.streaming.models.audio_encoding import AudioEncoding
+from vocode.streaming.utils.audio_codec import decode_mulaw
 
 
 GLADIA_URL = "wss://api.gladia.io/audio/text/audio-transcription"
@@ -49,11 +48,7 @@ class GladiaTranscriber(BaseAsyncTranscriber[GladiaTranscriberConfig]):
 
     def send_audio(self, chunk):
         if self.transcriber_config.audio_encoding == AudioEncoding.MULAW:
-            sample_width = 1
-            if isinstance(chunk, np.ndarray):
-                chunk = chunk.astype(np.int16)
-                chunk = chunk.tobytes()
-            chunk = audioop.ulaw2lin(chunk, sample_width)
+            chunk = decode_mulaw(chunk)
 
         self.buffer.extend(chunk)
 
@@ -14,6 +14,7 @@ from vocode.streaming.transcriber.base_transcriber import (
 )
 from vocode.streaming.models.transcriber import GoogleTranscriberConfig
 from vocode.streaming.utils import create_loop_in_thread
+from vocode.streaming.utils.client_pool import ClientPool, get_client_pool
 
 
 # TODO: make this nonblocking so it can run in the main thread, see speech.async_client.SpeechAsyncClient
@@ -22,6 +23,7 @@ class GoogleTranscriber(BaseThreadAsyncTranscriber[GoogleTranscriberConfig]):
         self,
         transcriber_config: GoogleTranscriberConfig,
         logger: Optional[logging.Logger] = None,
+        client_pool: Optional[ClientPool] = None,
     ):
         super().__init__(transcriber_config)
 
@@ -33,7 +35,10 @@ class GoogleTranscriber(BaseThreadAsyncTranscriber[GoogleTranscriberConfig]):
 
         self._ended = False
         self.google_streaming_config = self.create_google_streaming_config()
-        self.client = self.speech.SpeechClient()
+        # the client's gRPC channel is shared by every conversation in the process
+        self.client = (client_pool or get_client_pool()).get_client(
+            "google_speech", self.speech.SpeechClient
+        )
         self.is_ready = False
         if self.transcriber_config.endpointing_config:
             raise Exception("Google endpointing config not supported yet")
@@ -1,11 +1,12 @@
 import asyncio
-import audioop
 import secrets
 from typing import Any
 import wave
 from string import ascii_letters, digits
 
 from ..models.audio_encoding import AudioEncoding
+from .audio_codec import encode_mulaw
+from .resampler import resample
 
 custom_alphabet = ascii_letters + digits + ".-_"
 
@@ -22,18 +23,16 @@ def convert_linear_audio(
     input_sample_rate=24000,
     output_sample_rate=8000,
     output_encoding=AudioEncoding.LINEAR16,
-    output_sample_width=2,
 ):
+    """Resamples and encodes 16-bit PCM"""
     # downsample
     if input_sample_rate != output_sample_rate:
-        raw_wav, _ = audioop.ratecv(
-            raw_wav, 2, 1, input_sample_rate, output_sample_rate, None
-        )
+        raw_wav = resample(raw_wav, input_sample_rate, output_sample_rate)
 
     if output_encoding == AudioEncoding.LINEAR16:
         return raw_wav
     elif output_encoding == AudioEncoding.MULAW:
-        return audioop.lin2ulaw(raw_wav, output_sample_width)
+        return encode_mulaw(raw_wav)
 
 
 def convert_wav(
@@ -42,13 +41,16 @@ def convert_wav(
     output_encoding=AudioEncoding.LINEAR16,
 ):
     with wave.open(file, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(
+                f"Only 16-bit wavs are supported, got {wav.getsampwidth() * 8}-bit"
+            )
         raw_wav = wav.readframes(wav.getnframes())
         return convert_linear_audio(
             raw_wav,
             input_sample_rate=wav.getframerate(),
             output_sample_rate=output_sample_rate,
             output_encoding=output_encoding,
-            output_sample_width=wav.getsampwidth(),
         )
 
 
@@ -0,0 +1,104 @@
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+
+from vocode.streaming.models.audio_encoding import AudioEncoding
+
+BytesLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+# G.711 mu-law, bit for bit the same as audioop.lin2ulaw / audioop.ulaw2lin
+MULAW_BIAS = 0x84
+MULAW_CLIP = 8159
+# upper bound of each segment, in the 14-bit magnitude plus bias >> 2
+MULAW_SEGMENT_ENDS = np.array(
+    [0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32
+)
+
+
+def _create_mulaw_decode_table() -> np.ndarray:
+    inverted = ~np.arange(256, dtype=np.int32) & 0xFF
+    magnitude = (((inverted & 0x0F) << 3) + MULAW_BIAS) << ((inverted & 0x70) >> 4)
+    return np.where(
+        inverted & 0x80, MULAW_BIAS - magnitude, magnitude - MULAW_BIAS
+    ).astype("<i2")
+
+
+def _create_mulaw_encode_table() -> np.ndarray:
+    # indexed by the 16-bit sample's bits read as unsigned, so any int16 buffer can be
+    # looked up without widening it
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), MULAW_CLIP) + (MULAW_BIAS >> 2)
+    segment = np.searchsorted(MULAW_SEGMENT_ENDS, magnitude)
+    mulaw = np.where(
+        segment < len(MULAW_SEGMENT_ENDS),
+        (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F),
+        0x7F,
+    )
+    return (mulaw ^ mask).astype(np.uint8)
+
+
+MULAW_DECODE_TABLE = _create_mulaw_decode_table()
+MULAW_ENCODE_TABLE = _create_mulaw_encode_table()
+
+
+def _as_array(audio: BytesLike, dtype: str) -> np.ndarray:
+    if isinstance(audio, np.ndarray):
+        return audio.view(dtype) if audio.dtype.itemsize == 1 else audio.astype(dtype)
+    return np.frombuffer(audio, dtype=dtype)
+
+
+def _as_output(
+    out: Union[bytearray, memoryview, np.ndarray], dtype: str, length: int
+) -> np.ndarray:
+    output = (
+        out.view(dtype) if isinstance(out, np.ndarray) else np.frombuffer(out, dtype)
+    )
+    if len(output) < length:
+        raise ValueError(f"Output buffer holds {len(output)} samples, need {length}")
+    return output[:length]
+
+
+def encode_mulaw(
+    linear: BytesLike,
+    out: Optional[Union[bytearray, memoryview, np.ndarray]] = None,
+) -> Union[bytes, memoryview]:
+    """Encodes 16-bit little-endian PCM as mu-law.
+
+    If out is given, the mu-law bytes are written into it, one per sample, and a
+    memoryview of the written part is returned instead of a new bytes object.
+    """
+    samples = _as_array(linear, "<i2").view(np.uint16)
+    if out is None:
+        return MULAW_ENCODE_TABLE[samples].tobytes()
+    output = _as_output(out, "u1", len(samples))
+    np.take(MULAW_ENCODE_TABLE, samples, out=output)
+    return memoryview(output.data)
+
+
+def decode_mulaw(
+    mulaw: BytesLike,
+    out: Optional[Union[bytearray, memoryview, np.ndarray]] = None,
+) -> Union[bytes, memoryview]:
+    """Decodes mu-law to 16-bit little-endian PCM.
+
+    If out is given, it needs two bytes per mu-law byte; a memoryview of the written
+    part is returned instead of a new bytes object.
+    """
+    indices = _as_array(mulaw, "u1")
+    if out is None:
+        return MULAW_DECODE_TABLE[indices].tobytes()
+    output = _as_output(out, "<i2", len(indices))
+    np.take(MULAW_DECODE_TABLE, indices, out=output)
+    return memoryview(output.data).cast("B")
+
+
+@lru_cache(maxsize=64)
+def get_silent_chunk(audio_encoding: AudioEncoding, num_bytes: int) -> bytes:
+    """num_bytes of silence in audio_encoding; mu-law silence is 0xff, not zeros"""
+    if audio_encoding == AudioEncoding.LINEAR16:
+        return b"\x00" * num_bytes
+    elif audio_encoding == AudioEncoding.MULAW:
+        return b"\xff" * num_bytes
+    raise Exception("Unsupported audio encoding")
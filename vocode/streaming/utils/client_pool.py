@@ -0,0 +1,120 @@
+import asyncio
+from collections import OrderedDict
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+DEFAULT_MAX_SHARED_CLIENTS = 32
+DEFAULT_MAX_IDLE_CLIENTS_PER_KEY = 8
+
+
+class ClientPool:
+    """Provider SDK clients kept warm across conversations.
+
+    Clients that can serve concurrent requests, like gRPC clients, are shared with
+    get_client, or get_loop_client when they're bound to the event loop they were
+    created on; those are closed with close_loop_clients before the loop shuts down. Clients that serve one conversation at a time are taken with checkout
+    and handed back with checkin, so the next conversation reuses their open connection.
+    Keys should include everything the client was created with, e.g. credentials and region.
+    """
+
+    def __init__(
+        self,
+        max_shared_clients: int = DEFAULT_MAX_SHARED_CLIENTS,
+        max_idle_clients_per_key: int = DEFAULT_MAX_IDLE_CLIENTS_PER_KEY,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.max_shared_clients = max_shared_clients
+        self.max_idle_clients_per_key = max_idle_clients_per_key
+        self.logger = logger or logging.getLogger(__name__)
+        self.shared_clients: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.idle_clients: Dict[Hashable, List[Any]] = {}
+        # the clients hold their loop, so they're dropped explicitly in close_loop_clients
+        self.clients_by_loop: Dict[
+            asyncio.AbstractEventLoop,
+            Dict[Hashable, Tuple[Any, Optional[Callable[[Any], Awaitable[Any]]]]],
+        ] = {}
+        # synthesizers and transcribers create clients from executor threads too
+        self.lock = threading.Lock()
+
+    def get_client(
+        self,
+        key: Hashable,
+        create: Callable[[], Any],
+        is_healthy: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        with self.lock:
+            client = self.shared_clients.get(key)
+            if client is not None and (is_healthy is None or is_healthy(client)):
+                self.shared_clients.move_to_end(key)
+                return client
+            client = create()
+            self.shared_clients[key] = client
+            self.shared_clients.move_to_end(key)
+            while len(self.shared_clients) > self.max_shared_clients:
+                # conversations already holding the evicted client keep using it
+                self.shared_clients.popitem(last=False)
+            return client
+
+    def get_loop_client(
+        self,
+        key: Hashable,
+        create: Callable[[], Any],
+        close: Optional[Callable[[Any], Awaitable[Any]]] = None,
+    ) -> Any:
+        """Like get_client, for async clients that only work on the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            clients = self.clients_by_loop.setdefault(loop, {})
+            if key not in clients:
+                clients[key] = (create(), close)
+            return clients[key][0]
+
+    async def close_loop_clients(self):
+        """Closes and drops the running loop's clients, call it before the loop shuts down"""
+        with self.lock:
+            clients = self.clients_by_loop.pop(asyncio.get_running_loop(), {})
+        for client, close in clients.values():
+            if close is not None:
+                await close(client)
+
+    def checkout(
+        self,
+        key: Hashable,
+        create: Callable[[], Any],
+        is_healthy: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        with self.lock:
+            idle_clients = self.idle_clients.get(key, [])
+            while idle_clients:
+                client = idle_clients.pop()
+                if is_healthy is None or is_healthy(client):
+                    return client
+                self.logger.debug(f"Dropping unhealthy client for {key}")
+        return create()
+
+    def checkin(
+        self,
+        key: Hashable,
+        client: Any,
+        is_healthy: Optional[Callable[[Any], bool]] = None,
+    ):
+        if is_healthy is not None and not is_healthy(client):
+            return
+        with self.lock:
+            idle_clients = self.idle_clients.setdefault(key, [])
+            if len(idle_clients) < self.max_idle_clients_per_key:
+                idle_clients.append(client)
+
+    def clear(self):
+        """Drops the shared and idle clients; per-loop clients are closed by close_loop_clients"""
+        with self.lock:
+            self.shared_clients.clear()
+            self.idle_clients.clear()
+
+
+_client_pool = ClientPool()
+
+
+def get_client_pool() -> ClientPool:
+    return _client_pool
@@ -1,14 +1,19 @@
 import os
 import asyncio
-from typing import Optional
+from collections import OrderedDict
+from functools import lru_cache
+import re
+from typing import Dict, Optional
 import openai
 import numpy as np
-import requests
 
 from vocode import getenv
+from vocode.streaming.models.agent import GoodbyeModelType
 
 SIMILARITY_THRESHOLD = 0.9
 EMBEDDING_SIZE = 1536
+EMBEDDINGS_MEMO_SIZE = 1024
+LEXICAL_GOODBYE_MEMO_SIZE = 4096
 GOODBYE_PHRASES = [
     "bye",
     "goodbye",
@@ -19,14 +24,35 @@ GOODBYE_PHRASES = [
     "have a good day",
     "have a good night",
 ]
+# the lexical model also accepts these, embeddings already place them close to the phrases above
+LEXICAL_GOODBYE_PHRASES = GOODBYE_PHRASES + [
+    "bye bye",
+    "good bye",
+    "good night",
+    "take care",
+    "see ya",
+    "catch you later",
+    "have a great day",
+    "have a nice day",
+    "have a good one",
+    "farewell",
+]
+DEFAULT_EMBEDDINGS_CACHE_PATH = os.path.join(
+    getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "vocode",
+    "goodbye_embeddings",
+)
+
+# the phrase embeddings are the same for every conversation, so they are loaded once per process
+_goodbye_embeddings_by_path: Dict[str, np.ndarray] = {}
+_loading_tasks_by_path: Dict[str, asyncio.Task] = {}
+_embeddings_by_text: "OrderedDict[str, np.ndarray]" = OrderedDict()
 
 
 class GoodbyeModel:
     def __init__(
         self,
-        embeddings_cache_path=os.path.join(
-            os.path.dirname(__file__), "goodbye_embeddings"
-        ),
+        embeddings_cache_path=DEFAULT_EMBEDDINGS_CACHE_PATH,
         openai_api_key: Optional[str] = None,
     ):
         openai.api_key = openai_api_key or getenv("OPENAI_API_KEY")
@@ -36,20 +62,29 @@ class GoodbyeModel:
         self.goodbye_embeddings: Optional[np.ndarray] = None
 
     async def initialize_embeddings(self):
-        self.goodbye_embeddings = await self.load_or_create_embeddings(
-            f"{self.embeddings_cache_path}/goodbye_embeddings.npy"
-        )
+        path = f"{self.embeddings_cache_path}/goodbye_embeddings.npy"
+        if path not in _goodbye_embeddings_by_path:
+            task = _loading_tasks_by_path.get(path)
+            if task is None or task.get_loop() is not asyncio.get_running_loop():
+                task = asyncio.create_task(self.load_or_create_embeddings(path))
+                _loading_tasks_by_path[path] = task
+            try:
+                _goodbye_embeddings_by_path[path] = await asyncio.shield(task)
+            finally:
+                if task.done():
+                    _loading_tasks_by_path.pop(path, None)
+        self.goodbye_embeddings = _goodbye_embeddings_by_path[path]
 
     async def load_or_create_embeddings(self, path):
         if os.path.exists(path):
             return np.load(path)
         else:
             embeddings = await self.create_embeddings()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
             np.save(path, embeddings)
             return embeddings
 
     async def create_embeddings(self):
-        print("Creating embeddings...")
         size = EMBEDDING_SIZE
         embeddings = np.empty((size, len(GOODBYE_PHRASES)))
         for i, goodbye_phrase in enumerate(GOODBYE_PHRASES):
@@ -65,6 +100,10 @@ class GoodbyeModel:
         return np.max(similarity_results) > SIMILARITY_THRESHOLD
 
     async def create_embedding(self, text) -> np.ndarray:
+        if text in _embeddings_by_text:
+            _embeddings_by_text.move_to_end(text)
+            return _embeddings_by_text[text]
+
         params = {
             "input": text,
         }
@@ -75,9 +114,52 @@ class GoodbyeModel:
         else:
             params["model"] = "text-embedding-ada-002"
 
-        return np.array(
+        embedding = np.array(
             (await openai.Embedding.acreate(**params))["data"][0]["embedding"]
         )
+        _embeddings_by_text[text] = embedding
+        if len(_embeddings_by_text) > EMBEDDINGS_MEMO_SIZE:
+            _embeddings_by_text.popitem(last=False)
+        return embedding
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+_goodbye_phrases_pattern = re.compile(
+    r"\b(?:"
+    + "|".join(
+        sorted(
+            (re.escape(normalize_text(phrase)) for phrase in LEXICAL_GOODBYE_PHRASES),
+            key=len,
+            reverse=True,
+        )
+    )
+    # a goodbye closes the utterance, allow one trailing word like a name or "then"
+    + r")(?: \w+)?$"
+)
+
+
+@lru_cache(maxsize=LEXICAL_GOODBYE_MEMO_SIZE)
+def is_lexical_goodbye(text: str) -> bool:
+    return _goodbye_phrases_pattern.search(normalize_text(text)) is not None
+
+
+class LexicalGoodbyeModel:
+    """Detects goodbyes by matching known phrases, which runs locally in microseconds"""
+
+    async def initialize_embeddings(self):
+        pass
+
+    async def is_goodbye(self, text: str) -> bool:
+        return is_lexical_goodbye(text)
+
+
+def create_goodbye_model(goodbye_model_type: GoodbyeModelType):
+    if goodbye_model_type == GoodbyeModelType.LEXICAL:
+        return LexicalGoodbyeModel()
+    return GoodbyeModel()
 
 
 if __name__ == "__main__":
@@ -87,6 +169,7 @@ if __name__ == "__main__":
 
     async def main():
         model = GoodbyeModel()
+        await model.initialize_embeddings()
         while True:
             print(await model.is_goodbye(input("Text: ")))
 
@@ -0,0 +1,19 @@
+from collections import deque
+from typing import Deque, Optional
+
+import numpy as np
+
+
+class LatencyEstimator:
+    """Rolling median of the most recent latencies, robust to the odd slow request"""
+
+    def __init__(self, window_size: int):
+        self.latencies: Deque[float] = deque(maxlen=window_size)
+
+    def record(self, latency: float):
+        self.latencies.append(latency)
+
+    def get_estimate(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return float(np.median(self.latencies))
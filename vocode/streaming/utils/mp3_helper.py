@@ -2,11 +2,15 @@ import io
 import wave
 import miniaudio
 
+MP3_DECODE_SAMPLE_RATE = 44100
+
 
 # sampling_rate is the rate of the input, not expected output
 def decode_mp3(mp3_bytes: bytes) -> io.BytesIO:
     # Convert it to a wav chunk using miniaudio
-    wav_chunk = miniaudio.decode(mp3_bytes, nchannels=1)
+    wav_chunk = miniaudio.decode(
+        mp3_bytes, nchannels=1, sample_rate=MP3_DECODE_SAMPLE_RATE
+    )
 
     # Write wav_chunks.samples to io.BytesIO with builtin WAVE
     output_bytes_io = io.BytesIO()
@@ -14,7 +18,14 @@ def decode_mp3(mp3_bytes: bytes) -> io.BytesIO:
     with wave.open(output_bytes_io, "wb") as wave_obj:
         wave_obj.setnchannels(1)
         wave_obj.setsampwidth(2)
-        wave_obj.setframerate(44100)
+        wave_obj.setframerate(MP3_DECODE_SAMPLE_RATE)
         wave_obj.writeframes(wav_chunk.samples)
     output_bytes_io.seek(0)
     return output_bytes_io
+
+
+def decode_mp3_samples(mp3_bytes: bytes) -> bytes:
+    """Decodes to 16-bit mono PCM at MP3_DECODE_SAMPLE_RATE"""
+    return miniaudio.decode(
+        mp3_bytes, nchannels=1, sample_rate=MP3_DECODE_SAMPLE_RATE
+    ).samples.tobytes()
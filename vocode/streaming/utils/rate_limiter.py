@@ -0,0 +1,268 @@
+import asyncio
+from enum import IntEnum
+import itertools
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol
+
+from opentelemetry import metrics
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# OpenAI counts roughly four characters per token for english text
+CHARS_PER_TOKEN = 4
+TOKENS_PER_MESSAGE = 4
+DEFAULT_MAX_QUEUE_SECONDS = 10.0
+DEFAULT_REDIS_KEY_PREFIX = "vocode:llm_rate_limiter"
+
+meter = metrics.get_meter(__name__)
+queue_wait_hist = meter.create_histogram(
+    name="llm_rate_limiter.queue_wait",
+    unit="seconds",
+)
+dropped_counter = meter.create_counter(
+    name="llm_rate_limiter.dropped",
+)
+
+
+class RequestPriority(IntEnum):
+    """Lower values are served first"""
+
+    LIVE_TURN = 0
+    BACKGROUND = 1
+
+
+class LLMRateLimitExceeded(Exception):
+    pass
+
+
+def estimate_tokens(
+    prompt: Optional[str] = None,
+    messages: Optional[List[dict]] = None,
+    max_tokens: int = 0,
+) -> int:
+    """OpenAI counts the prompt and max_tokens against the token limit when the request is made"""
+    num_chars = len(prompt or "")
+    for message in messages or []:
+        num_chars += len(message.get("content") or "")
+    num_tokens = num_chars // CHARS_PER_TOKEN + max_tokens
+    if messages:
+        num_tokens += TOKENS_PER_MESSAGE * len(messages)
+    return num_tokens
+
+
+class TokenBucket(Protocol):
+    async def try_acquire(self, num_tokens: int) -> float:
+        """Takes capacity for one request if it's available, otherwise returns how long until it is"""
+        ...
+
+
+class LocalTokenBucket:
+    """Refills requests_per_minute requests and tokens_per_minute tokens over every minute"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.updated_at = time.monotonic()
+
+    async def try_acquire(self, num_tokens: int) -> float:
+        """Takes capacity for one request if it's available, otherwise returns how long until it is"""
+        now = time.monotonic()
+        elapsed_minutes = (now - self.updated_at) / 60
+        self.updated_at = now
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + elapsed_minutes * self.requests_per_minute,
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + elapsed_minutes * self.tokens_per_minute,
+        )
+        num_tokens = min(num_tokens, self.tokens_per_minute)
+        wait_seconds = max(
+            (1 - self.available_requests) * 60 / self.requests_per_minute,
+            (num_tokens - self.available_tokens) * 60 / self.tokens_per_minute,
+            0,
+        )
+        if wait_seconds == 0:
+            self.available_requests -= 1
+            self.available_tokens -= num_tokens
+        return wait_seconds
+
+
+# refills and takes from both buckets atomically, so every process shares the same limits
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local requests_per_minute = tonumber(ARGV[1])
+local tokens_per_minute = tonumber(ARGV[2])
+local num_tokens = math.min(tonumber(ARGV[3]), tokens_per_minute)
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated_at')
+local available_requests = tonumber(state[1]) or requests_per_minute
+local available_tokens = tonumber(state[2]) or tokens_per_minute
+local elapsed_minutes = (now - (tonumber(state[3]) or now)) / 60
+available_requests = math.min(requests_per_minute, available_requests + elapsed_minutes * requests_per_minute)
+available_tokens = math.min(tokens_per_minute, available_tokens + elapsed_minutes * tokens_per_minute)
+local wait_seconds = math.max(
+    (1 - available_requests) * 60 / requests_per_minute,
+    (num_tokens - available_tokens) * 60 / tokens_per_minute,
+    0
+)
+if wait_seconds == 0 then
+    available_requests = available_requests - 1
+    available_tokens = available_tokens - num_tokens
+end
+redis.call('HSET', KEYS[1], 'requests', available_requests, 'tokens', available_tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait_seconds)
+"""
+
+
+class RedisTokenBucket:
+    def __init__(
+        self,
+        redis: "Redis",
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        key: str = DEFAULT_REDIS_KEY_PREFIX,
+    ):
+        self.redis = redis
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.key = key
+        self.script = redis.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+
+    async def try_acquire(self, num_tokens: int) -> float:
+        wait_seconds = await self.script(
+            keys=[self.key],
+            args=[self.requests_per_minute, self.tokens_per_minute, num_tokens],
+        )
+        return float(wait_seconds)
+
+
+class QueuedRequest:
+    def __init__(
+        self,
+        priority: RequestPriority,
+        sequence_number: int,
+        num_tokens: int,
+        deadline: float,
+    ):
+        self.priority = priority
+        self.sequence_number = sequence_number
+        self.num_tokens = num_tokens
+        self.deadline = deadline
+
+    def sort_key(self):
+        return self.priority, self.sequence_number
+
+
+class LLMRateLimiter:
+    """Queues LLM requests until the shared token bucket has room for them.
+
+    The request at the head of the queue, ordered by priority then arrival, is the only
+    one taking from the bucket, so live turns go ahead of background work. Requests
+    that can't be served before their deadline are dropped with LLMRateLimitExceeded.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        redis: Optional["Redis"] = None,
+        max_queue_seconds_by_priority: Optional[Dict[RequestPriority, float]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.bucket: TokenBucket
+        if redis is not None:
+            self.bucket = RedisTokenBucket(
+                redis, requests_per_minute, tokens_per_minute
+            )
+        else:
+            self.bucket = LocalTokenBucket(requests_per_minute, tokens_per_minute)
+        self.max_queue_seconds_by_priority = max_queue_seconds_by_priority or {}
+        self.logger = logger or logging.getLogger(__name__)
+        self.queue: List[QueuedRequest] = []
+        self.sequence_numbers = itertools.count()
+        self.queue_changed = asyncio.Event()
+
+    def get_max_queue_seconds(self, priority: RequestPriority) -> float:
+        return self.max_queue_seconds_by_priority.get(
+            priority, DEFAULT_MAX_QUEUE_SECONDS
+        )
+
+    async def acquire(
+        self,
+        num_tokens: int,
+        priority: RequestPriority = RequestPriority.LIVE_TURN,
+        timeout: Optional[float] = None,
+    ):
+        enqueued_at = time.monotonic()
+        request = QueuedRequest(
+            priority,
+            next(self.sequence_numbers),
+            num_tokens,
+            enqueued_at
+            + (
+                timeout if timeout is not None else self.get_max_queue_seconds(priority)
+            ),
+        )
+        self.queue.append(request)
+        self.queue.sort(key=QueuedRequest.sort_key)
+        try:
+            while True:
+                remaining_seconds = request.deadline - time.monotonic()
+                wait_seconds = remaining_seconds
+                if self.queue[0] is request:
+                    bucket_wait_seconds = await self.bucket.try_acquire(num_tokens)
+                    if bucket_wait_seconds == 0:
+                        break
+                    if bucket_wait_seconds > remaining_seconds:
+                        # the bucket won't have room in time, don't hold up the queue
+                        remaining_seconds = 0
+                    wait_seconds = min(bucket_wait_seconds, remaining_seconds)
+                if remaining_seconds <= 0:
+                    dropped_counter.add(1, {"priority": priority.name})
+                    self.logger.warning(
+                        f"Dropping {priority.name} LLM request, {len(self.queue)} requests queued"
+                    )
+                    raise LLMRateLimitExceeded(
+                        f"Dropped {priority.name} LLM request after {time.monotonic() - enqueued_at:.2f}s in queue"
+                    )
+                self.queue_changed.clear()
+                try:
+                    await asyncio.wait_for(self.queue_changed.wait(), wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.queue.remove(request)
+            self.queue_changed.set()
+        queue_wait_hist.record(
+            time.monotonic() - enqueued_at, {"priority": priority.name}
+        )
+
+
+_llm_rate_limiter: Optional[LLMRateLimiter] = None
+
+
+def set_llm_rate_limiter(rate_limiter: Optional[LLMRateLimiter]):
+    """Installs the limiter every LLM request in the process goes through"""
+    global _llm_rate_limiter
+    _llm_rate_limiter = rate_limiter
+
+
+def get_llm_rate_limiter() -> Optional[LLMRateLimiter]:
+    return _llm_rate_limiter
+
+
+async def acquire_llm_capacity(
+    num_tokens: int,
+    priority: RequestPriority = RequestPriority.LIVE_TURN,
+    timeout: Optional[float] = None,
+):
+    rate_limiter = get_llm_rate_limiter()
+    if rate_limiter is not None:
+        await rate_limiter.acquire(num_tokens, priority=priority, timeout=timeout)
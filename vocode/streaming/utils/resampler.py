@@ -0,0 +1,132 @@
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+
+# taps on each side of the filter, per input or output sample of the slower rate
+HALF_FILTER_LENGTH_PER_SAMPLE = 10
+KAISER_BETA = 5.0
+# (input_sample_rate, output_sample_rate) pairs used by telephony and the synthesizers
+COMMON_SAMPLE_RATES = [
+    (44100, 8000),
+    (24000, 8000),
+    (16000, 8000),
+    (8000, 16000),
+]
+
+
+def get_up_down(input_sample_rate: int, output_sample_rate: int) -> Tuple[int, int]:
+    divisor = gcd(input_sample_rate, output_sample_rate)
+    return output_sample_rate // divisor, input_sample_rate // divisor
+
+
+@lru_cache(maxsize=32)
+def get_filter_bank(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """Splits a kaiser-windowed lowpass filter into its up polyphase components.
+
+    Same design as scipy.signal.resample_poly. Returns the bank, one row of taps per
+    phase in reverse order, and the filter's delay in upsampled samples.
+    """
+    max_rate = max(up, down)
+    half_length = HALF_FILTER_LENGTH_PER_SAMPLE * max_rate
+    num_taps = 2 * half_length + 1
+    cutoff = 1 / max_rate
+    taps = cutoff * np.sinc(cutoff * (np.arange(num_taps) - half_length))
+    taps *= np.kaiser(num_taps, KAISER_BETA)
+    taps *= up / taps.sum()
+    taps_per_phase = -(-num_taps // up)
+    padded_taps = np.zeros(taps_per_phase * up)
+    padded_taps[:num_taps] = taps
+    # row p holds taps p, p + up, p + 2 * up...; reversed so a row lines up with the input
+    bank = padded_taps.reshape(taps_per_phase, up).T[:, ::-1]
+    return np.ascontiguousarray(bank, dtype=np.float32), half_length
+
+
+for _input_sample_rate, _output_sample_rate in COMMON_SAMPLE_RATES:
+    get_filter_bank(*get_up_down(_input_sample_rate, _output_sample_rate))
+
+
+class Resampler:
+    """Resamples a stream of 16-bit mono PCM, chunk by chunk.
+
+    The filter carries its input history across chunks, so the output is the same as
+    resampling the whole stream at once. Output lags the input by half the filter length
+    (about 1ms for 24kHz to 8kHz); flush() returns the rest at the end of the stream.
+    """
+
+    def __init__(self, input_sample_rate: int, output_sample_rate: int):
+        self.input_sample_rate = input_sample_rate
+        self.output_sample_rate = output_sample_rate
+        self.up, self.down = get_up_down(input_sample_rate, output_sample_rate)
+        self.bank, self.delay = get_filter_bank(self.up, self.down)
+        self.taps_per_phase = self.bank.shape[1]
+        self.tap_offsets = np.arange(self.taps_per_phase - 1, -1, -1)
+        self.reset()
+
+    def reset(self):
+        # samples before the stream started are silence
+        self.history = np.zeros(self.taps_per_phase, dtype=np.float32)
+        self.history_start = -self.taps_per_phase
+        self.num_input_samples = 0
+        self.num_output_samples = 0
+
+    def get_num_ready_outputs(self) -> int:
+        # output m needs input up to (m * down + delay) // up
+        last_input_position = self.num_input_samples * self.up - 1 - self.delay
+        if last_input_position < 0:
+            return 0
+        return last_input_position // self.down + 1
+
+    def append(self, samples: np.ndarray):
+        self.history = np.concatenate((self.history, samples))
+
+    def process(self, num_outputs: int) -> np.ndarray:
+        output_indices = np.arange(self.num_output_samples, num_outputs)
+        positions = output_indices * self.down + self.delay
+        last_inputs = positions // self.up - self.history_start
+        windows = self.history[
+            last_inputs[:, np.newaxis] - self.tap_offsets[np.newaxis, :]
+        ]
+        output = np.einsum("ij,ij->i", self.bank[positions % self.up], windows)
+        self.num_output_samples = num_outputs
+        # drop the inputs that come before the next output's window
+        next_window_start = (
+            (num_outputs * self.down + self.delay) // self.up - self.taps_per_phase + 1
+        )
+        if next_window_start > self.history_start:
+            self.history = self.history[next_window_start - self.history_start :]
+            self.history_start = next_window_start
+        return output
+
+    def to_bytes(self, output: np.ndarray) -> bytes:
+        return np.clip(np.rint(output), -32768, 32767).astype("<i2").tobytes()
+
+    def resample(self, chunk: bytes) -> bytes:
+        if self.up == self.down:
+            return chunk
+        samples = np.frombuffer(chunk, dtype="<i2").astype(np.float32)
+        self.append(samples)
+        self.num_input_samples += len(samples)
+        return self.to_bytes(self.process(self.get_num_ready_outputs()))
+
+    def flush(self) -> bytes:
+        """Returns the output still held back by the filter and resets the stream"""
+        if self.up == self.down:
+            return b""
+        total_num_outputs = -(-self.num_input_samples * self.up // self.down)
+        # the filter's look-ahead past the last sample is silence
+        self.append(
+            np.zeros(self.delay // self.up + self.taps_per_phase, dtype=np.float32)
+        )
+        output = self.process(total_num_outputs)
+        self.reset()
+        return self.to_bytes(output)
+
+
+def resample(audio: bytes, input_sample_rate: int, output_sample_rate: int) -> bytes:
+    """Resamples a whole clip of 16-bit mono PCM"""
+    if input_sample_rate == output_sample_rate:
+        return audio
+    resampler = Resampler(input_sample_rate, output_sample_rate)
+    return resampler.resample(audio) + resampler.flush()
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Dict, Tuple
+import weakref
+
+import aiohttp
+from yarl import URL
+
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_KEEPALIVE_TIMEOUT_SECONDS = 60.0
+
+# aiohttp sessions are bound to the loop they were created on, so the pool is kept per loop
+_sessions_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], aiohttp.ClientSession]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_session(
+    url: str,
+    connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+    keepalive_timeout_seconds: float = DEFAULT_KEEPALIVE_TIMEOUT_SECONDS,
+) -> aiohttp.ClientSession:
+    """Returns a keep-alive session shared by every caller hitting the same origin.
+
+    The session is owned by the pool: callers must not close it, use close_shared_sessions() instead.
+    """
+    loop = asyncio.get_running_loop()
+    sessions = _sessions_by_loop.setdefault(loop, {})
+    key = (str(URL(url).origin()), connection_limit)
+    session = sessions.get(key)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=connection_limit,
+                keepalive_timeout=keepalive_timeout_seconds,
+            )
+        )
+        sessions[key] = session
+    return session
+
+
+async def close_shared_sessions():
+    loop = asyncio.get_running_loop()
+    sessions = _sessions_by_loop.pop(loop, {})
+    for session in sessions.values():
+        await session.close()
+
+
+async def preopen_connections(url: str, num_connections: int = 1) -> int:
+    """Opens keep-alive connections to url's origin in its shared session.
+
+    The first requests then skip the TCP and TLS handshakes. Returns how many connections
+    were opened.
+    """
+    session = get_shared_session(url)
+    origin = str(URL(url).origin())
+
+    async def open_connection() -> bool:
+        try:
+            async with session.head(origin, allow_redirects=False):
+                return True
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    results = await asyncio.gather(*(open_connection() for _ in range(num_connections)))
+    return sum(results)
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from vocode.streaming.action.factory import ActionFactory
+from vocode.streaming.action.registry import get_action_registry
+from vocode.streaming.agent.bot_sentiment_analyser import BotSentiment
+from vocode.streaming.constants import TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS
+from vocode.streaming.models.agent import AgentConfig, FillerAudioConfig
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.synthesizer.base_synthesizer import (
+    BaseSynthesizer,
+    FillerAudio,
+    SynthesisResult,
+)
+from vocode.streaming.utils import get_chunk_size_per_second
+from vocode.streaming.utils.goodbye_model import create_goodbye_model
+
+# rendered messages are looked up by their exact text, so only a few of them are reused
+MAX_CACHED_SPEECH = 128
+
+SpeechKey = Tuple[str, str, int, Optional[str]]
+
+
+def get_config_key(synthesizer_config: SynthesizerConfig) -> str:
+    return hashlib.sha256(synthesizer_config.json(sort_keys=True).encode()).hexdigest()
+
+
+def get_speech_key(
+    synthesizer: BaseSynthesizer,
+    message: BaseMessage,
+    chunk_size: int,
+    bot_sentiment: Optional[BotSentiment],
+) -> SpeechKey:
+    # some synthesizers render the same text differently depending on the sentiment
+    return (
+        get_config_key(synthesizer.get_synthesizer_config()),
+        message.text,
+        chunk_size,
+        bot_sentiment.json(sort_keys=True) if bot_sentiment else None,
+    )
+
+
+def get_speech_chunk_size(synthesizer_config: SynthesizerConfig) -> int:
+    return (
+        get_chunk_size_per_second(
+            synthesizer_config.audio_encoding, synthesizer_config.sampling_rate
+        )
+        * TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS
+    )
+
+
+class CachedSpeech:
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+        self.num_bytes = sum(len(chunk) for chunk in chunks)
+
+
+class WarmupRegistry:
+    """Audio rendered ahead of calls, so call setup only does lookups.
+
+    Entries are keyed by a hash of the synthesizer config, so every conversation
+    with the same voice and output encoding shares them. Rendered speech is evicted
+    least recently used first once there are max_cached_speech messages.
+    """
+
+    def __init__(self, max_cached_speech: int = MAX_CACHED_SPEECH):
+        self.filler_audios: Dict[Tuple[str, bool, bool], List[FillerAudio]] = {}
+        self.speech: "OrderedDict[SpeechKey, CachedSpeech]" = OrderedDict()
+        self.max_cached_speech = max_cached_speech
+
+    async def set_filler_audios(
+        self, synthesizer: BaseSynthesizer, filler_audio_config: FillerAudioConfig
+    ):
+        key = (
+            get_config_key(synthesizer.get_synthesizer_config()),
+            filler_audio_config.use_phrases,
+            filler_audio_config.use_typing_noise,
+        )
+        filler_audios = self.filler_audios.get(key)
+        if filler_audios is None:
+            await synthesizer.set_filler_audios(filler_audio_config)
+            self.filler_audios[key] = synthesizer.filler_audios
+        else:
+            synthesizer.filler_audios = filler_audios
+
+    async def render_speech(
+        self,
+        synthesizer: BaseSynthesizer,
+        message: BaseMessage,
+        chunk_size: int,
+        bot_sentiment: Optional[BotSentiment] = None,
+    ):
+        key = get_speech_key(synthesizer, message, chunk_size, bot_sentiment)
+        if key in self.speech:
+            self.speech.move_to_end(key)
+            return
+        synthesis_result = await synthesizer.create_speech(
+            message, chunk_size, bot_sentiment=bot_sentiment
+        )
+        self.speech[key] = CachedSpeech(
+            [
+                chunk_result.chunk
+                async for chunk_result in synthesis_result.chunk_generator
+            ]
+        )
+        while len(self.speech) > self.max_cached_speech:
+            self.speech.popitem(last=False)
+
+    def get_synthesis_result(
+        self,
+        synthesizer: BaseSynthesizer,
+        message: BaseMessage,
+        chunk_size: int,
+        bot_sentiment: Optional[BotSentiment] = None,
+    ) -> Optional[SynthesisResult]:
+        key = get_speech_key(synthesizer, message, chunk_size, bot_sentiment)
+        cached_speech = self.speech.get(key)
+        if cached_speech is None:
+            return None
+        self.speech.move_to_end(key)
+        # the closures below don't see the narrowing of cached_speech
+        chunks = cached_speech.chunks
+        num_bytes = cached_speech.num_bytes
+
+        async def chunk_generator():
+            for i, chunk in enumerate(chunks):
+                yield SynthesisResult.ChunkResult(chunk, i == len(chunks) - 1)
+
+        return SynthesisResult(
+            chunk_generator(),
+            lambda seconds: synthesizer.get_message_cutoff_from_total_response_length(
+                message, seconds, num_bytes
+            ),
+        )
+
+    async def warm_up(
+        self,
+        agent_config: AgentConfig,
+        synthesizer: BaseSynthesizer,
+        logger: Optional[logging.Logger] = None,
+    ):
+        logger = logger or logging.getLogger(__name__)
+        if agent_config.send_filler_audio:
+            await self.set_filler_audios(
+                synthesizer,
+                agent_config.send_filler_audio
+                if isinstance(agent_config.send_filler_audio, FillerAudioConfig)
+                else FillerAudioConfig(),
+            )
+        if agent_config.initial_message:
+            await self.render_speech(
+                synthesizer,
+                agent_config.initial_message,
+                get_speech_chunk_size(synthesizer.get_synthesizer_config()),
+            )
+        for action_config in agent_config.actions or []:
+            get_action_registry().get_openai_function(ActionFactory(), action_config)
+        if agent_config.end_conversation_on_goodbye:
+            try:
+                await create_goodbye_model(
+                    agent_config.goodbye_model_type
+                ).initialize_embeddings()
+            except Exception as e:
+                logger.warning(f"Could not warm up goodbye model: {e}")
+
+
+_warmup_registry = WarmupRegistry()
+
+
+def get_warmup_registry() -> WarmupRegistry:
+    return _warmup_registry
@@ -215,11 +215,19 @@ class InterruptibleWorker(AsyncWorker[InterruptibleEventType]):
             self.interruptible_event = item
             self.current_task = asyncio.create_task(self.process(item))
             try:
-                await self.current_task
+                # unlike awaiting the task, this doesn't raise when only the task was
+                # interrupted, e.g. before it got to run and catch the cancellation
+                await asyncio.wait([self.current_task])
             except asyncio.CancelledError:
+                self.current_task.cancel()
                 return
-            except Exception as e:
-                logger.exception("InterruptibleWorker", exc_info=True)
+            if (
+                not self.current_task.cancelled()
+                and self.current_task.exception() is not None
+            ):
+                logger.error(
+                    "InterruptibleWorker", exc_info=self.current_task.exception()
+                )
             self.interruptible_event.is_interruptible = False
             self.current_task = None
 
@@ -1,10 +1,25 @@
+import asyncio
+import logging
 import os
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import aiohttp
 import openai
 from langchain.docstore.document import Document
 
+from vocode.streaming.vector_db.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
 DEFAULT_OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
+MAX_EMBEDDING_ATTEMPTS = 4
+EMBEDDING_INITIAL_BACKOFF_SECONDS = 0.5
+RETRYABLE_EMBEDDING_ERRORS = (
+    openai.error.APIError,
+    openai.error.APIConnectionError,
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.Timeout,
+)
 
 
 class VectorDB:
@@ -23,8 +38,13 @@ class VectorDB:
     async def create_openai_embedding(
         self, text, model=DEFAULT_OPENAI_EMBEDDING_MODEL
     ) -> List[float]:
-        params = {
-            "input": text,
+        return (await self.create_openai_embeddings([text], model=model))[0]
+
+    async def create_openai_embeddings(
+        self, texts: List[str], model=DEFAULT_OPENAI_EMBEDDING_MODEL
+    ) -> List[List[float]]:
+        params: Dict[str, Any] = {
+            "input": texts,
         }
 
         engine = os.getenv("AZURE_OPENAI_TEXT_EMBEDDING_ENGINE")
@@ -33,7 +53,61 @@ class VectorDB:
         else:
             params["model"] = model
 
-        return list((await openai.Embedding.acreate(**params))["data"][0]["embedding"])
+        data = (await openai.Embedding.acreate(**params))["data"]
+        return [
+            list(item["embedding"])
+            for item in sorted(data, key=lambda item: item["index"])
+        ]
+
+    async def embed_texts(
+        self,
+        texts: List[str],
+        model: str = DEFAULT_OPENAI_EMBEDDING_MODEL,
+        batch_size: int = 100,
+        max_concurrent_requests: int = 4,
+        embedding_cache: Optional[EmbeddingCache] = None,
+    ) -> List[List[float]]:
+        """Embeds texts with batched requests, at most max_concurrent_requests at a time.
+        Texts found in the embedding cache are not sent to the API, and batches that hit
+        rate limits or transient errors are retried with exponential backoff."""
+        embeddings: List[Optional[List[float]]] = [
+            embedding_cache.get(text, model) if embedding_cache else None
+            for text in texts
+        ]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def embed_batch(indices: List[int]):
+            backoff = EMBEDDING_INITIAL_BACKOFF_SECONDS
+            for attempt in range(1, MAX_EMBEDDING_ATTEMPTS + 1):
+                try:
+                    async with semaphore:
+                        batch_embeddings = await self.create_openai_embeddings(
+                            [texts[i] for i in indices], model=model
+                        )
+                    break
+                except RETRYABLE_EMBEDDING_ERRORS as e:
+                    if attempt == MAX_EMBEDDING_ATTEMPTS:
+                        raise
+                    logger.debug(
+                        f"Retrying {len(indices)} embeddings in {backoff}s: {e}"
+                    )
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+            for i, embedding in zip(indices, batch_embeddings):
+                embeddings[i] = embedding
+                if embedding_cache:
+                    embedding_cache.set(texts[i], model, embedding)
+
+        await asyncio.gather(
+            *(
+                embed_batch(missing[start : start + batch_size])
+                for start in range(0, len(missing), batch_size)
+            )
+        )
+        if embedding_cache and missing:
+            embedding_cache.sync()
+        return embeddings  # type: ignore
 
     async def add_texts(
         self,
@@ -52,6 +126,14 @@ class VectorDB:
     ) -> List[Tuple[Document, float]]:
         raise NotImplementedError
 
+    async def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        raise NotImplementedError
+
     async def tear_down(self):
         if self.should_close_session_on_tear_down:
             await self.aiohttp_session.close()
@@ -0,0 +1,61 @@
+import hashlib
+import shelve
+import threading
+from typing import Dict, List, MutableMapping, Optional
+
+
+class EmbeddingCache:
+    """Maps (model, text) content hashes to embeddings, so re-indexing unchanged
+    documents doesn't call the embeddings API again. Pass a path to persist the
+    cache across runs; use get_embedding_cache() to open a persisted one."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.store: MutableMapping[str, List[float]]
+        if path:
+            self.store = shelve.open(path)
+        else:
+            self.store = {}
+        # a shelf isn't safe to use from several threads at once
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(text: str, model: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model: str) -> Optional[List[float]]:
+        with self.lock:
+            return self.store.get(self.get_key(text, model))
+
+    def set(self, text: str, model: str, embedding: List[float]):
+        with self.lock:
+            self.store[self.get_key(text, model)] = embedding
+
+    def sync(self):
+        with self.lock:
+            if isinstance(self.store, shelve.Shelf):
+                self.store.sync()
+
+    def close(self):
+        with self.lock:
+            if isinstance(self.store, shelve.Shelf):
+                self.store.close()
+
+
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: Optional[str] = None) -> EmbeddingCache:
+    """Returns the process-wide cache persisted at path.
+
+    The dbm file behind a shelf doesn't support several writers, so every vector DB
+    in the process shares one handle to it. Without a path, returns a new in-memory cache.
+    """
+    if path is None:
+        return EmbeddingCache()
+    with _embedding_caches_lock:
+        embedding_cache = _embedding_caches.get(path)
+        if embedding_cache is None:
+            embedding_cache = EmbeddingCache(path)
+            _embedding_caches[path] = embedding_cache
+        return embedding_cache
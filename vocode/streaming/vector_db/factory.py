@@ -1,8 +1,13 @@
 import logging
 from typing import Optional
 import aiohttp
-from vocode.streaming.models.vector_db import PineconeConfig, VectorDBConfig
+from vocode.streaming.models.vector_db import (
+    LocalVectorDBConfig,
+    PineconeConfig,
+    VectorDBConfig,
+)
 from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.local_vector_db import LocalVectorDB
 from vocode.streaming.vector_db.pinecone import PineconeDB
 
 
@@ -14,4 +19,6 @@ class VectorDBFactory:
     ) -> VectorDB:
         if isinstance(vector_db_config, PineconeConfig):
             return PineconeDB(vector_db_config, aiohttp_session=aiohttp_session)
+        elif isinstance(vector_db_config, LocalVectorDBConfig):
+            return LocalVectorDB(vector_db_config, aiohttp_session=aiohttp_session)
         raise Exception("Invalid vector db config", vector_db_config.type)
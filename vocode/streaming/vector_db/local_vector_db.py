@@ -0,0 +1,430 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import uuid
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.embedding_cache import get_embedding_cache
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE_NAME = "vectors.f32"
+DOCUMENTS_FILE_NAME = "documents.jsonl"
+INDEX_FILE_NAME = "index.json"
+
+MIN_ROWS_PER_PARTITION = 32
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_ROWS_PER_PARTITION = 256
+SEARCH_WINDOW_MULTIPLIER = 8
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def matches_filter(metadata: dict, filter: dict) -> bool:
+    """Supports the subset of Pinecone's metadata filter language that maps onto
+    plain values: $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $and and $or"""
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(
+                matches_filter(metadata, sub_filter) for sub_filter in condition
+            ):
+                return False
+            continue
+        if key == "$or":
+            if not any(
+                matches_filter(metadata, sub_filter) for sub_filter in condition
+            ):
+                return False
+            continue
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for operator, operand in condition.items():
+            if operator == "$eq":
+                matches = value == operand
+            elif operator == "$ne":
+                matches = value != operand
+            elif operator == "$in":
+                matches = value in operand
+            elif operator == "$nin":
+                matches = value not in operand
+            elif operator in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    return False
+                matches = {
+                    "$gt": value > operand,
+                    "$gte": value >= operand,
+                    "$lt": value < operand,
+                    "$lte": value <= operand,
+                }[operator]
+            else:
+                raise ValueError(f"Unsupported filter operator {operator}")
+            if not matches:
+                return False
+    return True
+
+
+class IVFPartitions:
+    """A coarse inverted file index: vectors are clustered with spherical k-means and
+    a query only scores the vectors in the clusters closest to it."""
+
+    def __init__(self, vectors: np.ndarray, num_partitions: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        num_samples = min(
+            len(vectors), num_partitions * KMEANS_SAMPLE_ROWS_PER_PARTITION
+        )
+        sample = np.asarray(
+            vectors[np.sort(rng.choice(len(vectors), num_samples, replace=False))]
+        )
+        centroids = sample[rng.choice(num_samples, num_partitions, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for partition in range(num_partitions):
+                members = sample[assignments == partition]
+                if len(members):
+                    centroids[partition] = members.sum(axis=0)
+            centroids = normalize(centroids)
+        self.centroids = centroids
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.trained_on_rows = len(vectors)
+        self.add(vectors)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def add(self, vectors: np.ndarray, batch_size: int = 65536):
+        self.assignments = np.concatenate(
+            [self.assignments]
+            + [
+                self.assign(np.asarray(vectors[start : start + batch_size]))
+                for start in range(0, len(vectors), batch_size)
+            ]
+        )
+
+    def get_candidates(self, query: np.ndarray, num_probes: int) -> np.ndarray:
+        closest = np.argsort(-(self.centroids @ query))[:num_probes]
+        return np.flatnonzero(np.isin(self.assignments, closest))
+
+
+class LocalIndex:
+    """The files of an index in `index_path` and what's been read from them.
+
+    Normalized float32 embeddings are appended to a memory-mapped file, so every
+    worker process that opens the same index shares one copy of it through the page
+    cache, and documents are appended to a JSON lines file. Processes pick up rows
+    added by others on their next search. Only one process should write at a time.
+
+    Reading the files blocks, so every method is meant to run in an executor.
+    """
+
+    def __init__(self, index_path: str, num_partitions: Optional[int] = None):
+        self.index_path = index_path
+        self.num_partitions = num_partitions
+        self.vectors_path = os.path.join(index_path, VECTORS_FILE_NAME)
+        self.documents_path = os.path.join(index_path, DOCUMENTS_FILE_NAME)
+        self.index_file_path = os.path.join(index_path, INDEX_FILE_NAME)
+
+        self.lock = threading.Lock()
+        self.dimensions: Optional[int] = None
+        self.vectors: Optional[np.memmap] = None
+        self.documents: List[Dict[str, Any]] = []
+        self.documents_offset = 0
+        self.row_by_id: Dict[Tuple[str, str], int] = {}
+        self.partitions: Optional[IVFPartitions] = None
+
+    @property
+    def num_rows(self) -> int:
+        if self.vectors is None:
+            return 0
+        return min(len(self.vectors), len(self.documents))
+
+    def _refresh(self):
+        """Re-maps the vectors file and reads new documents if the index has grown"""
+        if not os.path.exists(self.index_file_path):
+            return
+        if self.dimensions is None:
+            with open(self.index_file_path) as f:
+                self.dimensions = json.load(f)["dimensions"]
+        row_bytes = self.dimensions * np.dtype(np.float32).itemsize
+        num_vectors = (
+            os.path.getsize(self.vectors_path) // row_bytes
+            if os.path.exists(self.vectors_path)
+            else 0
+        )
+        has_replaced_rows = False
+        if not os.path.exists(self.documents_path):
+            return
+        with open(self.documents_path, "rb") as f:
+            f.seek(self.documents_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # a write in progress, read it on the next refresh
+                    break
+                self.documents_offset += len(line)
+                document = json.loads(line)
+                row = document.pop("row")
+                if row < len(self.documents):
+                    self.documents[row] = document
+                    has_replaced_rows = True
+                else:
+                    self.documents.append(document)
+                self.row_by_id[(document["namespace"], document["id"])] = row
+        if num_vectors and (self.vectors is None or len(self.vectors) != num_vectors):
+            self.vectors = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(num_vectors, self.dimensions),
+            )
+        self._update_partitions(has_replaced_rows)
+
+    def _update_partitions(self, has_replaced_rows: bool):
+        num_partitions = self.num_partitions
+        if (
+            not num_partitions
+            or self.vectors is None
+            or self.num_rows < num_partitions * MIN_ROWS_PER_PARTITION
+        ):
+            self.partitions = None
+            return
+        vectors = self.vectors[: self.num_rows]
+        if (
+            self.partitions is None
+            or has_replaced_rows
+            or self.num_rows > 2 * self.partitions.trained_on_rows
+        ):
+            self.partitions = IVFPartitions(vectors, num_partitions)
+        elif len(self.partitions.assignments) < self.num_rows:
+            self.partitions.add(vectors[len(self.partitions.assignments) :])
+
+    def write(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: Optional[List[dict]],
+        namespace: str,
+        vectors: np.ndarray,
+    ):
+        with self.lock:
+            os.makedirs(self.index_path, exist_ok=True)
+            self._refresh()
+            if self.dimensions is None:
+                self.dimensions = vectors.shape[1]
+                with open(self.index_file_path, "w") as f:
+                    json.dump({"dimensions": self.dimensions}, f)
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(
+                    f"Expected embeddings of {self.dimensions} dimensions, got {vectors.shape[1]}"
+                )
+            num_vectors = 0 if self.vectors is None else len(self.vectors)
+            rows: List[int] = []
+            new_rows: Dict[Tuple[str, str], int] = {}
+            for id in ids:
+                key = (namespace, id)
+                row = self.row_by_id.get(key, new_rows.get(key))
+                if row is None:
+                    row = new_rows[key] = num_vectors + len(new_rows)
+                rows.append(row)
+
+            # documents go first so readers never see a vector without its document
+            with open(self.documents_path, "ab") as f:
+                for i, (id, text, row) in enumerate(zip(ids, texts, rows)):
+                    document = {
+                        "row": row,
+                        "id": id,
+                        "namespace": namespace,
+                        "text": text,
+                        "metadata": metadatas[i] if metadatas else {},
+                    }
+                    f.write(json.dumps(document).encode("utf-8") + b"\n")
+
+            new_vectors = np.zeros((len(new_rows), self.dimensions), dtype=np.float32)
+            existing_rows = []
+            for vector, row in zip(vectors, rows):
+                if row >= num_vectors:
+                    new_vectors[row - num_vectors] = vector
+                else:
+                    existing_rows.append((row, vector))
+            if existing_rows:
+                writable = np.memmap(
+                    self.vectors_path,
+                    dtype=np.float32,
+                    mode="r+",
+                    shape=(num_vectors, self.dimensions),
+                )
+                for row, vector in existing_rows:
+                    writable[row] = vector
+                writable.flush()
+                del writable
+            with open(self.vectors_path, "ab") as f:
+                f.write(new_vectors.tobytes())
+            self._refresh()
+
+    def search(
+        self,
+        query: np.ndarray,
+        filter: Optional[dict],
+        namespace: str,
+        top_k: int,
+        num_probes: int,
+    ) -> List[Tuple[Document, float]]:
+        with self.lock:
+            self._refresh()
+            num_rows = self.num_rows
+            if self.vectors is None or not num_rows:
+                return []
+            vectors = self.vectors[:num_rows]
+            documents = self.documents[:num_rows]
+            partitions = self.partitions
+        if partitions is not None:
+            rows = partitions.get_candidates(query, num_probes)
+            scores = vectors[rows] @ query
+        else:
+            rows = None
+            scores = np.asarray(vectors) @ query
+
+        def get_row(i: int) -> int:
+            return int(rows[i]) if rows is not None else i
+
+        def is_match(document: Dict[str, Any]) -> bool:
+            return document["namespace"] == namespace and (
+                not filter or matches_filter(document["metadata"], filter)
+            )
+
+        # rank a small window first and only fall back to a full sort when filters
+        # reject too many of the best scoring rows
+        window = min(len(scores), top_k * SEARCH_WINDOW_MULTIPLIER)
+        while True:
+            if window < len(scores):
+                order = np.argpartition(-scores, window - 1)[:window]
+                order = order[np.argsort(-scores[order])]
+            else:
+                order = np.argsort(-scores)
+            matches = [i for i in order if is_match(documents[get_row(i)])][:top_k]
+            if len(matches) == top_k or window >= len(scores):
+                break
+            window = len(scores)
+        return [
+            (
+                Document(
+                    page_content=documents[get_row(i)]["text"],
+                    metadata=dict(documents[get_row(i)]["metadata"]),
+                ),
+                float(scores[i]),
+            )
+            for i in matches
+        ]
+
+
+_local_indexes: Dict[Tuple[str, Optional[int]], LocalIndex] = {}
+_local_indexes_lock = threading.Lock()
+
+
+def get_local_index(
+    index_path: str, num_partitions: Optional[int] = None
+) -> LocalIndex:
+    """Returns the process-wide LocalIndex for index_path, so conversations searching
+    the same index share its documents and partitions instead of reading their own"""
+    key = (os.path.abspath(index_path), num_partitions)
+    with _local_indexes_lock:
+        local_index = _local_indexes.get(key)
+        if local_index is None:
+            local_index = LocalIndex(index_path, num_partitions)
+            _local_indexes[key] = local_index
+        return local_index
+
+
+class LocalVectorDB(VectorDB):
+    """An in-process vector store backed by files in `index_path`, see LocalIndex"""
+
+    def __init__(self, config: LocalVectorDBConfig, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.config = config
+        self.index = get_local_index(config.index_path, config.num_partitions)
+        self.embedding_cache = get_embedding_cache(config.embedding_cache_path)
+
+    @property
+    def num_rows(self) -> int:
+        return self.index.num_rows
+
+    @property
+    def partitions(self) -> Optional[IVFPartitions]:
+        return self.index.partitions
+
+    async def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        namespace: Optional[str] = None,
+    ) -> List[str]:
+        """Run more texts through the embeddings and add them to the index.
+
+        Args:
+            texts: Iterable of strings to add to the index.
+            metadatas: Optional list of metadatas associated with the texts.
+            ids: Optional list of ids to associate with the texts, existing ids are
+                overwritten.
+            namespace: Optional namespace to add the texts to.
+
+        Returns:
+            List of ids from adding the texts into the index.
+        """
+        texts = list(texts)
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        embeddings = await self.embed_texts(
+            texts,
+            model=self.config.embeddings_model,
+            batch_size=self.config.embedding_batch_size,
+            max_concurrent_requests=self.config.max_concurrent_requests,
+            embedding_cache=self.embedding_cache,
+        )
+        vectors = normalize(np.asarray(embeddings, dtype=np.float32))
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.index.write, ids, texts, metadatas, namespace or "", vectors
+        )
+        return ids
+
+    async def similarity_search_with_score(
+        self,
+        query: str,
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents most similar to query, along with cosine similarity
+        scores, like PineconeDB.similarity_search_with_score"""
+        return await self.similarity_search_by_vector_with_score(
+            await self.create_openai_embedding(
+                query, model=self.config.embeddings_model
+            ),
+            filter=filter,
+            namespace=namespace,
+        )
+
+    async def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        query = normalize(np.asarray(embedding, dtype=np.float32))
+        # scoring a large index takes a while and NumPy releases the GIL, so keep it off the event loop
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.index.search,
+            query,
+            filter,
+            namespace or "",
+            self.config.top_k,
+            self.config.num_probes,
+        )
@@ -1,13 +1,21 @@
+import asyncio
 import logging
+import time
 from typing import Iterable, List, Optional, Tuple
 import uuid
+import aiohttp
 from langchain.docstore.document import Document
 from vocode import getenv
 from vocode.streaming.models.vector_db import PineconeConfig
 from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.embedding_cache import get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
+MAX_UPSERT_ATTEMPTS = 4
+UPSERT_INITIAL_BACKOFF_SECONDS = 0.5
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
 
 class PineconeDB(VectorDB):
     def __init__(self, config: PineconeConfig, *args, **kwargs) -> None:
@@ -23,6 +31,7 @@ class PineconeDB(VectorDB):
             f"https://{self.index_name}.svc.{self.pinecone_environment}.pinecone.io"
         )
         self._text_key = "text"
+        self.embedding_cache = get_embedding_cache(self.config.embedding_cache_path)
 
     async def add_texts(
         self,
@@ -45,29 +54,71 @@ class PineconeDB(VectorDB):
         # Adapted from: langchain/vectorstores/pinecone.py. Made langchain implementation async.
         if namespace is None:
             namespace = ""
+        start_time = time.time()
+        texts = list(texts)
         # Embed and create the documents
-        docs = []
         ids = ids or [str(uuid.uuid4()) for _ in texts]
-        for i, text in enumerate(texts):
-            embedding = await self.create_openai_embedding(text)
+        embeddings = await self.embed_texts(
+            texts,
+            model=self.config.embeddings_model,
+            batch_size=self.config.embedding_batch_size,
+            max_concurrent_requests=self.config.max_concurrent_requests,
+            embedding_cache=self.embedding_cache,
+        )
+        docs = []
+        for i, (text, embedding) in enumerate(zip(texts, embeddings)):
             metadata = metadatas[i] if metadatas else {}
             metadata[self._text_key] = text
             docs.append({"id": ids[i], "values": embedding, "metadata": metadata})
-        # upsert to Pinecone
-        async with self.aiohttp_session.post(
-            f"{self.pinecone_url}/vectors/upsert",
-            headers={"Api-Key": self.pinecone_api_key},
-            json={
-                "vectors": docs,
-                "namespace": namespace,
-            },
-        ) as response:
-            response_json = await response.json()
-            if "message" in response_json:
-                logger.error(f"Error upserting vectors: {response_json}")
-
+        # upsert to Pinecone in bounded chunks
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        batch_size = self.config.upsert_batch_size
+        await asyncio.gather(
+            *(
+                self._upsert(docs[start : start + batch_size], namespace, semaphore)
+                for start in range(0, len(docs), batch_size)
+            )
+        )
+        elapsed = time.time() - start_time
+        logger.info(
+            f"Indexed {len(docs)} texts in {elapsed:.2f}s "
+            f"({len(docs) / elapsed if elapsed else 0:.1f} docs/sec)"
+        )
         return ids
 
+    async def _upsert(
+        self, docs: List[dict], namespace: str, semaphore: asyncio.Semaphore
+    ):
+        backoff = UPSERT_INITIAL_BACKOFF_SECONDS
+        for attempt in range(1, MAX_UPSERT_ATTEMPTS + 1):
+            try:
+                async with semaphore:
+                    async with self.aiohttp_session.post(
+                        f"{self.pinecone_url}/vectors/upsert",
+                        headers={"Api-Key": self.pinecone_api_key},
+                        json={
+                            "vectors": docs,
+                            "namespace": namespace,
+                        },
+                    ) as response:
+                        response_text = await response.text()
+                        if response.status < 400:
+                            return
+                        if response.status not in RETRYABLE_STATUSES:
+                            logger.error(f"Error upserting vectors: {response_text}")
+                            return
+                        error = f"{response.status}: {response_text}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e)
+            if attempt == MAX_UPSERT_ATTEMPTS:
+                logger.error(
+                    f"Error upserting {len(docs)} vectors after {attempt} attempts: {error}"
+                )
+                return
+            logger.debug(f"Retrying upsert in {backoff}s: {error}")
+            await asyncio.sleep(backoff)
+            backoff *= 2
+
     async def similarity_search_with_score(
         self,
         query: str,
@@ -84,10 +135,30 @@ class PineconeDB(VectorDB):
         Returns:
             List of Documents most similar to the query and score for each
         """
+        query_obj = await self.create_openai_embedding(query)
+        return await self.similarity_search_by_vector_with_score(
+            query_obj, filter=filter, namespace=namespace
+        )
+
+    async def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return pinecone documents most similar to an embedding, along with scores.
+
+        Args:
+            embedding: Embedding to look up documents similar to.
+            filter: Dictionary of argument(s) to filter on metadata
+            namespace: Namespace to search in. Default will search in '' namespace.
+
+        Returns:
+            List of Documents most similar to the embedding and score for each
+        """
         # Adapted from: langchain/vectorstores/pinecone.py. Made langchain implementation async.
         if namespace is None:
             namespace = ""
-        query_obj = await self.create_openai_embedding(query)
         docs = []
         async with self.aiohttp_session.post(
             f"{self.pinecone_url}/query",
@@ -96,7 +167,7 @@ class PineconeDB(VectorDB):
                 "top_k": self.config.top_k,
                 "namespace": namespace,
                 "filter": filter,
-                "vector": query_obj,
+                "vector": embedding,
                 "includeMetadata": True,
             },
         ) as response:
@@ -0,0 +1,136 @@
+import asyncio
+from collections import OrderedDict
+import logging
+import re
+from typing import Dict, List, Optional, Tuple, TypeVar
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from vocode.streaming.models.vector_db import VectorDBConfig
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+
+DocsWithScores = List[Tuple[Document, float]]
+
+CacheValue = TypeVar("CacheValue")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(re.sub(r"[^\w\s']", " ", query.lower()).split())
+
+
+class RetrievalPipeline:
+    """Keeps vector DB retrieval off the critical path of a conversation's turns.
+
+    Retrieval is started speculatively on interim transcripts via prefetch(), and
+    embeddings and results are cached per conversation so that repeated or nearly
+    identical queries skip the round trips. retrieve() waits at most the latency
+    budget: a result that misses it is kept and used on the next turn instead.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDB,
+        vector_db_config: VectorDBConfig,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.vector_db = vector_db
+        self.latency_budget_seconds = vector_db_config.retrieval_latency_budget_seconds
+        self.similarity_threshold = vector_db_config.query_similarity_threshold
+        self.cache_size = vector_db_config.retrieval_cache_size
+        self.logger = logger or logging.getLogger(__name__)
+        self.embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.results: "OrderedDict[str, Tuple[np.ndarray, DocsWithScores]]" = (
+            OrderedDict()
+        )
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.speculative_key: Optional[str] = None
+        self.late_results: Optional[DocsWithScores] = None
+
+    def prefetch(self, query: str):
+        key = normalize_query(query)
+        if not key or key in self.results or key in self.tasks:
+            return
+        # interim transcripts arrive quickly, only the latest one is worth retrieving for
+        if self.speculative_key in self.tasks:
+            self.tasks[self.speculative_key].cancel()
+        self.speculative_key = key
+        self._start_task(key, query)
+
+    async def retrieve(self, query: str) -> Optional[DocsWithScores]:
+        key = normalize_query(query)
+        cached = self.results.get(key)
+        if cached is not None:
+            self.results.move_to_end(key)
+            return cached[1]
+        task = self.tasks.get(key) or self._start_task(key, query)
+        if self.speculative_key == key:
+            self.speculative_key = None
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(task), self.latency_budget_seconds
+            )
+        except asyncio.TimeoutError:
+            self.logger.debug(
+                "Retrieval missed its latency budget, using it on the next turn"
+            )
+            task.add_done_callback(self._store_late_results)
+        except asyncio.CancelledError:
+            # cancel() stopped the retrieval, but the turn itself goes on
+            if not task.cancelled():
+                raise
+            self.logger.debug("Retrieval was cancelled")
+        except Exception as e:
+            self.logger.error(f"Error retrieving from vector db: {e}")
+        # late results are only used up by the turn they're handed to
+        late_results, self.late_results = self.late_results, None
+        return late_results
+
+    def cancel(self):
+        for task in list(self.tasks.values()):
+            task.cancel()
+
+    def _start_task(self, key: str, query: str) -> asyncio.Task:
+        task = asyncio.create_task(self._retrieve(key, query))
+        self.tasks[key] = task
+        task.add_done_callback(lambda task: self._on_task_done(key, task))
+        return task
+
+    def _on_task_done(self, key: str, task: asyncio.Task):
+        self.tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.debug(f"Speculative retrieval failed: {task.exception()}")
+
+    def _store_late_results(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            self.late_results = task.result()
+
+    async def _retrieve(self, key: str, query: str) -> DocsWithScores:
+        embedding = self.embeddings.get(key)
+        if embedding is None:
+            embedding = np.asarray(
+                await self.vector_db.create_openai_embedding(query), dtype=np.float32
+            )
+            embedding /= np.linalg.norm(embedding) or 1.0
+            self._put(self.embeddings, key, embedding)
+        docs = self._find_similar_results(embedding)
+        if docs is None:
+            docs = await self.vector_db.similarity_search_by_vector_with_score(
+                embedding.tolist()
+            )
+        self._put(self.results, key, (embedding, docs))
+        return docs
+
+    def _find_similar_results(self, embedding: np.ndarray) -> Optional[DocsWithScores]:
+        best_similarity, best_docs = self.similarity_threshold, None
+        for cached_embedding, docs in self.results.values():
+            similarity = float(np.dot(cached_embedding, embedding))
+            if similarity >= best_similarity:
+                best_similarity, best_docs = similarity, docs
+        return best_docs
+
+    def _put(self, cache: "OrderedDict[str, CacheValue]", key: str, value: CacheValue):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
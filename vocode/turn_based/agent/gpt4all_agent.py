@@ -1,7 +1,6 @@
 import asyncio
 from concurrent.futures import ThreadPoolExecutor, wait
 import logging
-import sys
 from typing import Optional
 from vocode.turn_based.agent.base_agent import BaseAgent
 
@@ -53,7 +52,7 @@ class GPT4AllAgent(BaseAgent):
                 "Human:"
             ):
                 response_buffer = response_buffer[: -len("Human:")]
-                sys.exit()
+                raise StopThreadException("Stopping the thread")
 
         future = self.thread_pool_executor.submit(
             self.llm.generate,